@@ -0,0 +1,34 @@
+"""
+add repositories
+
+Revision ID: 3f6a2d8e1b07
+Revises: 9b1e7c2a4d3f
+Create Date: 2026-10-17 16:42:08.301945
+"""
+
+from alembic import op
+import sqlalchemy as sql
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6a2d8e1b07'
+down_revision = '9b1e7c2a4d3f'
+branch_labels = None
+depends_on = None
+
+REPO_NAME_LEN = 128
+
+
+def upgrade():
+    # existing rows are assigned to the first configured repository by the bot on startup
+    op.add_column("pulls", sql.Column("repo", sql.String(REPO_NAME_LEN), nullable=False, server_default=""))
+    op.add_column("embed", sql.Column("pull_repo", sql.String(REPO_NAME_LEN), nullable=False, server_default=""))
+    op.create_index("ix_pulls_repo_number", "pulls", ["repo", "number"])
+
+
+def downgrade():
+    op.drop_index("ix_pulls_repo_number", table_name="pulls")
+    with op.batch_alter_table("embed") as batch_op:
+        batch_op.drop_column("pull_repo")
+    with op.batch_alter_table("pulls") as batch_op:
+        batch_op.drop_column("repo")
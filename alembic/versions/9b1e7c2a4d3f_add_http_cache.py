@@ -0,0 +1,35 @@
+"""
+add http cache
+
+Revision ID: 9b1e7c2a4d3f
+Revises: 424c7bd5c88c
+Create Date: 2026-10-17 12:04:31.518211
+"""
+
+from alembic import op
+import sqlalchemy as sql
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1e7c2a4d3f'
+down_revision = '424c7bd5c88c'
+branch_labels = None
+depends_on = None
+
+CACHE_KEY_LEN = 512
+HEADER_LEN = 128
+
+
+def upgrade():
+    op.create_table(
+        "http_cache",
+        sql.Column("key", sql.String(CACHE_KEY_LEN), primary_key=True),
+        sql.Column("etag", sql.String(HEADER_LEN)),
+        sql.Column("last_modified", sql.String(HEADER_LEN)),
+        sql.Column("body", sql.JSON),
+        sql.Column("stored_at", sql.DateTime, nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("http_cache")
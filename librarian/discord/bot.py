@@ -10,6 +10,7 @@ import discord.ext.commands.errors as commands_errors
 from librarian import types
 from librarian import github as gh
 from librarian import storage as stg
+from librarian import webhooks as wh
 
 from librarian.discord import errors
 from librarian.discord.cogs import (
@@ -21,7 +22,10 @@ from librarian.discord.cogs.background import (
     base,
     github as github_cogs,
 )
-from librarian.discord.settings import registry
+from librarian.discord.settings import (
+    custom,
+    registry,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,13 +36,18 @@ class Client(commands.Bot):
 
     def __init__(
         self, *args, github: gh.GitHub = None, storage: stg.Storage = None,
-        assignee_login: typing.Optional[str] = None,
+        assignee_login: typing.Optional[str] = None, full_sync_interval: typing.Optional[int] = None,
+        webhooks: typing.Optional[wh.WebhookServer] = None,
         **kwargs
     ):
         self.github = github
         self.storage = storage
         self.assignee_login = assignee_login
+        self.full_sync_interval = full_sync_interval
+        self.webhooks = webhooks
         self.settings = registry.Registry(self.storage.discord)
+        self.monitors: typing.Dict[str, github_cogs.MonitorPulls] = {}
+        self.fetchers: typing.Dict[str, github_cogs.FetchNewPulls] = {}
 
         super().__init__(*args, command_prefix=self.COMMAND_PREFIX, **kwargs)
 
@@ -62,12 +71,50 @@ class Client(commands.Bot):
             )
 
     def setup(self):
+        # pulls and messages saved before several repositories could be monitored belong to the first one
+        self.storage.pulls.adopt(self.github.repo)
+        self.storage.discord.adopt_messages(self.github.repo)
+
         self.add_cog(pulls.Pulls())
         self.add_cog(system.System())
-        self.add_cog(github_cogs.FetchNewPulls(self))
-        self.add_cog(github_cogs.MonitorPulls(self))
+        for repo in self.github.repos:
+            fetcher = github_cogs.FetchNewPulls(self, repo=repo)
+            self.fetchers[repo.lower()] = fetcher
+            self.add_cog(fetcher)
+            monitor = github_cogs.MonitorPulls(self, repo=repo)
+            self.monitors[repo.lower()] = monitor
+            self.add_cog(monitor)
         self.add_cog(server.Server())
 
+        if self.webhooks is not None:
+            self.webhooks.handler = self.receive_pull
+
+    def channel_repo(self, channel_id: int) -> str:
+        """ Return the repository a channel receives updates from (see `custom.Repo`). """
+
+        repo = self.settings.get(channel_id).get(custom.Repo.name)
+        if repo is None:
+            return self.github.repo
+        # the setting is case-insensitive, while the database keeps the names as they are configured
+        return next((_ for _ in self.github.repos if _.lower() == repo.cast()), repo.cast())
+
+    def monitor_for(self, repo: typing.Optional[str] = None) -> typing.Optional[github_cogs.MonitorPulls]:
+        """ Return the routine that monitors a repository (the first one by default), if there is one. """
+        return self.monitors.get((repo or self.github.repo).lower())
+
+    def fetcher_for(self, repo: typing.Optional[str] = None) -> typing.Optional[github_cogs.FetchNewPulls]:
+        """ Return the routine that discovers new pulls of a repository (the first one by default), if there is one. """
+        return self.fetchers.get((repo or self.github.repo).lower())
+
+    async def receive_pull(self, payload: dict, repo: typing.Optional[str] = None) -> None:
+        """ Pass a pull delivered by a webhook to the routine monitoring its repository. """
+
+        monitor = self.monitor_for(repo)
+        if monitor is None:
+            logger.debug("Ignoring pull #%s from an unmonitored repository %s", payload.get("number"), repo)
+            return
+        await monitor.receive_pull(payload)
+
     async def start_routines(self):
         logger.debug("Starting cogs")
         await asyncio.gather(*(
@@ -76,6 +123,18 @@ class Client(commands.Bot):
             isinstance(cog, base.BackgroundCog)
         ))
 
+    async def start(self, *args, **kwargs):
+        await self.github.open()
+        if self.webhooks is not None:
+            await self.webhooks.start()
+        await super().start(*args, **kwargs)
+
+    async def close(self):
+        await super().close()
+        if self.webhooks is not None:
+            await self.webhooks.stop()
+        await self.github.close()
+
     async def on_ready(self):
         logger.info("Logged in as %s #%s, starting routines", self.user, self.user.id)
         await self.start_routines()
@@ -1,5 +1,7 @@
 import asyncio
+import datetime
 import logging
+import time
 import typing
 
 import arrow
@@ -7,6 +9,7 @@ import aiohttp.client_exceptions
 from discord.ext import tasks
 from sqlalchemy import exc as sql_exc
 
+from librarian import github as gh
 from librarian import storage
 from librarian import types
 from librarian.discord import formatters, errors
@@ -17,87 +20,310 @@ from librarian.discord.cogs.background import base
 logger = logging.getLogger(__name__)
 
 
-class FetchNewPulls(base.BackgroundCog):
+class RepositoryCog(base.BackgroundCog):
+    """
+    A background routine that works with one of the monitored repositories (see `GitHub.repos`), the first one
+    by default. Every repository has its own instance of the routine, which shares the bot's HTTP session,
+    rate limits and Discord connection with others. Progress is saved per repository (see `cursor_key`).
+    """
+
+    def __init__(self, bot: types.Bot, *args, repo: str = None, **kwargs):
+        super().__init__(bot, *args, **kwargs)
+        self.repo = repo if repo is not None else self.github.repo
+        self.__cog_name__ = self.name  # the bot tells cogs apart by their names
+
+    @property
+    def name(self) -> str:
+        """ Routine name, which includes the repository name if there are several of them. """
+
+        if len(self.github.repos) > 1:
+            return "{}[{}]".format(self.__class__.__name__, self.repo)
+        return self.__class__.__name__
+
+    def cursor_key(self, key: str) -> str:
+        """ Make a metadata key for the repository's value. """
+        return "{}:{}".format(key, self.repo)
+
+    def load_cursor(self, key: str) -> typing.Any:
+        """
+        Read a saved value for the repository. Values saved before several repositories could be monitored
+        belong to the first one.
+        """
+
+        value = self.storage.metadata.load_field(self.cursor_key(key))
+        if value is None and self.repo == self.github.repo:
+            value = self.storage.metadata.load_field(key)
+        return value
+
+    def save_cursor(self, key: str, value: typing.Any) -> None:
+        """ Save a value for the repository. """
+        self.storage.metadata.save_field(self.cursor_key(key), value)
+
+
+class FetchNewPulls(RepositoryCog):
     """
     The routine which is used by the bot to discover new pull requests posted on GitHub.
 
-    On the initial setup, the routine does regular polling; once GitHub is exhausted
+    On the initial setup, the routine pages through the listing of all pulls from the oldest ones,
+    saving closed pulls in bulk (open ones are picked up by `MonitorPulls`), and remembers its progress
+    after every page. The listing lacks some of the pulls' counters, so the new ones are completed
+    with batched queries (see `GitHub.get_many_pulls`) before they're saved.
+    Deployments that have polled pulls before the backfill was introduced don't backfill.
+    Once caught up, it does regular polling of pulls one by one; once GitHub is exhausted
     and it has reached the most recent known pull, falls back to less regular update attempts.
+    Numbers that turn out to be issues or missing are remembered (see `KnownGaps`) and skipped without requests.
     The polling loop is considerate of GitHub API limits --
     the intervals are picked to not hurt other parts of the system, even considering the 5,000 requests/hour limit.
+    On top of that, its requests have the lowest priority and are slowed down when the API budget runs low.
     """
 
     LAST_PULL = "last_pull"
+    BACKFILL_PAGE = "backfill_page"  # the next page of the pulls listing to read, or 0 when caught up
+    KNOWN_GAPS = "known_gaps"
+    MERGED_DAYS = "merged_days"  # days (ordinals) whose merged pulls have been loaded with Search API
+    PULL_KEYS = storage.Pull.payload_projection()
     SHORT_INTERVAL = 3
     LONG_INTERVAL = 600
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.last_pull: typing.Optional[int] = None
+        self.backfill_page: typing.Optional[int] = None
+        self.gaps: typing.Optional[gh.gaps.KnownGaps] = None
+        self.skipped = 0
+        self.__merged_lock = asyncio.Lock()  # concurrent commands may ask for the same days
 
-    @tasks.loop(seconds=SHORT_INTERVAL)
-    async def loop(self):
+    async def backfill(self):
         """
-        Attempt to fetch the not-yet-submitted pull. See the class' docstring for a brief description.
+        Read the next page of all pulls, save the closed ones, and move the checkpoint past the page.
         """
 
+        logger.info("%s: backfilling pulls from page #%s", self.name, self.backfill_page)
+        try:
+            pulls, has_next = await self.github.pulls_page(
+                self.backfill_page, state="all", sort="created", direction="asc",
+                keys=self.PULL_KEYS, priority=gh.Priority.BACKFILL, repo=self.repo,
+            )
+        except aiohttp.client_exceptions.ClientError as exc:
+            logger.error("%s: failed to fetch page #%s of pulls: %s", self.name, self.backfill_page, exc)
+            return
+
+        closed = {_["number"]: _ for _ in pulls if _["state"] != formatters.PullState.OPEN.name}
+        if not await self.complete_listed(closed):
+            return
+
+        inserted = self.storage.pulls.insert_many_from_payload(list(closed.values()), repo=self.repo)
+        if pulls:
+            self.last_pull = max(self.last_pull, max(_["number"] for _ in pulls) + 1)
+        logger.info(
+            "%s: saved %d new closed pull(s) out of %d, continuing from pull #%s",
+            self.name, inserted, len(pulls), self.last_pull
+        )
+
+        if has_next:
+            self.backfill_page += 1
+        else:
+            logger.info("%s: backfill is complete, switching to polling", self.name)
+            self.backfill_page = 0
+        self.save_progress()
+
+    async def complete_listed(
+        self, listed: typing.Dict[int, dict], numbers: typing.Iterable[int] = (),
+        priority: gh.Priority = gh.Priority.BACKFILL,
+    ) -> bool:
+        """
+        Replace payloads of unsaved pulls from a listing with complete ones, which include
+        the counters the listing lacks (see `Pull.LISTING_DEFAULTS`). Return `False` if some pulls failed to be fetched.
+
+        :param listed: pulls from a listing by their numbers, which is updated in place
+        :param numbers: other pulls to add to the listing, unless they're saved already
+        :param priority: how urgent the requests are when the rate limit runs low
+        """
+
+        wanted = set(listed) | set(numbers)
+        new = wanted - self.storage.pulls.existing_numbers(wanted, repo=self.repo)
+        if not new:
+            return True
+
+        fetched = await self.github.get_many_pulls(new, priority=priority, keys=self.PULL_KEYS, repo=self.repo)
+        failed = sorted(n for n, p in fetched.items() if isinstance(p, Exception))
+        if failed:
+            logger.error("%s: failed to complete pulls %s, retrying the page later", self.name, failed)
+            return False
+
+        listed.update((n, p) for n, p in fetched.items() if p is not None)
+        return True
+
+    async def backfill_merged(self, start: arrow.Arrow, end: arrow.Arrow) -> int:
+        """
+        Load the pulls merged between two dates (the end is excluded) the database doesn't have, so that statistics
+        are correct even for the time before the bot was set up. Days that have been loaded completely are remembered
+        and never searched again, except for the current one, which isn't over yet. Returns the number of saved pulls.
+
+        :param start: the first moment of the period
+        :param end: the moment after the period
+        """
+
+        first = start.to("utc").date().toordinal()
+        last = min(end.to("utc").shift(microseconds=-1), arrow.utcnow()).date().toordinal()
+        async with self.__merged_lock:
+            days = gh.gaps.RangeSet(self.load_cursor(self.MERGED_DAYS) or ())
+            saved = 0
+            for window_start, window_end in days.missing(first, last):
+                window = [datetime.date.fromordinal(_) for _ in (window_start, window_end)]
+                numbers, complete = await self.github.search_merged_pulls(*window, repo=self.repo)
+                fetched = {}
+                if not await self.complete_listed(fetched, numbers=numbers, priority=gh.Priority.INTERACTIVE):
+                    continue
+                saved += self.storage.pulls.insert_many_from_payload(list(fetched.values()), repo=self.repo)
+                logger.info("%s: loaded %d merged pull(s) from %s to %s", self.name, len(fetched), *window)
+
+                today = arrow.utcnow().date().toordinal()
+                if complete and window_start < today:
+                    days.add_range(window_start, min(window_end, today - 1))
+                    self.save_cursor(self.MERGED_DAYS, days.ranges)
+        return saved
+
+    def load_progress(self):
+        """ Read the checkpoints and the known gaps from the database, unless they're already loaded. """
+
+        if self.backfill_page is None:
+            self.backfill_page = self.load_cursor(self.BACKFILL_PAGE)
+            if self.backfill_page is None:  # only a fresh database needs a backfill, others have been polling
+                self.backfill_page = 1 if self.load_cursor(self.LAST_PULL) is None else 0
+
         if self.last_pull is None:
-            self.last_pull = self.storage.metadata.load_field(self.LAST_PULL)
+            self.last_pull = self.load_cursor(self.LAST_PULL)
             if self.last_pull is None:
                 self.last_pull = 1
 
-        logger.info("%s: starting from pull #%s", self.name, self.last_pull)
-        try:
-            pull_data = await self.github.get_single_pull(self.last_pull)
-            if pull_data is not None:
-                logger.info("%s: fetched pull #%s", self.name, self.last_pull)
-                if pull_data["state"] == formatters.PullState.OPEN.name:
-                    number = pull_data["number"]
-                    if self.storage.pulls.by_number(number):
-                        logger.info("%s: skipping open pull #%d (fetched already)", self.name, number)
-                        self.last_pull += 1
-                    else:
-                        logger.info(
-                            "%s: open pull #%d is not fetched by %s. going into slow mode",
-                            self.name, number, MonitorPulls.name
-                        )
-                        self.loop.change_interval(seconds=self.LONG_INTERVAL)
-                    return
-
-                try:
-                    self.storage.pulls.save_from_payload(pull_data, insert=True)
-                except sql_exc.IntegrityError:  # fetched by MonitorPulls
-                    pass
-                self.last_pull += 1
+        if self.gaps is None:
+            self.gaps = gh.gaps.KnownGaps.from_state(self.load_cursor(self.KNOWN_GAPS))
 
-            elif await self.github.get_single_issue(self.last_pull) is not None:
-                logger.info("%s: found issue #%s instead of a pull", self.name, self.last_pull)
-                self.last_pull += 1
+    def skip_known_gaps(self):
+        """ Move the checkpoint past the numbers known to not be pulls. """
+
+        while self.gaps.is_issue(self.last_pull) or self.gaps.is_missing(self.last_pull):
+            logger.debug("%s: skipping #%s (known to not be a pull)", self.name, self.last_pull)
+            self.last_pull += 1
+            self.skipped += 1
+
+    def process_pull(self, pull_data: dict):
+        """ Save a fetched closed pull and move on, or wait for `MonitorPulls` to pick up an unknown open one. """
 
+        logger.info("%s: fetched pull #%s", self.name, self.last_pull)
+        if pull_data["state"] == formatters.PullState.OPEN.name:
+            number = pull_data["number"]
+            if self.storage.pulls.by_number(number, repo=self.repo):
+                logger.info("%s: skipping open pull #%d (fetched already)", self.name, number)
+                self.last_pull += 1
             else:
-                logger.info("%s: no unknown pulls? going into slow mode", self.name)
+                logger.info(
+                    "%s: open pull #%d is not fetched by %s. going into slow mode",
+                    self.name, number, MonitorPulls.name
+                )
                 self.loop.change_interval(seconds=self.LONG_INTERVAL)
-                await asyncio.sleep(self.LONG_INTERVAL - self.SHORT_INTERVAL)
+            return
+
+        try:
+            self.storage.pulls.save_from_payload(pull_data, insert=True, repo=self.repo)
+        except sql_exc.IntegrityError:  # fetched by MonitorPulls
+            pass
+        self.last_pull += 1
+
+    async def process_non_pull(self):
+        """ Find out whether the current number is an issue, a gap, or hasn't been used yet. """
+
+        issue = await self.github.get_single_issue(self.last_pull, priority=gh.Priority.BACKFILL, repo=self.repo)
+        if issue is not None:
+            logger.info("%s: found issue #%s instead of a pull", self.name, self.last_pull)
+            self.gaps.add_issue(self.last_pull)
+            self.save_gaps()
+            self.last_pull += 1
+
+        elif self.last_pull < self.newest_known_number():
+            logger.info("%s: #%s is missing (deleted or transferred?)", self.name, self.last_pull)
+            self.gaps.add_missing(self.last_pull)
+            self.save_gaps()
+            self.last_pull += 1
+
+        else:
+            logger.info("%s: no unknown pulls? going into slow mode", self.name)
+            self.loop.change_interval(seconds=self.LONG_INTERVAL)
+            await asyncio.sleep(self.LONG_INTERVAL - self.SHORT_INTERVAL)
+
+    @tasks.loop(seconds=SHORT_INTERVAL)
+    async def loop(self):
+        """
+        Attempt to fetch the not-yet-submitted pull. See the class' docstring for a brief description.
+        """
 
+        self.load_progress()
+        if self.backfill_page:
+            return await self.backfill()
+
+        self.skip_known_gaps()
+        logger.info("%s: starting from pull #%s", self.name, self.last_pull)
+        try:
+            pull_data = await self.github.get_single_pull(
+                self.last_pull, priority=gh.Priority.BACKFILL, keys=self.PULL_KEYS
+            )
+            if pull_data is not None:
+                self.process_pull(pull_data)
+            else:
+                await self.process_non_pull()
         except aiohttp.client_exceptions.ClientError as exc:
             logger.error("%s: failed to fetch pull #%s: %s", self.name, self.last_pull, exc)
 
+    def newest_known_number(self) -> int:
+        """ Return the greatest number of a pull or an issue seen so far. """
+
+        newest_issue = self.gaps.issues.ranges[-1][1] if self.gaps.issues.ranges else 0
+        return max(self.storage.pulls.max_number(repo=self.repo) or 0, newest_issue)
+
+    def save_gaps(self):
+        """ Save the numbers known to not be pulls to the database. """
+        self.save_cursor(self.KNOWN_GAPS, self.gaps.as_state())
+
+    def save_progress(self):
+        """ Save the current progress to the database. """
+        self.save_cursor(self.LAST_PULL, self.last_pull)
+        if self.backfill_page is not None:
+            self.save_cursor(self.BACKFILL_PAGE, self.backfill_page)
+
     @loop.after_loop
     async def shutdown(self):
         """ Save the current progress to the database. """
-        self.storage.metadata.save_field(self.LAST_PULL, self.last_pull)
+        self.save_progress()
 
     async def status(self):
-        """ Returns the state of GitHub API rate limits. """
-        return dict(
+        """ Returns the state of GitHub API rate limits, the response cache and the most expensive endpoints. """
+        status = dict(
             last_pull=self.last_pull,
+            backfill_page=self.backfill_page,
+            known_issues=len(self.gaps.issues) if self.gaps is not None else None,
+            known_missing=len(self.gaps.missing) if self.gaps is not None else None,
+            numbers_skipped=self.skipped,
             requests_left=self.github.ratelimit.left,
             requests_limit=self.github.ratelimit.limit,
             requests_reset=self.github.ratelimit.reset.format(),
+            ratelimits=self.github.budget,
+            requests_delayed=self.github.tokens.waiting,
+            tokens=self.github.tokens.status(),
+            requests_retried=self.github.retry.retries,
+            requests_coalesced=self.github.coalesced,
+            json_backend=gh.decoding.BACKEND,
+            endpoints=self.github.metrics.status(),
         )
+        if self.github.cache is not None:
+            status.update(
+                cache_hits=self.github.cache.hits,
+                cache_misses=self.github.cache.misses,
+            )
+        return status
 
 
-class MonitorPulls(base.BackgroundCog):
+class MonitorPulls(RepositoryCog):
     """
     The routine used by the bot to fetch PR updates and distribute them to the subscribers (Discord channels).
 
@@ -107,16 +333,32 @@ class MonitorPulls(base.BackgroundCog):
     2. Pulls that are open, but the database doesn't have them yet;
     3. Pulls that are open and known to the database, but have an update.
 
+    Since usually nothing changes between two loops, the full comparison only happens every `full_sync_interval`
+    seconds. Otherwise, pulls are listed from the most recently updated ones until the watermark (the latest update
+    time the bot has already seen) is reached, which makes a quiet loop cost a single request.
+
+    If the bot receives webhooks from GitHub, pulls from them go through the same path (see `receive_pull`),
+    and the polling happens less often, only as a safety net.
+
     After everything is downloaded, every channel receives an update for its language-specific pulls.
     Optionally, other actions are performed, such as pinning messages, notifying reviewers,
     setting someone an assignee (requires the person to be the repository team's member).
     """
 
     INTERVAL = 60
+    WEBHOOKS_INTERVAL = 600
+    FULL_SYNC_INTERVAL = 3600
+    WATERMARK = "pulls_watermark"
+    LISTING_KEYS = ("number", "updated_at", "state")  # the listings are only used to find what changed
+    PULL_KEYS = storage.Pull.payload_projection()
 
     def __init__(self, bot: types.Bot, *args, **kwargs):
         super().__init__(bot, *args, **kwargs)
         self.assignee_login = bot.assignee_login
+        self.full_sync_interval = bot.full_sync_interval or self.FULL_SYNC_INTERVAL
+        self.watermark: typing.Optional[str] = None
+        self.last_full_sync: typing.Optional[float] = None
+        self.__notify_lock = asyncio.Lock()  # webhooks and polling may report the same pull at once
 
     async def update_pull_status(
         self, pull: storage.models.pull.Pull, channel_id: int, message_model: typing.Optional[storage.DiscordMessage]
@@ -139,7 +381,7 @@ class MonitorPulls(base.BackgroundCog):
             content = "{}, ".format(formatters.Highlighter.role(reviewer_role.cast()))
         content += channel_settings[custom.Language.name].random_highlight
 
-        embed = formatters.PullFormatter.make_embed_for(pull, self.bot.github.repo)
+        embed = formatters.PullFormatter.make_embed_for(pull, pull.repo or self.repo)
         message = await self.bot.post_or_update(
             channel_id=channel_id, message_id=None if first_time else message_model.id,
             embed=embed, content=content
@@ -153,81 +395,180 @@ class MonitorPulls(base.BackgroundCog):
 
         if not first_time or message is None:
             return None
-        return storage.DiscordMessage(id=message.id, channel_id=channel_id, pull_number=pull.number)
+        return storage.DiscordMessage(
+            id=message.id, channel_id=channel_id, pull_number=pull.number, pull_repo=pull.repo
+        )
 
     async def fetch_pulls(self, numbers: typing.Set[int]) -> typing.List[dict]:
         """
-        Fetch full data for a lot of pulls asynchronously in parallel.
+        Fetch full data for a lot of pulls in batches (see `GitHub.get_many_pulls`).
         :param numbers: a list of pull numbers to fetch.
         """
 
-        async with self.github.make_session() as aio_session:
-            tasks = [
-                asyncio.create_task(self.github.get_single_pull(number, aio_session))
-                for number in numbers
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await self.github.get_many_pulls(
+            sorted(numbers), priority=gh.Priority.SYNC, keys=self.PULL_KEYS, repo=self.repo
+        )
 
         ok = []
-        for number, result in zip(numbers, results):
+        for number, result in results.items():
             if isinstance(result, Exception):
                 logger.error("%s: couldn't fetch pull #%s: %s", self.name, number, result)
             else:
                 if result is None:
-                    logger.error("%s: received None for a pull #%d during fetching", self.name, result)
+                    logger.error("%s: received None for a pull #%d during fetching", self.name, number)
                 else:
                     ok.append(result)
         return ok
 
+    async def list_open_pulls(self) -> typing.Dict[int, dict]:
+        """ List all open pulls, keeping only what's needed to compare them against the database. """
+
+        live = {}
+        async for pull in self.github.iter_pulls(keys=self.LISTING_KEYS, priority=gh.Priority.SYNC, repo=self.repo):
+            live[pull["number"]] = pull
+        return live
+
+    async def list_updated_pulls(self, watermark: arrow.Arrow) -> typing.Dict[int, dict]:
+        """
+        List pulls of any state, starting from the most recently updated one, until the watermark is reached.
+        Pulls updated within the same second as the watermark are listed too, since they might have been missed.
+        """
+
+        updated = {}
+        async for pull in self.github.iter_pulls(
+            state="all", sort="updated", direction="desc", keys=self.LISTING_KEYS, parallel=False,
+            priority=gh.Priority.SYNC, repo=self.repo,
+        ):
+            if arrow.get(pull["updated_at"]) < watermark:
+                break
+            updated[pull["number"]] = pull
+        return updated
+
+    def needs_full_sync(self) -> bool:
+        """ Tell whether it's time to compare the full list of open pulls against the database. """
+
+        return (
+            self.watermark is None or
+            self.last_full_sync is None or
+            time.monotonic() - self.last_full_sync >= self.full_sync_interval
+        )
+
     @tasks.loop(seconds=INTERVAL)
     async def loop(self) -> None:
         """
         Sync the bot's state with GitHub. See the class' docstring for a brief description.
         """
 
+        if self.watermark is None:
+            self.watermark = self.load_cursor(self.WATERMARK)
+
+        full_sync = self.needs_full_sync()
         try:
-            live = {_["number"]: _ for _ in await self.github.pulls()}
-            live_numbers = set(live.keys())
+            if full_sync:
+                live = await self.list_open_pulls()
+            else:
+                live = await self.list_updated_pulls(arrow.get(self.watermark))
         except aiohttp.client_exceptions.ClientError as exc:
-            logger.error("%s: failed to fetch open pulls: %s", self.name, exc)
+            logger.error("%s: failed to fetch %s pulls: %s", self.name, "open" if full_sync else "updated", exc)
             return
 
-        cached = {_.number: _ for _ in self.storage.pulls.active_pulls()}
+        cached = {_.number: _ for _ in self.storage.pulls.active_pulls(repo=self.repo)}
+        live_numbers = set(live.keys())
         cached_numbers = set(cached.keys())
 
-        already_closed = cached_numbers - live_numbers
-        new_open = live_numbers - cached_numbers
-        updated = set()
+        if full_sync:
+            already_closed = cached_numbers - live_numbers
+            new_open = live_numbers - cached_numbers
+        else:
+            already_closed = set()  # closing a pull updates it, so it's listed and compared below
+            new_open = set(
+                pn for pn in live_numbers - cached_numbers
+                if live[pn]["state"] == formatters.PullState.OPEN.name
+            )
 
-        still_open = cached_numbers & live_numbers
-        for p in live.values():
-            pn = p["number"]
-            if pn in still_open:
-                if arrow.get(p["updated_at"]) > arrow.get(cached[pn].updated_at):
-                    updated.add(pn)
+        updated = set()
+        for pn in cached_numbers & live_numbers:
+            if arrow.get(live[pn]["updated_at"]) > arrow.get(cached[pn].updated_at):
+                updated.add(pn)
 
-        logger.info("%s: reported as open on GitHub: %s", self.name, sorted(live_numbers))
+        logger.info(
+            "%s: reported as %s on GitHub: %s",
+            self.name, "open" if full_sync else "updated", sorted(live_numbers)
+        )
         logger.info("%s: reported as open by DB: %s", self.name, sorted(cached_numbers))
         logger.info(
             "%s: fetching %s (already closed), %s (new open), %s (updated)",
             self.name, sorted(already_closed), sorted(new_open), sorted(updated)
         )
 
-        ok = await self.fetch_pulls(already_closed | new_open | updated)
+        requested = already_closed | new_open | updated
+        ok = await self.fetch_pulls(requested)
         logger.info("%s: fetched %d pull(s) in total", self.name, len(ok))
+        await self.save_and_notify(ok)
+
+        if full_sync:
+            self.last_full_sync = time.monotonic()
+        if len(ok) == len(requested):  # otherwise, retry the failed pulls on the next iteration
+            self.advance_watermark([_["updated_at"] for _ in (*live.values(), *ok)])
+
+    async def save_and_notify(self, payloads: typing.List[dict]) -> typing.List[storage.models.pull.Pull]:
+        """ Save fresh pull payloads to the database and post updates about them. """
+
+        async with self.__notify_lock:
+            return await self.__save_and_notify(payloads)
+
+    async def __save_and_notify(self, payloads: typing.List[dict]) -> typing.List[storage.models.pull.Pull]:
+        # the caller must hold self.__notify_lock
         with self.storage.session_scope() as s:
-            saved = self.storage.pulls.save_many_from_payload(ok, s=s)
+            saved = self.storage.pulls.save_many_from_payload(payloads, s=s, repo=self.repo)
             await self.sort_for_updates(saved)
+        return saved
+
+    async def receive_pull(self, payload: dict) -> None:
+        """
+        Save and distribute a pull delivered by a webhook (see `WebhookServer`).
+        Deliveries may arrive out of order, so a pull older than the saved one is ignored.
+        The comparison is done under the same lock as saving, so that a concurrent update can't slip in between.
+        """
+
+        payload = gh.decoding.project(payload, self.PULL_KEYS)
+        async with self.__notify_lock:
+            cached = self.storage.pulls.by_number(payload["number"], repo=self.repo)
+            if (
+                cached is not None and cached.updated_at is not None and
+                arrow.get(payload["updated_at"]) < arrow.get(cached.updated_at)
+            ):
+                logger.info("%s: skipping outdated webhook payload for pull #%s", self.name, payload["number"])
+                return
+
+            logger.info("%s: received pull #%s from a webhook", self.name, payload["number"])
+            await self.__save_and_notify([payload])
+
+    async def start(self) -> None:
+        if self.bot.webhooks is not None:
+            self.loop.change_interval(seconds=self.WEBHOOKS_INTERVAL)
+        await super().start()
+
+    def advance_watermark(self, timestamps: typing.Iterable[str]) -> None:
+        """ Remember the most recent update time among the synced pulls, if it's newer than the current one. """
+
+        newest = max(timestamps, key=arrow.get, default=None)
+        if newest is None or (self.watermark is not None and arrow.get(newest) <= arrow.get(self.watermark)):
+            return
+        self.watermark = newest
+        self.save_cursor(self.WATERMARK, self.watermark)
 
     async def sort_for_updates(self, pulls: typing.List[storage.models.pull.Pull]) -> None:
         """
-        Asynchronously post update messages in channels that have subscribed to certain languages, and save their ids.
+        Asynchronously post update messages in channels that have subscribed to certain languages
+        of this repository (see `Client.channel_repo`), and save their ids.
         """
 
         tasks, items = [], []
         for pull in pulls:
             for item in self.bot.settings.channels_by_language.values():
-                language, channels = item.language, item.channels
+                language = item.language
+                channels = [_ for _ in item.channels if self.bot.channel_repo(_).lower() == self.repo.lower()]
                 if language.match(pull.title):
                     messages = {_.channel_id: _ for _ in pull.discord_messages}
                     tasks.extend(
@@ -256,5 +597,21 @@ class MonitorPulls(base.BackgroundCog):
             self.storage.discord.delete_channel_messages(exc.channel_id)
 
     async def status(self) -> dict:
-        # FIXME: make something useful here
-        return {}
+        """ Returns the sync watermark, webhook statistics and the state of the GitHub client's concurrency limiter. """
+        status = dict(
+            watermark=self.watermark,
+            last_full_sync=(
+                "{:.0f}s ago".format(time.monotonic() - self.last_full_sync)
+                if self.last_full_sync is not None else None
+            ),
+            concurrency_window=self.github.limiter.size,
+            requests_in_flight=self.github.limiter.in_flight,
+            requests_queued=self.github.limiter.queue_depth,
+        )
+        if self.bot.webhooks is not None:
+            status.update(
+                webhooks_received=self.bot.webhooks.received,
+                webhooks_duplicate=self.bot.webhooks.duplicates,
+                webhooks_rejected=self.bot.webhooks.rejected,
+            )
+        return status
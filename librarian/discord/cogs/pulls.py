@@ -1,6 +1,7 @@
 import argparse
 import logging
 
+import aiohttp
 import arrow
 import discord
 from discord.ext import commands
@@ -68,7 +69,17 @@ class Pulls(commands.Cog):
         else:
             args.language = custom.Language(args.language)
 
-        pulls = ctx.bot.storage.pulls.count_merged(start_date=args.from_.datetime, end_date=args.to.datetime)
+        repo = ctx.bot.channel_repo(ctx.message.channel.id)
+        fetcher = ctx.bot.fetcher_for(repo)
+        if fetcher is not None:
+            try:
+                await fetcher.backfill_merged(args.from_, args.to)
+            except aiohttp.ClientError as exc:
+                logger.error("Failed to load pulls merged in %s for [%s, %s): %s", repo, args.from_, args.to, exc)
+
+        pulls = ctx.bot.storage.pulls.count_merged(
+            start_date=args.from_.datetime, end_date=args.to.datetime, repo=repo
+        )
         pulls = sorted(
             filter(lambda p: args.language.match(p.title), pulls),
             key=lambda p: p.merged_at
@@ -86,7 +97,7 @@ class Pulls(commands.Cog):
 
         def transform_pulls():
             for p in pulls:
-                yield "- {}".format(formatters.PullFormatter.rich_repr(p, ctx.bot.github.repo))
+                yield "- {}".format(formatters.PullFormatter.rich_repr(p, p.repo or repo))
 
         pages = list(utils.iterator(transform_pulls()))
         for i, page in enumerate(pages):
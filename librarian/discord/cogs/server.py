@@ -169,9 +169,14 @@ class Server(commands.Cog):
             return await ctx.message.channel.send(content=content)
 
         # FIXME: put update_pull_status somewhere else
-        monitor = ctx.bot.get_cog("MonitorPulls")
+        repo = ctx.bot.channel_repo(channel_id)
+        monitor = ctx.bot.monitor_for(repo)
+        if monitor is None:
+            content = "repository `{}` is not monitored (see `.set help`)".format(repo)
+            return await ctx.message.channel.send(content=content)
+
         messages = []
-        for pull in ctx.bot.storage.pulls.active_pulls():
+        for pull in ctx.bot.storage.pulls.active_pulls(repo=monitor.repo):
             message_exists = any(
                 _.channel_id == channel_id
                 for _ in (pull.discord_messages or [])
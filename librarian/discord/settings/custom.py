@@ -67,3 +67,19 @@ class ReviewerRole(base.Int):
             return super().cast()
         except (TypeError, ValueError):
             return base.Int(self.__mask.match(self.value).group("id")).cast()
+
+
+class Repo(base.String):
+    """
+    repository the channel receives updates from, if the bot monitors several of them (the first one by default).
+    possible values: owner-name/repo-name
+    """
+
+    name = "repo"
+    __mask = re.compile(r"^[\w.-]+/[\w.-]+$")
+
+    def check(self):
+        return super().check() and self.__mask.match(super().cast()) is not None
+
+    def cast(self):
+        return super().cast().lower()
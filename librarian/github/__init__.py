@@ -0,0 +1,9 @@
+from .app import GitHubApp  # noqa
+from .client import GitHub, ThrottledError  # noqa
+from .cache import ResponseCache  # noqa
+from .gaps import KnownGaps, RangeSet  # noqa
+from .limiter import AdaptiveLimiter  # noqa
+from .metrics import EndpointStats, RequestMetrics  # noqa
+from .ratelimit import Priority, RateLimit, RateLimitBudget  # noqa
+from .retry import RetryPolicy  # noqa
+from .tokens import PooledToken, TokenPool  # noqa
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+import typing
+
+import aiohttp
+import arrow
+
+from librarian.github import decoding
+
+try:
+    import jwt
+except ImportError:
+    jwt = None
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubApp:
+    """
+    Authentication as a GitHub App installation, which has higher rate limits than a personal token
+    (see https://docs.github.com/en/apps/creating-github-apps/authenticating-with-a-github-app).
+
+    The app signs a short-lived JWT with its private key and exchanges it for an installation token,
+    which lasts for an hour. The token is cached and refreshed `refresh_ahead` seconds before it expires:
+    while it's still usable, the refresh happens in the background, and requests keep using the old token.
+    Concurrent refreshes are merged into one. Requires PyJWT with the `crypto` extra. Example:
+
+        app = GitHubApp(app_id=12345, installation_id=67890, private_key=open("app.pem").read())
+        token = await app.token(session, "https://api.github.com")
+    """
+
+    JWT_ALGORITHM = "RS256"
+    JWT_LIFETIME = 9 * 60  # GitHub accepts up to 10 minutes
+    CLOCK_DRIFT = 60  # the JWT is issued in the past, in case the clocks differ
+    REFRESH_AHEAD = 5 * 60
+    EXPIRY_MARGIN = 30  # a token this close to expiration is not used anymore
+
+    def __init__(
+        self, app_id: typing.Union[int, str], installation_id: typing.Union[int, str], private_key: str,
+        refresh_ahead: float = REFRESH_AHEAD,
+    ):
+        """
+        :param app_id: the app's id from its settings page
+        :param installation_id: the id of the app's installation on the organization or the repository
+        :param private_key: the app's private key in PEM format
+        :param refresh_ahead: how early a token is refreshed before it expires, in seconds
+        """
+
+        if jwt is None:
+            raise RuntimeError("GitHub App authentication requires PyJWT with cryptography (pip install pyjwt[crypto])")
+
+        self.app_id = str(app_id)
+        self.installation_id = str(installation_id)
+        self.refresh_ahead = refresh_ahead
+        self.refreshes = 0
+        self.__private_key = private_key
+        self.__token: typing.Optional[str] = None
+        self.__expires_at = 0.0  # UNIX timestamp
+        self.__refreshing: typing.Optional[asyncio.Future] = None
+
+    @property
+    def label(self) -> str:
+        """ A short name of the installation, which is safe to show. """
+        return "app {}/{}".format(self.app_id, self.installation_id)
+
+    @property
+    def expires_at(self) -> typing.Optional[arrow.Arrow]:
+        """ Expiration time of the current installation token, if there is one. """
+        return arrow.get(self.__expires_at) if self.__token is not None else None
+
+    def make_jwt(self, now: float = None) -> str:
+        """ Sign a token that authenticates the app itself. """
+
+        now = int(now if now is not None else time.time())
+        payload = {"iat": now - self.CLOCK_DRIFT, "exp": now + self.JWT_LIFETIME, "iss": self.app_id}
+        return jwt.encode(payload, self.__private_key, algorithm=self.JWT_ALGORITHM)
+
+    async def token(self, session: aiohttp.ClientSession, base_url: str) -> str:
+        """
+        Return a valid installation token, exchanging a new one if necessary.
+
+        :param session: the session to request a token with
+        :param base_url: GitHub API root
+        """
+
+        remaining = self.__expires_at - time.time()
+        if self.__token is None or remaining <= self.EXPIRY_MARGIN:
+            await asyncio.shield(self.__refresh(session, base_url))
+        elif remaining <= self.refresh_ahead:
+            self.__refresh(session, base_url)
+        return self.__token
+
+    def __refresh(self, session: aiohttp.ClientSession, base_url: str) -> asyncio.Future:
+        if self.__refreshing is None or self.__refreshing.done():
+            self.__refreshing = asyncio.ensure_future(self.__exchange(session, base_url))
+            self.__refreshing.add_done_callback(self.__report)
+        return self.__refreshing
+
+    def __report(self, refreshing: asyncio.Future) -> None:
+        if not refreshing.cancelled() and refreshing.exception() is not None:
+            logger.error("Failed to refresh the installation token of %s: %s", self.label, refreshing.exception())
+
+    async def __exchange(self, session: aiohttp.ClientSession, base_url: str) -> None:
+        url = "{}/app/installations/{}/access_tokens".format(str(base_url).rstrip("/"), self.installation_id)
+        headers = {"Authorization": "Bearer {}".format(self.make_jwt()), "Accept": "application/vnd.github+json"}
+        async with session.post(url, headers=headers) as response:
+            response.raise_for_status()
+            payload = decoding.loads(await response.read())
+
+        self.__token = payload["token"]
+        self.__expires_at = arrow.get(payload["expires_at"]).timestamp()
+        self.refreshes += 1
+        logger.info("Received an installation token for %s, valid until %s", self.label, payload["expires_at"])
@@ -0,0 +1,133 @@
+import collections
+import logging
+import typing
+import urllib.parse
+
+logger = logging.getLogger(__name__)
+
+CacheEntry = collections.namedtuple("CacheEntry", "etag last_modified body")
+
+
+class ResponseCache:
+    """
+    Bounded LRU storage for GitHub API responses, which makes conditional requests possible.
+
+    Every successful GET response that carries an `ETag` or `Last-Modified` header is remembered by its path
+    and query string. The next request to the same resource is sent with `If-None-Match`/`If-Modified-Since`,
+    and if GitHub replies with 304 Not Modified, the cached body is returned instead --
+    such responses don't count against the API rate limit.
+
+    Optionally, the entries are written through to a persistent backend (see `HttpCacheHelper`),
+    so that the cache survives restarts. The backend needs to provide the following methods:
+
+    - `load_entries(limit)`, which returns `(key, etag, last_modified, body)` tuples, least recently stored first;
+    - `save_entry(key, entry)`;
+    - `delete_entries(*keys)`.
+
+    Note: cached bodies are shared between callers, so they must not be modified in place.
+    """
+
+    DEFAULT_SIZE = 512
+
+    HEADER_ETAG = "ETag"
+    HEADER_LAST_MODIFIED = "Last-Modified"
+    HEADER_IF_NONE_MATCH = "If-None-Match"
+    HEADER_IF_MODIFIED_SINCE = "If-Modified-Since"
+
+    def __init__(self, size: int = DEFAULT_SIZE, backend=None):
+        """
+        :param size: max. number of responses to keep
+        :param backend: an object that stores entries between restarts (optional)
+        """
+
+        self.size = size
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.__entries: typing.MutableMapping[str, CacheEntry] = collections.OrderedDict()
+
+        if self.backend is not None:
+            for key, etag, last_modified, body in self.backend.load_entries(self.size):
+                self.__entries[key] = CacheEntry(etag=etag, last_modified=last_modified, body=body)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key: str):
+        return key in self.__entries
+
+    @staticmethod
+    def make_key(path: str, query: dict = None, projection: str = None) -> str:
+        """
+        Create a cache key from an in-site path and query string parameters (their order doesn't matter).
+        Responses that are cut down to certain keys are stored separately (see `decoding.fingerprint`).
+        """
+
+        query_string = urllib.parse.urlencode(sorted((k, str(v)) for k, v in (query or {}).items()))
+        key = "{}?{}".format(path.strip("/"), query_string)
+        if projection is not None:
+            key = "{}#{}".format(key, projection)
+        return key
+
+    def get(self, key: str) -> typing.Optional[CacheEntry]:
+        """ Return a cached response and mark it as the most recently used, if it exists. """
+
+        entry = self.__entries.get(key)
+        if entry is not None:
+            self.__entries.move_to_end(key)
+        return entry
+
+    def conditional_headers(self, key: str) -> typing.Dict[str, str]:
+        """ Create headers for a conditional request to the resource, if it was cached before. """
+
+        entry = self.get(key)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.etag is not None:
+            headers[self.HEADER_IF_NONE_MATCH] = entry.etag
+        if entry.last_modified is not None:
+            headers[self.HEADER_IF_MODIFIED_SINCE] = entry.last_modified
+        return headers
+
+    def hit(self, key: str) -> typing.Any:
+        """ Count a response served from the cache and return its body. """
+
+        self.hits += 1
+        return self.get(key).body
+
+    def store(self, key: str, headers: typing.Mapping, body: typing.Any) -> bool:
+        """
+        Count a request that wasn't served from the cache, and remember the response if it can be validated later.
+        Return whether the response has been stored.
+
+        :param key: cache key (see `make_key`)
+        :param headers: response headers
+        :param body: decoded response body
+        """
+
+        self.misses += 1
+        if self.size <= 0:
+            return False
+
+        etag = headers.get(self.HEADER_ETAG)
+        last_modified = headers.get(self.HEADER_LAST_MODIFIED)
+        if etag is None and last_modified is None:
+            return False
+
+        entry = CacheEntry(etag=etag, last_modified=last_modified, body=body)
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+
+        evicted = []
+        while len(self.__entries) > self.size:
+            evicted_key, _ = self.__entries.popitem(last=False)
+            evicted.append(evicted_key)
+
+        if self.backend is not None:
+            self.backend.save_entry(key, entry)
+            if evicted:
+                self.backend.delete_entries(*evicted)
+
+        return True
@@ -0,0 +1,742 @@
+import asyncio
+import collections
+import datetime
+import http
+import logging
+import time
+import typing
+
+import aiohttp
+
+from librarian.github import app as gh_app
+from librarian.github import cache as gh_cache
+from librarian.github import decoding
+from librarian.github import graphql
+from librarian.github import limiter as gh_limiter
+from librarian.github import metrics as gh_metrics
+from librarian.github import pagination
+from librarian.github import retry as gh_retry
+from librarian.github import tokens as gh_tokens
+from librarian.github.ratelimit import (
+    Priority,
+    RateLimit,
+    RateLimitBudget,
+)
+
+logger = logging.getLogger(__name__)
+
+Response = collections.namedtuple("Response", "status headers body from_cache")
+
+
+class ThrottledError(aiohttp.ClientResponseError):
+    """ GitHub has declined a request due to primary or secondary rate limits. """
+
+
+class InFlightRequest:
+    """ A request that is being performed on behalf of everyone waiting for its result. """
+
+    def __init__(self, task: asyncio.Task, priority: Priority):
+        self.task = task
+        self.priority = priority
+        self.waiters = 0
+
+
+class GitHub:
+    """
+    Asynchronous wrapper around GitHub REST API v3. Requests are authorized with personal tokens
+    or as a GitHub App installation (see `GitHubApp`). Several of them may be given to raise the overall rate limit:
+    requests are spread across them (see `TokenPool`).
+    Two kinds of interfaces are provided:
+
+    1. A limited set of methods to query predefined endpoints, such as repos/<repo>/pulls/<number>.
+    2. `call_method` for anything else that is not wrapped.
+
+    Batches of pulls are read through GraphQL API (see `get_many_pulls`), with REST API used as a fallback.
+
+    All requests pass through an adaptive concurrency limiter, which narrows the number of simultaneous requests
+    when GitHub starts throttling them, and paces request starts (see `AdaptiveLimiter`).
+    Before that, every request receives a permit from the rate limit budget according to its priority,
+    so that background work slows down before the API limit runs out (see `RateLimitBudget`).
+    Idempotent requests that fail for a transient reason are repeated with a growing delay (see `RetryPolicy`).
+    Identical GET requests made at the same time share a single HTTP request and receive the same response.
+    Requests are counted per endpoint, along with their latency, size and rate limit cost (see `RequestMetrics`).
+
+    The wrapper owns a long-lived `aiohttp.ClientSession` with a pooled connector, which is shared by all requests
+    that don't pass their own session, so that TCP and TLS handshakes aren't repeated on every call.
+    The session is created on first use (or with `open()`) and needs to be closed explicitly:
+
+        api = GitHub("AQAD-mytoken", "someone/osu-wiki")
+        data = await asyncio.gather(*(
+            api.get_single_pull(number)
+            for number in range(2000, 2100)
+        ))
+        await api.close()
+    """
+
+    BASE_URL = "https://api.github.com"
+    OBJECTS_PER_PAGE = 100  # the maximum GitHub can provide
+    PAGES_CONCURRENCY = 5
+    GRAPHQL_PATH = "graphql"
+    PULLS_PER_QUERY = 100  # keeps a query well within GitHub's node limit
+    SEARCH_RESULTS_LIMIT = 1000  # GitHub doesn't return more results for a search
+    SEARCH_KEYS = {"total_count": None, "incomplete_results": None, "items": {"number": None}}
+    THROTTLING_MESSAGES = ("secondary rate limit", "abuse detection")
+    SESSION_METHODS = {"get", "options", "head", "post", "put", "batch", "delete"}
+
+    CONNECTIONS_PER_HOST = 20
+    DNS_CACHE_TTL = 300
+    KEEPALIVE_TIMEOUT = 75  # outlives the longest polling interval between two requests
+
+    def __init__(
+        self, token: typing.Union[gh_tokens.Credentials, typing.Sequence[gh_tokens.Credentials]],
+        repo: typing.Union[str, typing.Sequence[str]],
+        cache: gh_cache.ResponseCache = None,
+        connections_per_host: int = CONNECTIONS_PER_HOST, dns_cache_ttl: int = DNS_CACHE_TTL,
+        keepalive_timeout: int = KEEPALIVE_TIMEOUT, use_graphql: bool = True,
+        limiter: gh_limiter.AdaptiveLimiter = None, budget: RateLimitBudget = None,
+        retry: gh_retry.RetryPolicy = None, base_url: str = None,
+    ):
+        """
+        :param token: GitHub API token or a GitHub App installation, or a list of them to spread requests across
+        :param repo: repository name in `owner-name/repo-name` format, or a list of them
+            (methods work with the first one, unless another one is passed explicitly)
+        :param cache: storage for conditional GET requests (optional, see `ResponseCache`)
+        :param connections_per_host: max. number of simultaneous connections to the API host
+        :param dns_cache_ttl: how long resolved addresses are kept, in seconds
+        :param keepalive_timeout: how long an idle connection stays open, in seconds
+        :param use_graphql: fetch batches of pulls with GraphQL queries instead of one REST request per pull
+        :param limiter: concurrency controller for outgoing requests (a default one is created if omitted)
+        :param budget: rate limit accounting for request priorities of the first token, whose reserves are also
+            given to the other tokens (a default one is created if omitted)
+        :param retry: rules for repeating failed requests (a default one is created if omitted)
+        :param base_url: API root to use instead of `BASE_URL` (for example, the one of `simulator.Simulator`)
+        """
+
+        self.tokens = gh_tokens.TokenPool(
+            [token] if isinstance(token, (str, gh_app.GitHubApp)) else token, budget=budget
+        )
+        self.__session: typing.Optional[aiohttp.ClientSession] = None
+        self.budget = self.tokens.tokens[0].budget
+        self.repos = [repo] if isinstance(repo, str) else list(repo)
+        if not self.repos:
+            raise ValueError("At least one repository is required")
+        self.repo = self.repos[0]
+        if base_url is not None:
+            self.BASE_URL = base_url.rstrip("/")
+        self.cache = cache
+        self.use_graphql = use_graphql
+        self.limiter = limiter if limiter is not None else gh_limiter.AdaptiveLimiter()
+        self.retry = retry if retry is not None else gh_retry.RetryPolicy()
+        self.coalesced = 0
+        self.metrics = gh_metrics.RequestMetrics()
+        self.__in_flight: typing.Dict[tuple, InFlightRequest] = {}
+        self.connector_options = dict(
+            limit_per_host=connections_per_host,
+            ttl_dns_cache=dns_cache_ttl,
+            keepalive_timeout=keepalive_timeout,
+        )
+
+    @property
+    def ratelimit(self) -> RateLimit:
+        """ Rate limits of the core REST API for the first token. """
+        return self.budget.buckets[self.budget.DEFAULT_RESOURCE]
+
+    @classmethod
+    def make_default_headers(cls, token: typing.Optional[str]) -> typing.Dict[str, str]:
+        """
+        Create a default set of headers for GitHub API.
+        These carry authorization data and keep the connection open for HTTP/1.1.
+        :param token: GitHub API token or an installation token (`None` to leave the request unauthorized)
+        """
+
+        headers = {"Connection": "keep-alive"}
+        if token is not None:
+            headers["Authorization"] = f"token {token}"
+        return headers
+
+    def make_session(self) -> aiohttp.ClientSession:
+        """
+        Create a default session for asynchronous connection with predefined auth and keep-alive headers,
+        which uses a connection pool configured on initialization. Must be called from a coroutine.
+        """
+
+        first = self.tokens.tokens[0].token
+        return aiohttp.ClientSession(
+            headers=self.make_default_headers(first if isinstance(first, str) else None),
+            connector=aiohttp.TCPConnector(**self.connector_options),
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """ The shared session, which is (re)created on first access. """
+
+        if self.__session is None or self.__session.closed:
+            self.__session = self.make_session()
+        return self.__session
+
+    async def open(self) -> None:
+        """ Create the shared session in advance. """
+
+        logger.debug("Opening a shared session for GitHub API")
+        _ = self.session
+
+    async def close(self) -> None:
+        """ Close the shared session and all of its pooled connections. """
+
+        if self.__session is not None and not self.__session.closed:
+            logger.debug("Closing the shared session for GitHub API")
+            await self.__session.close()
+        self.__session = None
+
+    @classmethod
+    def is_throttled(cls, status: int, headers: typing.Mapping, body: str = "") -> bool:
+        """
+        Tell whether a response has been caused by exceeding primary or secondary rate limits.
+        Secondary rate limits don't always come with headers, so the 403 response's message is also checked.
+        """
+
+        if status == http.HTTPStatus.TOO_MANY_REQUESTS:
+            return True
+        return status == http.HTTPStatus.FORBIDDEN and (
+            "Retry-After" in headers or
+            headers.get(RateLimit.HEADER_REMAINING) == "0" or
+            any(marker in body.lower() for marker in cls.THROTTLING_MESSAGES)
+        )
+
+    async def request(
+        self, path: str, query: dict = None, data: dict = None,
+        session: aiohttp.ClientSession = None, method: str = "get", priority: Priority = Priority.INTERACTIVE,
+        idempotent: bool = None, keys: decoding.Keys = None,
+    ) -> Response:
+        """
+        Perform HTTP request with optional query string and JSON payload,
+        allowing it up to 300s to complete, and return the response with decoded JSON on success.
+        Raise `aiohttp.client_exceptions.ClientResponseError` on 4xx and 5xx response codes.
+
+        JSON is decoded with orjson if it's installed. To not hold onto unused data, the result may be cut down
+        to the needed keys right after decoding (see `decoding.project`); such responses are cached separately.
+
+        If the response cache is set up, GET requests for previously seen resources are made conditional,
+        and 304 Not Modified responses are served from the cache.
+
+        Idempotent requests are repeated on network errors, 5xx responses and throttling, according to the retry policy.
+
+        GET requests made with the shared session are coalesced: if an identical request of the same or higher priority
+        is already in progress, its result is awaited instead (note that in this case, the response body is shared).
+
+        :param path: in-site path without domain name (for ex., "repos/someone/some-repo/pulls")
+        :param query: a dict with query string parameters
+        :param data: request body (must be a JSON-serializable dictionary)
+        :param session: client session object (the shared one is used if omitted)
+        :param method: HTTP verb (any case), one of: GET, OPTIONS, HEAD, POST, PUT, PATCH, DELETE.
+        :param priority: how urgent the request is when the rate limit runs low (see `RateLimitBudget`)
+        :param idempotent: whether the request is safe to repeat (decided by the retry policy from HTTP verb if omitted)
+        :param keys: keys to keep in the response (or in its every item if it's a list), or a nested projection
+        """
+
+        method = method.lower()
+        if method not in self.SESSION_METHODS:
+            raise ValueError(f"Unknown HTTP verb {method.upper()}")
+
+        projection = decoding.make_projection(keys)
+        if method != "get" or session is not None:
+            return await self.__request_with_retries(
+                path, query, data, session, method, priority, idempotent, projection
+            )
+
+        key = (path, tuple(sorted((query or {}).items())), decoding.fingerprint(projection))
+        request = self.__in_flight.get(key)
+        if request is not None and request.priority <= priority:
+            self.coalesced += 1
+            self.metrics.coalesced(path)
+        else:
+            request = InFlightRequest(
+                asyncio.ensure_future(
+                    self.__request_with_retries(path, query, data, session, method, priority, idempotent, projection)
+                ),
+                priority,
+            )
+            self.__in_flight[key] = request
+            request.task.add_done_callback(lambda _: self.__forget_request(key, request))
+
+        request.waiters += 1
+        try:
+            return await asyncio.shield(request.task)
+        except asyncio.CancelledError:
+            if request.waiters == 1:  # nobody else needs the result
+                request.task.cancel()
+            raise
+        finally:
+            request.waiters -= 1
+
+    def __forget_request(self, key: tuple, request: InFlightRequest) -> None:
+        if self.__in_flight.get(key) is request:
+            del self.__in_flight[key]
+        if not request.task.cancelled():
+            request.task.exception()  # the waiters have received it, or have been cancelled
+
+    async def __request_with_retries(
+        self, path: str, query: typing.Optional[dict], data: typing.Optional[dict],
+        session: typing.Optional[aiohttp.ClientSession], method: str, priority: Priority,
+        idempotent: typing.Optional[bool], projection: decoding.Projection,
+    ) -> Response:
+        attempt = 0
+        while True:
+            try:
+                return await self.__request_once(path, query, data, session, method, priority, projection)
+            except (aiohttp.ClientResponseError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                    asyncio.TimeoutError) as exc:
+                status = getattr(exc, "status", None)
+                headers = getattr(exc, "headers", None) or {}
+                throttled = isinstance(exc, ThrottledError)
+                transient = status is None or status >= http.HTTPStatus.INTERNAL_SERVER_ERROR or throttled
+
+                delay = None
+                if transient and self.retry.allows(method, attempt, idempotent=idempotent):
+                    delay = self.retry.backoff(attempt, headers=headers, throttled=throttled)
+                if delay is None:
+                    raise
+
+                attempt += 1
+                self.retry.retries += 1
+                logger.debug(
+                    "%s /%s failed (%s), retrying in %.1fs (attempt %d/%d)",
+                    method.upper(), path, status or type(exc).__name__, delay, attempt + 1, self.retry.attempts
+                )
+                await asyncio.sleep(delay)
+
+    async def __request_once(
+        self, path: str, query: typing.Optional[dict], data: typing.Optional[dict],
+        session: typing.Optional[aiohttp.ClientSession], method: str, priority: Priority,
+        projection: decoding.Projection, conditional: bool = True,
+    ) -> Response:
+        if session is None:
+            session = self.session
+
+        session_method = getattr(session, method)
+        query = query or {}
+        url = f"{self.BASE_URL}/{path}"
+
+        cache_key = None
+        headers = {}
+        if self.cache is not None and method == "get":
+            cache_key = self.cache.make_key(path, query, projection=decoding.fingerprint(projection))
+            if conditional:
+                headers = self.cache.conditional_headers(cache_key)
+
+        resource = RateLimitBudget.resource_for(path)
+        token = self.tokens.pick(resource)
+        await token.budget.acquire(resource, priority)
+        token.requests += 1
+        credentials = await token.credentials(session, self.BASE_URL)
+        request_headers = dict(headers, **self.make_default_headers(credentials))
+        async with self.limiter:
+            started, size = time.monotonic(), 0
+            async with session_method(url, params=query, json=data, headers=request_headers) as result:
+                try:
+                    await self.__adapt_limiter(result)
+                    if result.status == http.HTTPStatus.NOT_MODIFIED:
+                        if cache_key is not None and cache_key in self.cache:
+                            self.metrics.cache_hit(path)
+                            return Response(
+                                status=result.status, headers=result.headers, body=self.cache.hit(cache_key),
+                                from_cache=True,
+                            )
+                        if not headers:
+                            raise aiohttp.ClientResponseError(
+                                result.request_info, result.history, status=result.status,
+                                message="Not Modified, but nothing is cached", headers=result.headers,
+                            )
+                    else:
+                        if result.status >= http.HTTPStatus.BAD_REQUEST:
+                            result.raise_for_status()
+
+                        raw = await result.read()
+                        size = len(raw)
+                        body = self.decode(raw, projection, "{} /{}".format(method.upper(), path))
+                        if cache_key is not None:
+                            self.cache.store(cache_key, result.headers, body)
+                        return Response(status=result.status, headers=result.headers, body=body, from_cache=False)
+                finally:
+                    token.budget.update(result.headers)
+                    self.metrics.record(
+                        path, result.status, time.monotonic() - started, size or result.content_length or 0,
+                        result.headers, token=token.label,
+                    )
+
+        # the cached response has been evicted while the request was in flight
+        logger.debug("%s /%s: nothing to validate, repeating the request unconditionally", method.upper(), path)
+        return await self.__request_once(path, query, data, session, method, priority, projection, conditional=False)
+
+    @staticmethod
+    def decode(data: bytes, projection: decoding.Projection, request: str) -> typing.Any:
+        """
+        Decode and project a response body. A malformed body is reported as `aiohttp.ClientPayloadError`,
+        so that it's handled together with other failed requests.
+
+        :param data: response body
+        :param projection: the parts of the body to keep (see `decoding.project`)
+        :param request: request description for the error message
+        """
+
+        try:
+            return decoding.project(decoding.loads(data), projection)
+        except ValueError as exc:  # includes orjson.JSONDecodeError
+            raise aiohttp.ClientPayloadError("Malformed JSON in response to {}: {}".format(request, exc)) from exc
+
+    async def __adapt_limiter(self, result: aiohttp.ClientResponse) -> None:
+        # the window shrinks on throttled responses, which are raised right away, and grows on successful ones
+        message = await result.text() if result.status == http.HTTPStatus.FORBIDDEN else ""
+        if self.is_throttled(result.status, result.headers, message):
+            self.limiter.throttled()
+            raise ThrottledError(
+                result.request_info, result.history,
+                status=result.status, message=result.reason, headers=result.headers,
+            )
+        if result.status < http.HTTPStatus.INTERNAL_SERVER_ERROR:
+            self.limiter.succeeded()
+
+    async def call_method(
+        self, path: str, query: dict = None, data: dict = None,
+        session: aiohttp.ClientSession = None, method: str = "get", priority: Priority = Priority.INTERACTIVE,
+        keys: decoding.Keys = None,
+    ) -> dict:
+        """ Perform HTTP request and return decoded JSON on success. See `request` for details. """
+
+        response = await self.request(
+            path=path, query=query, data=data, session=session, method=method, priority=priority, keys=keys,
+        )
+        return response.body
+
+    async def get(
+        self, path: str, query: dict = None, session: aiohttp.ClientSession = None,
+        priority: Priority = Priority.INTERACTIVE, keys: decoding.Keys = None,
+    ) -> typing.Optional[dict]:
+        """ Perform GET HTTP request. """
+        return await self.call_method(
+            path=path, query=query, session=session, method="get", priority=priority, keys=keys,
+        )
+
+    async def post(
+        self, path: str, query: dict = None, data: dict = None,
+        session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE,
+    ) -> typing.Optional[dict]:
+        """ Perform POST HTTP request. """
+        return await self.call_method(
+            path=path, query=query, data=data, session=session, method="post", priority=priority
+        )
+
+    async def get_single_pull(
+        self, pull_id: int, session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE,
+        keys: decoding.Keys = None, repo: str = None,
+    ) -> typing.Optional[dict]:
+        """
+        Fetch the data about one pull from the repository. Because pulls are extended issues,
+        some information is also accessible when reading a pull as an issue (see `get_single_issue`).
+        The payload can be cut down to the needed `keys` (see `request`).
+        """
+
+        path = f"repos/{repo or self.repo}/pulls/{pull_id}"
+        try:
+            return await self.get(path, session=session, priority=priority, keys=keys)
+        except aiohttp.client_exceptions.ClientResponseError as exc:
+            if exc.status == http.HTTPStatus.NOT_FOUND:
+                return None
+            raise exc
+
+    async def get_single_issue(
+        self, issue_id: int, session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE,
+        repo: str = None,
+    ) -> typing.Optional[dict]:
+        """
+        Fetch the data about one issue from the repository. Pulls may also be accessed through this method,
+        although response is scarce -- use `get_single_pull` instead.
+        """
+
+        path = f"repos/{repo or self.repo}/issues/{issue_id}"
+        try:
+            return await self.get(path, session=session, priority=priority)
+        except aiohttp.client_exceptions.ClientResponseError as exc:
+            if exc.status == http.HTTPStatus.NOT_FOUND:
+                return None
+            raise exc
+
+    async def graphql(
+        self, query: str, variables: dict = None, session: aiohttp.ClientSession = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> dict:
+        """
+        Run a GraphQL query and return its `data` part. Raise `GraphQLError` if the query has failed as a whole;
+        partial failures (such as objects that don't exist) are tolerated, and corresponding values are `None`.
+        """
+
+        data = dict(query=query, variables=variables or {})
+        response = (await self.request(
+            self.GRAPHQL_PATH, data=data, session=session, method="post", priority=priority, idempotent=True,
+        )).body  # queries don't change anything, so they are safe to repeat
+        if not isinstance(response, dict) or response.get("data") is None:
+            errors = response.get("errors") if isinstance(response, dict) else None
+            raise graphql.GraphQLError(errors or [{"message": "no data in response"}])
+        return response["data"]
+
+    async def get_many_pulls(
+        self, numbers: typing.Iterable[int], session: aiohttp.ClientSession = None,
+        priority: Priority = Priority.INTERACTIVE, keys: decoding.Keys = None, repo: str = None,
+    ) -> typing.Dict[int, typing.Union[dict, None, Exception]]:
+        """
+        Fetch the data about multiple pulls from the repository, up to `PULLS_PER_QUERY` per GraphQL query,
+        and return it in the same format as `get_single_pull` does (optionally, cut down to the needed `keys`).
+        Pulls that can't be read with GraphQL are requested one by one through REST API.
+
+        The result maps pull numbers to their payloads, `None` for pulls that don't exist,
+        or exceptions for pulls that failed to be fetched.
+        """
+
+        numbers = list(numbers)
+        results: typing.Dict[int, typing.Union[dict, None, Exception]] = {}
+
+        if self.use_graphql:
+            chunks = [
+                numbers[i: i + self.PULLS_PER_QUERY]
+                for i in range(0, len(numbers), self.PULLS_PER_QUERY)
+            ]
+            batches = await asyncio.gather(*(
+                self.__query_pulls(chunk, session=session, priority=priority, repo=repo)
+                for chunk in chunks
+            ), return_exceptions=True)
+
+            for chunk, batch in zip(chunks, batches):
+                if isinstance(batch, Exception):
+                    logger.warning("Failed to query %d pull(s) with GraphQL, using REST API: %s", len(chunk), batch)
+                    continue
+                results.update(
+                    (number, decoding.project(pull, decoding.make_projection(keys)))
+                    for number, pull in batch.items() if pull is not None
+                )
+
+        missing = [number for number in numbers if number not in results]
+        fallback = await asyncio.gather(*(
+            self.get_single_pull(number, session=session, priority=priority, keys=keys, repo=repo)
+            for number in missing
+        ), return_exceptions=True)
+        results.update(zip(missing, fallback))
+
+        return {number: results[number] for number in numbers}
+
+    async def __query_pulls(
+        self, numbers: typing.List[int], session: aiohttp.ClientSession = None,
+        priority: Priority = Priority.INTERACTIVE, repo: str = None,
+    ) -> typing.Dict[int, typing.Optional[dict]]:
+        owner, name = (repo or self.repo).split("/")
+        data = await self.graphql(
+            graphql.make_pulls_query(numbers), variables=dict(owner=owner, name=name),
+            session=session, priority=priority,
+        )
+
+        repository = data.get("repository") or {}
+        results = {}
+        for number in numbers:
+            node = repository.get(graphql.pull_alias(number))
+            results[number] = graphql.normalize_pull(node) if node is not None else None
+        return results
+
+    async def search_merged_pulls(
+        self, start: datetime.date, end: datetime.date, session: aiohttp.ClientSession = None,
+        priority: Priority = Priority.INTERACTIVE, repo: str = None,
+    ) -> typing.Tuple[typing.Set[int], bool]:
+        """
+        Find the numbers of pulls merged from `start` to `end` (both dates inclusive) with Search API, which has
+        a separate, much lower rate limit (see `RateLimitBudget`). Since a search returns `SEARCH_RESULTS_LIMIT`
+        results at most, a longer window is split in halves. Also tells whether the results are complete
+        (GitHub may give up on a search that takes too long).
+
+        :param start: the first day of the window
+        :param end: the last day of the window
+        :param session: client session object
+        :param priority: how urgent the requests are when the rate limit runs low
+        :param repo: repository name (the first one by default)
+        """
+
+        query = dict(
+            q="repo:{} is:pr is:merged merged:{}..{}".format(repo or self.repo, start.isoformat(), end.isoformat()),
+            sort="created", order="asc", per_page=self.OBJECTS_PER_PAGE,
+        )
+        numbers, complete, page = set(), True, 1
+        while True:
+            response = await self.request(
+                "search/issues", dict(query, page=page), session=session, priority=priority, keys=self.SEARCH_KEYS,
+            )
+            total = response.body.get("total_count", 0)
+            if total > self.SEARCH_RESULTS_LIMIT and start < end:
+                middle = start + (end - start) // 2
+                halves = await asyncio.gather(*(
+                    self.search_merged_pulls(a, b, session=session, priority=priority, repo=repo)
+                    for a, b in ((start, middle), (middle + datetime.timedelta(days=1), end))
+                ))
+                return halves[0][0] | halves[1][0], halves[0][1] and halves[1][1]
+
+            items = response.body.get("items") or []
+            numbers.update(_["number"] for _ in items)
+            complete = complete and not response.body.get("incomplete_results", False)
+            if not items or page * self.OBJECTS_PER_PAGE >= min(total, self.SEARCH_RESULTS_LIMIT):
+                return numbers, complete and len(numbers) >= min(total, self.SEARCH_RESULTS_LIMIT)
+            page += 1
+
+    async def paginate(
+        self, path: str, query: dict = None, keys: decoding.Keys = None, parallel: bool = True,
+        session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE,
+    ) -> typing.AsyncIterator[typing.List[dict]]:
+        """
+        Iterate over pages of a listing, yielding each one in order as soon as it arrives, for example:
+
+            async for page in api.paginate("repos/ppy/osu-wiki/issues", keys=("number", "title")):
+                save(page)
+
+        With `parallel` set, the number of pages is read from the first page's `Link` header,
+        and the rest of them are requested in advance (up to `PAGES_CONCURRENCY` at once) --
+        stopping the iteration early cancels the requests that haven't completed.
+        Otherwise, or without the header, pages are requested one by one, which is cheaper to stop early.
+
+        :param path: in-site path of the listing
+        :param query: a dict with query string parameters (`page` and `per_page` are set automatically)
+        :param keys: keys to keep in every item, to not hold onto unused data (everything is kept if omitted).
+            A nested projection may be passed instead (see `decoding.project`)
+        :param parallel: whether to request pages in advance
+        :param session: client session object
+        :param priority: how urgent the requests are when the rate limit runs low
+        """
+
+        base_query = dict(query or {}, per_page=self.OBJECTS_PER_PAGE)
+
+        async def fetch(page):
+            response = await self.request(
+                path, dict(base_query, page=page), session=session, priority=priority, keys=keys
+            )
+            return response.headers, response.body if isinstance(response.body, list) else []
+
+        headers, items = await fetch(1)
+        if not items:
+            return
+        yield items
+
+        last_page = pagination.last_page(headers)
+        if parallel and last_page is not None:
+            semaphore = asyncio.Semaphore(self.PAGES_CONCURRENCY)
+
+            async def fetch_bounded(page):
+                async with semaphore:
+                    return await fetch(page)
+
+            tasks = [asyncio.create_task(fetch_bounded(page)) for page in range(2, last_page + 1)]
+            try:
+                for task in tasks:
+                    _, items = await task
+                    yield items
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        else:
+            page = 1
+            while pagination.has_next_page(headers, len(items), self.OBJECTS_PER_PAGE):
+                page += 1
+                headers, items = await fetch(page)
+                if not items:
+                    break
+                yield items
+
+    async def pulls_page(
+        self, page: int, state: str = "open", direction: str = "asc", sort: str = "created",
+        keys: decoding.Keys = None, session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE,
+        repo: str = None,
+    ) -> typing.Tuple[typing.List[dict], bool]:
+        """
+        Fetch a single page of the pulls listing (`OBJECTS_PER_PAGE` pulls at most), and tell whether it's not the last.
+        Useful for resumable walks over the listing; see `pulls` for the parameters.
+
+        :param page: page number, starting from 1
+        """
+
+        response = await self.request(
+            f"repos/{repo or self.repo}/pulls",
+            dict(state=state, sort=sort, direction=direction, per_page=self.OBJECTS_PER_PAGE, page=page),
+            session=session, priority=priority, keys=keys,
+        )
+        pulls = response.body if isinstance(response.body, list) else []
+        return pulls, bool(pulls) and pagination.has_next_page(response.headers, len(pulls), self.OBJECTS_PER_PAGE)
+
+    async def iter_items(
+        self, path: str, query: dict = None, keys: decoding.Keys = None, parallel: bool = True,
+        session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE,
+    ) -> typing.AsyncIterator[dict]:
+        """ Iterate over items of a listing one by one. See `paginate` for details. """
+
+        async for page in self.paginate(
+            path, query=query, keys=keys, parallel=parallel, session=session, priority=priority
+        ):
+            for item in page:
+                yield item
+
+    def iter_pulls(
+        self, state: str = "open", direction: str = "asc", sort: str = "created",
+        keys: decoding.Keys = None, parallel: bool = True,
+        session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE, repo: str = None,
+    ) -> typing.AsyncIterator[dict]:
+        """
+        Iterate over pulls that fit given conditions as they arrive. See `pulls` and `paginate` for the parameters.
+        """
+
+        return self.iter_items(
+            f"repos/{repo or self.repo}/pulls", query=dict(state=state, sort=sort, direction=direction),
+            keys=keys, parallel=parallel, session=session, priority=priority,
+        )
+
+    def iter_issues(
+        self, state: str = "open", direction: str = "asc", sort: str = "created", since: str = None,
+        keys: decoding.Keys = None, parallel: bool = True,
+        session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE, repo: str = None,
+    ) -> typing.AsyncIterator[dict]:
+        """
+        Iterate over issues that fit given conditions as they arrive. Note that GitHub considers every pull an issue,
+        so pulls are also listed (they have the `pull_request` key).
+
+        :param state: issue state, one of: "open", "closed", "all"
+        :param direction: sorting direction, "asc" for ascending, or "desc" for descending
+        :param sort: name of a field to sort by, one of: "created", "updated", "comments".
+            Refer to https://docs.github.com/en/rest/issues/issues#list-repository-issues
+        :param since: only list issues updated at or after this time (ISO 8601 timestamp)
+        :param repo: repository name (the first one by default)
+        """
+
+        query = dict(state=state, sort=sort, direction=direction)
+        if since is not None:
+            query["since"] = since
+        return self.iter_items(
+            f"repos/{repo or self.repo}/issues", query=query, keys=keys, parallel=parallel, session=session,
+            priority=priority,
+        )
+
+    async def pulls(
+        self, state: str = "open", direction: str = "asc", sort: str = "created",
+        session: aiohttp.ClientSession = None, priority: Priority = Priority.INTERACTIVE, repo: str = None,
+    ) -> typing.List[dict]:
+        """
+        List all pulls that fit given conditions, while iterating over their listing if it has multiple pages
+        (see `paginate`). To process pulls before the whole listing is loaded, use `iter_pulls` instead.
+
+        :param state: pull state, one of: "open", "closed", "all"
+        :param direction: sorting direction, "asc" for ascending, or "desc" for descending
+        :param sort: name of a field to sort by, one of: "created", "updated", "popularity", "long-running".
+            Refer to https://docs.github.com/en/rest/reference/pulls#list-pull-requests
+        :param session: client session object
+        :param priority: how urgent the requests are when the rate limit runs low
+        :param repo: repository name (the first one by default)
+        """
+
+        return [
+            pull
+            async for pull in self.iter_pulls(
+                state=state, direction=direction, sort=sort, session=session, priority=priority, repo=repo
+            )
+        ]
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import typing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# A projection describes the part of a JSON document to keep: every key maps to either `None` (keep the value as is),
+# or a nested projection, which is applied to a dictionary, or to every item of a list. Example:
+#   {"number": None, "user": {"login": None}, "assignees": {"login": None}}
+Projection = typing.Optional[typing.Mapping[str, typing.Any]]
+Keys = typing.Union[typing.Iterable[str], typing.Mapping[str, typing.Any], None]
+
+
+def loads(data: typing.Union[bytes, str]) -> typing.Any:
+    """
+    Decode a JSON document with the fastest available backend (orjson, if it's installed, or the standard library).
+    An empty document is decoded as `None`, and a malformed one raises `ValueError`.
+    """
+
+    if not data.strip():
+        return None
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def make_projection(keys: Keys) -> Projection:
+    """ Turn a sequence of top-level keys into a projection. Projections and `None` are returned as they are. """
+
+    if keys is None or isinstance(keys, typing.Mapping):
+        return keys
+    return {k: None for k in keys}
+
+
+def fingerprint(projection: Projection) -> typing.Optional[str]:
+    """ Make a short stable digest of a projection, which is suitable for a cache key. """
+
+    if projection is None:
+        return None
+    canonical = json.dumps(projection, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+
+def project(value: typing.Any, projection: Projection) -> typing.Any:
+    """
+    Keep only the parts of a decoded JSON document described by a projection. A list is projected item by item,
+    and missing keys are skipped. Without a projection, the value is returned as it is.
+    """
+
+    if projection is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, projection) for item in value]
+    if isinstance(value, dict):
+        return {k: project(value[k], sub) for k, sub in projection.items() if k in value}
+    return value
@@ -0,0 +1,141 @@
+import bisect
+import time
+import typing
+
+
+class RangeSet:
+    """
+    A set of integers stored as sorted, non-overlapping, inclusive ranges, which stays small
+    for long runs of consecutive numbers (for example, issues between pulls):
+
+        numbers = RangeSet()
+        for n in (1, 2, 3, 7):
+            numbers.add(n)
+        assert 2 in numbers and numbers.ranges == [[1, 3], [7, 7]]
+    """
+
+    def __init__(self, ranges: typing.Iterable[typing.Sequence[int]] = ()):
+        self.ranges: typing.List[typing.List[int]] = []
+        for start, end in ranges:
+            self.add_range(start, end)
+
+    def add_range(self, start: int, end: int) -> None:
+        """ Add all numbers from `start` to `end` inclusively, merging overlapping and adjacent ranges. """
+
+        merged = []
+        placed = False
+        for r in self.ranges:
+            if r[1] < start - 1:
+                merged.append(r)
+            elif r[0] > end + 1:
+                if not placed:
+                    merged.append([start, end])
+                    placed = True
+                merged.append(r)
+            else:
+                start, end = min(start, r[0]), max(end, r[1])
+        if not placed:
+            merged.append([start, end])
+        self.ranges = merged
+
+    def add(self, number: int) -> None:
+        """ Add a single number. """
+
+        if number not in self:
+            self.add_range(number, number)
+
+    def missing(self, start: int, end: int) -> typing.List[typing.List[int]]:
+        """ List the ranges between `start` and `end` (inclusively) that aren't in the set. """
+
+        result = []
+        for r_start, r_end in self.ranges:
+            if r_end < start:
+                continue
+            if r_start > end:
+                break
+            if r_start > start:
+                result.append([start, r_start - 1])
+            start = max(start, r_end + 1)
+        if start <= end:
+            result.append([start, end])
+        return result
+
+    def __contains__(self, number: int) -> bool:
+        i = bisect.bisect_right(self.ranges, [number, float("inf")])
+        return i > 0 and self.ranges[i - 1][0] <= number <= self.ranges[i - 1][1]
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    def __repr__(self):
+        return "RangeSet({})".format(self.ranges)
+
+
+class KnownGaps:
+    """
+    Numbers of the repository that are known not to be pulls, so that they aren't requested again:
+
+    - issues, which stay issues forever;
+    - missing numbers (deleted or transferred issues), which are only remembered for `missing_ttl` seconds,
+      in case they were hidden temporarily.
+
+    The state is made of basic Python structures, so that it can be kept in `Metadata`
+    (see `as_state` and `from_state`).
+    """
+
+    MISSING_TTL = 24 * 60 * 60
+
+    def __init__(self, missing_ttl: float = MISSING_TTL):
+        self.missing_ttl = missing_ttl
+        self.issues = RangeSet()
+        self.missing: typing.Dict[int, float] = {}  # number -> expiration (UNIX timestamp)
+
+    def add_issue(self, number: int) -> None:
+        """ Remember that a number belongs to an issue. """
+
+        self.issues.add(number)
+        self.missing.pop(number, None)
+
+    def add_missing(self, number: int) -> None:
+        """ Remember that a number has no pull or issue behind it, for a while. """
+
+        self.missing[number] = time.time() + self.missing_ttl
+
+    def is_issue(self, number: int) -> bool:
+        """ Tell whether a number is known to belong to an issue. """
+
+        return number in self.issues
+
+    def is_missing(self, number: int) -> bool:
+        """ Tell whether a number was recently found to be missing. """
+
+        expires_at = self.missing.get(number)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self.missing[number]
+            return False
+        return True
+
+    def prune(self) -> None:
+        """ Forget expired missing numbers. """
+
+        now = time.time()
+        self.missing = {n: expires_at for n, expires_at in self.missing.items() if expires_at > now}
+
+    def as_state(self) -> dict:
+        """ Represent the known gaps in a form suitable for `Metadata`. """
+
+        self.prune()
+        return dict(issues=[list(_) for _ in self.issues.ranges], missing=dict(self.missing))
+
+    @classmethod
+    def from_state(cls, state: typing.Optional[dict], missing_ttl: float = MISSING_TTL) -> "KnownGaps":
+        """ Restore the known gaps saved with `as_state`. """
+
+        gaps = cls(missing_ttl=missing_ttl)
+        if state:
+            gaps.issues = RangeSet(state.get("issues", ()))
+            gaps.missing = dict(state.get("missing", {}))
+            gaps.prune()
+        return gaps
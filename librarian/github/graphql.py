@@ -0,0 +1,98 @@
+import typing
+
+# https://docs.github.com/en/graphql/reference/objects#pullrequest
+PULL_FIELDS = """
+fragment PullFields on PullRequest {
+  databaseId
+  number
+  state
+  locked
+  title
+  createdAt
+  updatedAt
+  mergedAt
+  merged
+  isDraft
+  changedFiles
+  commits { totalCount }
+  reviews(first: 100) { nodes { comments { totalCount } } }
+  author {
+    login
+    ... on User { databaseId }
+    ... on Bot { databaseId }
+    ... on Mannequin { databaseId }
+  }
+  assignees(first: 100) { nodes { login databaseId } }
+}
+"""
+
+PULLS_QUERY = """
+query($owner: String!, $name: String!) {{
+  repository(owner: $owner, name: $name) {{
+{aliases}
+  }}
+}}
+"""
+
+# GitHub substitutes deleted accounts with this one in REST API responses
+GHOST_USER = {"login": "ghost", "id": 10137}
+
+
+class GraphQLError(Exception):
+    """ A GraphQL query has failed as a whole (for example, due to a syntax error or exceeded limits). """
+
+    def __init__(self, errors: typing.List[dict]):
+        self.errors = errors
+        super().__init__("; ".join(str(_.get("message")) for _ in errors))
+
+
+def pull_alias(number: int) -> str:
+    """ Name under which a pull is returned in a batched response. """
+    return f"pull_{number}"
+
+
+def make_pulls_query(numbers: typing.Iterable[int]) -> str:
+    """
+    Create a query that reads several pulls of a repository at once. The repository is passed via variables:
+
+        {"owner": "ppy", "name": "osu-wiki"}
+    """
+
+    aliases = "\n".join(
+        "    {}: pullRequest(number: {}) {{ ...PullFields }}".format(pull_alias(number), int(number))
+        for number in numbers
+    )
+    return PULLS_QUERY.format(aliases=aliases) + PULL_FIELDS
+
+
+def normalize_pull(node: dict) -> dict:
+    """
+    Convert a pull from a GraphQL response into the shape of REST API payloads, as expected by `Pull.update()`.
+
+    Note: `review_comments` is a sum of comments left with the first 100 reviews,
+    which is equal to the REST API value for anything that isn't extremely long-running.
+    """
+
+    author = node.get("author")
+    if author is None:
+        user = dict(GHOST_USER)
+    else:
+        user = {"login": author["login"], "id": author.get("databaseId")}
+
+    return {
+        "id": node["databaseId"],
+        "number": node["number"],
+        "state": "open" if node["state"] == "OPEN" else "closed",
+        "locked": node["locked"],
+        "title": node["title"],
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "merged_at": node["mergedAt"],
+        "merged": node["merged"],
+        "draft": node["isDraft"],
+        "changed_files": node["changedFiles"],
+        "commits": node["commits"]["totalCount"],
+        "review_comments": sum(_["comments"]["totalCount"] for _ in node["reviews"]["nodes"]),
+        "user": user,
+        "assignees": [{"login": _["login"], "id": _["databaseId"]} for _ in node["assignees"]["nodes"]],
+    }
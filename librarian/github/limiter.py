@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency controller for outgoing requests, which adjusts itself to how GitHub responds (AIMD-style):
+
+    - every successful response widens the window of simultaneous requests by `1 / window`
+      (roughly +1 per window's worth of successes), up to `maximum`;
+    - every throttling response (403/429 from primary or secondary rate limits) halves it, down to `minimum`.
+      Throttling responses that arrive shortly after a decrease are considered a part of the same burst.
+
+    Besides that, request starts are spaced evenly at least `spacing` seconds apart to avoid bursts. Usage:
+
+        limiter = AdaptiveLimiter(initial=8)
+        async with limiter:
+            status = await make_request()
+            limiter.throttled() if status == 429 else limiter.succeeded()
+    """
+
+    INITIAL = 8
+    MINIMUM = 1
+    MAXIMUM = 32
+    SPACING = 0.02
+    DECREASE_FACTOR = 0.5
+    THROTTLE_COOLDOWN = 1.0
+
+    def __init__(
+        self, initial: int = INITIAL, minimum: int = MINIMUM, maximum: int = MAXIMUM, spacing: float = SPACING
+    ):
+        """
+        :param initial: starting number of simultaneous requests
+        :param minimum: the window never shrinks below this value
+        :param maximum: the window never grows above this value
+        :param spacing: min. interval between two request starts, in seconds
+        """
+
+        if not 0 < minimum <= initial <= maximum:
+            raise ValueError(f"Expected 0 < minimum <= initial <= maximum, got {minimum}, {initial}, {maximum}")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.spacing = spacing
+        self.window = float(initial)
+        self.in_flight = 0
+
+        self.__waiting = 0
+        self.__next_start = 0.0
+        self.__last_decrease = None
+        self.__condition = asyncio.Condition()
+
+    @property
+    def size(self) -> int:
+        """ Current number of requests that may run simultaneously. """
+        return int(self.window)
+
+    @property
+    def queue_depth(self) -> int:
+        """ Number of requests waiting for a free slot. """
+        return self.__waiting
+
+    async def acquire(self) -> None:
+        """ Wait for a free slot in the window, and then for the request's turn to start. """
+
+        async with self.__condition:
+            self.__waiting += 1
+            try:
+                await self.__condition.wait_for(lambda: self.in_flight < self.size)
+            finally:
+                self.__waiting -= 1
+            self.in_flight += 1
+
+        now = time.monotonic()
+        delay = max(0.0, self.__next_start - now)
+        self.__next_start = max(now, self.__next_start) + self.spacing
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:  # the caller never gets to release the slot
+                await self.release()
+                raise
+
+    async def release(self) -> None:
+        """ Free the slot taken by a finished request. """
+
+        async with self.__condition:
+            self.in_flight -= 1
+            self.__condition.notify_all()
+
+    def succeeded(self) -> None:
+        """ Additively widen the window after a successful response. """
+        self.window = min(float(self.maximum), self.window + 1 / self.window)
+
+    def throttled(self) -> None:
+        """ Multiplicatively shrink the window after a throttling response. """
+
+        now = time.monotonic()
+        if self.__last_decrease is not None and now - self.__last_decrease < self.THROTTLE_COOLDOWN:
+            return
+
+        self.__last_decrease = now
+        self.window = max(float(self.minimum), self.window * self.DECREASE_FACTOR)
+        logger.warning("GitHub is throttling requests, concurrency window reduced to %d", self.size)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.release()
@@ -0,0 +1,167 @@
+import bisect
+import collections
+import http
+import re
+import typing
+
+from librarian.github.ratelimit import RateLimit
+
+_NUMBER = re.compile(r"^\d+$")
+
+
+class EndpointStats:
+    """
+    Counters of the requests made to one endpoint template:
+
+    - `requests`, the number of HTTP requests (every retry is a separate one);
+    - `statuses`, the number of responses with every status code;
+    - `latency`, a histogram of response times (see `BUCKETS`), measured from the moment the request is sent
+      until its body is read, so that the time spent waiting for a permit or a concurrency slot isn't included;
+    - `bytes_received`, the total size of response bodies;
+    - `ratelimit_units`, how much of the rate limit the requests have consumed;
+    - `cache_hits`, responses served from the cache after a 304 Not Modified;
+    - `coalesced`, calls that have shared an identical in-flight request instead of making their own.
+    """
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)  # upper bounds, in seconds; the last bucket is unbounded
+
+    def __init__(self):
+        self.requests = 0
+        self.statuses: typing.Dict[int, int] = collections.Counter()
+        self.latency = [0] * (len(self.BUCKETS) + 1)
+        self.latency_total = 0.0
+        self.bytes_received = 0
+        self.ratelimit_units = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    def observe(self, status: int, latency: float, size: int, units: int) -> None:
+        self.requests += 1
+        self.statuses[status] += 1
+        self.latency[bisect.bisect_left(self.BUCKETS, latency)] += 1
+        self.latency_total += latency
+        self.bytes_received += size
+        self.ratelimit_units += units
+
+    def percentile(self, share: float) -> typing.Optional[float]:
+        """ Estimate a latency percentile as the upper bound of the bucket it falls into (`inf` for the last one). """
+
+        if not self.requests:
+            return None
+        rank = share * self.requests
+        seen = 0
+        for bound, count in zip(self.BUCKETS + (float("inf"),), self.latency):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> dict:
+        return dict(
+            requests=self.requests,
+            statuses={str(k): v for k, v in sorted(self.statuses.items())},
+            latency={
+                ("<={}".format(bound) if bound is not None else ">{}".format(self.BUCKETS[-1])): count
+                for bound, count in zip(self.BUCKETS + (None,), self.latency)
+            },
+            latency_mean=self.latency_total / self.requests if self.requests else None,
+            bytes_received=self.bytes_received,
+            ratelimit_units=self.ratelimit_units,
+            cache_hits=self.cache_hits,
+            coalesced=self.coalesced,
+        )
+
+    def __repr__(self):
+        return "{} req ({}), p50<={}s, p95<={}s, {} unit(s), {} KiB, {} cached, {} coalesced".format(
+            self.requests, " ".join("{}x{}".format(k, v) for k, v in sorted(self.statuses.items())),
+            self.percentile(0.5), self.percentile(0.95), self.ratelimit_units, self.bytes_received // 1024,
+            self.cache_hits, self.coalesced,
+        )
+
+
+class RequestMetrics:
+    """
+    Instrumentation of GitHub API calls, grouped by endpoint templates, where the repository and numbers
+    are replaced with placeholders (`repos/{repo}/pulls/{n}`), so that calls with different arguments add up:
+
+        metrics = RequestMetrics()
+        metrics.record("repos/ppy/osu-wiki/pulls/123", status=200, latency=0.2, size=4096, headers=response.headers)
+        metrics.snapshot()  # {"repos/{repo}/pulls/{n}": {"requests": 1, ...}}
+
+    Rate limit units are derived from the `X-Ratelimit-Remaining` header: a request costs as much as the limit
+    has decreased since the previous response for the same token and resource (which is how GraphQL queries
+    of different complexity are told apart). If the limit has been reset in between, or the previous response
+    is unknown, a request costs one unit, unless it's a 304 Not Modified, which GitHub doesn't count.
+    """
+
+    TOP_ENDPOINTS = 5
+
+    def __init__(self):
+        self.endpoints: typing.Dict[str, EndpointStats] = collections.defaultdict(EndpointStats)
+        self.__remaining: typing.Dict[tuple, typing.Tuple[typing.Optional[str], int]] = {}
+
+    @staticmethod
+    def template(path: str) -> str:
+        """ Make an endpoint template from a request path. """
+
+        parts = path.strip("/").split("?", 1)[0].split("/")
+        if len(parts) >= 3 and parts[0] == "repos":
+            parts[1:3] = ["{repo}"]
+        return "/".join("{n}" if _NUMBER.match(_) else _ for _ in parts)
+
+    def cost(self, status: int, headers: typing.Mapping, token: typing.Optional[str] = None) -> int:
+        """ Tell how many rate limit units a response has consumed (see the class' docstring). """
+
+        remaining = headers.get(RateLimit.HEADER_REMAINING)
+        if remaining is None:
+            return 0
+
+        remaining = int(remaining)
+        reset = headers.get(RateLimit.HEADER_RESET)
+        key = (token, headers.get(RateLimit.HEADER_RESOURCE))
+        previous = self.__remaining.get(key)
+        if previous is None or previous[0] != reset:
+            units = 0 if status == http.HTTPStatus.NOT_MODIFIED else 1
+        else:
+            units = max(0, previous[1] - remaining)  # responses to concurrent requests may come out of order
+
+        if previous is None or previous[0] != reset or remaining < previous[1]:
+            self.__remaining[key] = (reset, remaining)
+        return units
+
+    def record(
+        self, path: str, status: int, latency: float, size: int, headers: typing.Mapping,
+        token: typing.Optional[str] = None,
+    ) -> None:
+        """
+        Account for a completed HTTP request.
+
+        :param path: request path, relative to the API root
+        :param status: response status code
+        :param latency: time between sending the request and reading the response, in seconds
+        :param size: size of the response body, in bytes
+        :param headers: response headers
+        :param token: label of the token the request has been made with (rate limits are tracked per token)
+        """
+
+        self.endpoints[self.template(path)].observe(status, latency, size, self.cost(status, headers, token))
+
+    def cache_hit(self, path: str) -> None:
+        self.endpoints[self.template(path)].cache_hits += 1
+
+    def coalesced(self, path: str) -> None:
+        self.endpoints[self.template(path)].coalesced += 1
+
+    def snapshot(self) -> typing.Dict[str, dict]:
+        """ Return the counters of every endpoint template as plain data, the most requested ones first. """
+
+        return {
+            template: stats.as_dict()
+            for template, stats in sorted(self.endpoints.items(), key=lambda _: -_[1].requests)
+        }
+
+    def status(self, top: int = TOP_ENDPOINTS) -> typing.Dict[str, str]:
+        """ Describe the endpoints that have consumed the most of the rate limit. """
+
+        ranked = sorted(self.endpoints.items(), key=lambda _: (-_[1].ratelimit_units, -_[1].requests))
+        return {template: repr(stats) for template, stats in ranked[:top]}
@@ -0,0 +1,44 @@
+import re
+import typing
+import urllib.parse
+
+HEADER_LINK = "Link"
+
+_LINK_MASK = re.compile(r'<(?P<url>[^>]+)>\s*;\s*rel="(?P<rel>[^"]+)"')
+
+
+def parse_links(header: typing.Optional[str]) -> typing.Dict[str, str]:
+    """
+    Parse the `Link` header of a paginated response into a dictionary of URLs by their relation
+    (`next`, `prev`, `first`, `last`), as described in https://docs.github.com/en/rest/guides/traversing-with-pagination
+    """
+
+    if not header:
+        return {}
+    return {m.group("rel"): m.group("url") for m in _LINK_MASK.finditer(header)}
+
+
+def last_page(headers: typing.Mapping) -> typing.Optional[int]:
+    """ Return the number of the last page of a listing, or `None` if the response doesn't tell. """
+
+    url = parse_links(headers.get(HEADER_LINK)).get("last")
+    if url is None:
+        return None
+
+    page = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query).get("page")
+    try:
+        return int(page[0]) if page else None
+    except ValueError:
+        return None
+
+
+def has_next_page(headers: typing.Mapping, count: int, per_page: int) -> bool:
+    """
+    Tell whether a listing continues after a page with `count` items. If the response has no `Link` header,
+    only complete pages are considered to have a continuation.
+    """
+
+    links = parse_links(headers.get(HEADER_LINK))
+    if links:
+        return "next" in links
+    return count >= per_page
@@ -0,0 +1,174 @@
+import asyncio
+import collections
+import enum
+import logging
+import time
+import typing
+
+import arrow
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimit:
+    """
+    Rate limit storage for GitHub API
+
+    Extracts the values of X-Ratelimit-* headers from an HTTP response,
+    according to https://docs.github.com/en/rest/overview/resources-in-the-rest-api#rate-limiting.
+    Available values:
+
+    - `limit`, max. number of requests within time span;
+    - `left`, available requests;
+    - `reset`, when API usage limit is refreshed.
+    """
+
+    HEADER_RESOURCE = "X-Ratelimit-Resource"
+    HEADER_LIMIT = "X-Ratelimit-Limit"
+    HEADER_REMAINING = "X-Ratelimit-Remaining"
+    HEADER_RESET = "X-Ratelimit-Reset"
+
+    def __init__(self, headers: typing.Dict[str, str] = None):
+        self.limit: typing.Optional[int] = None
+        self.left: typing.Optional[int] = None
+        self.reset = arrow.Arrow.utcnow()
+        if headers is not None:
+            self.update(headers)
+
+    def update(self, headers: typing.Mapping) -> None:
+        """ Update current rate limits. Responses without rate limit headers are ignored. """
+
+        if headers.get(self.HEADER_REMAINING) is None:
+            return
+
+        self.left = int(headers[self.HEADER_REMAINING])
+        limit = headers.get(self.HEADER_LIMIT)
+        self.limit = int(limit) if limit is not None else None
+        timestamp = headers.get(self.HEADER_RESET)
+        self.reset = arrow.get(int(timestamp)) if timestamp is not None else None
+
+    def __repr__(self):
+        reset_ts = self.reset.format() if self.reset is not None else None
+        return "{}/{} until {}".format(self.left, self.limit, reset_ts)
+
+
+class Priority(enum.IntEnum):
+    """ Importance of a request, from the most urgent to the least. """
+
+    INTERACTIVE = 0  # replies to user commands
+    SYNC = 1  # regular synchronization of open pulls
+    BACKFILL = 2  # discovery of old pulls
+
+
+class RateLimitBudget:
+    """
+    Rate limit accounting for every GitHub API resource (`core`, `search`, `graphql`, ...),
+    which hands out request permits according to their priorities.
+
+    Every priority except for the interactive one has a reserve -- a share of the resource's limit
+    it's not allowed to touch. Once the requests left come within the reserve's size from it,
+    requests of that priority are spread evenly until the limit is reset;
+    once the reserve is reached, they wait for the reset.
+    This way, background backfills give way to regular synchronization, and neither starves user commands:
+
+        budget = RateLimitBudget()
+        await budget.acquire(budget.resource_for("repos/ppy/osu-wiki/pulls"), Priority.BACKFILL)
+        ...  # perform the request
+        budget.update(response.headers)
+    """
+
+    DEFAULT_RESOURCE = "core"
+    KNOWN_RESOURCES = ("core", "search", "graphql")
+    RESERVES = {
+        Priority.INTERACTIVE: 0.0,
+        Priority.SYNC: 0.05,
+        Priority.BACKFILL: 0.25,
+    }
+    MAX_WAIT = 60  # seconds to sleep before a permit is re-evaluated
+
+    def __init__(self, reserves: typing.Mapping[Priority, float] = None):
+        """
+        :param reserves: shares of every resource's limit (from 0 to 1) that lower priorities don't use
+        """
+
+        self.reserves = dict(self.RESERVES)
+        self.reserves.update(reserves or {})
+        self.buckets: typing.Dict[str, RateLimit] = {_: RateLimit() for _ in self.KNOWN_RESOURCES}
+        self.waiting: typing.Counter[Priority] = collections.Counter()
+        self.__next_permit: typing.DefaultDict[typing.Tuple[str, Priority], float] = collections.defaultdict(float)
+
+    @classmethod
+    def resource_for(cls, path: str) -> str:
+        """ Guess the rate limit resource an in-site path belongs to. """
+
+        root = path.strip("/").split("/", 1)[0]
+        if root in ("search", "graphql"):
+            return root
+        return cls.DEFAULT_RESOURCE
+
+    def update(self, headers: typing.Mapping) -> None:
+        """ Update the limits of a resource the response has been counted against. """
+
+        resource = headers.get(RateLimit.HEADER_RESOURCE, self.DEFAULT_RESOURCE)
+        if resource not in self.buckets:
+            self.buckets[resource] = RateLimit()
+        self.buckets[resource].update(headers)
+
+    def until_reset(self, resource: str) -> float:
+        """ Return how many seconds are left until the resource's limit is reset. """
+
+        bucket = self.buckets.get(resource)
+        if bucket is None or bucket.reset is None:
+            return 0.0
+        return max(0.0, (bucket.reset - arrow.utcnow()).total_seconds())
+
+    def pacing(self, resource: str, priority: Priority) -> typing.Optional[float]:
+        """
+        Return the min. interval between two requests of given priority to the resource, in seconds:
+        0 if such requests are not limited, or `None` if they have to wait until the limit is reset.
+        """
+
+        bucket = self.buckets.get(resource)
+        if priority == Priority.INTERACTIVE or bucket is None or bucket.left is None or not bucket.limit:
+            return 0.0
+
+        until_reset = self.until_reset(resource)
+        if until_reset <= 0:
+            return 0.0
+
+        reserve = self.reserves[priority] * bucket.limit
+        spare = bucket.left - reserve
+        if spare <= 0:
+            return None
+        if spare <= reserve:
+            return until_reset / spare
+        return 0.0
+
+    async def acquire(self, resource: str, priority: Priority) -> None:
+        """ Wait until a request of given priority is allowed to spend the resource's budget, and take one unit. """
+
+        self.waiting[priority] += 1
+        try:
+            interval = self.pacing(resource, priority)
+            while interval is None:
+                logger.debug("%s requests to %s are out of budget until the limit is reset", priority.name, resource)
+                await asyncio.sleep(min(self.until_reset(resource), self.MAX_WAIT))
+                interval = self.pacing(resource, priority)
+
+            if interval:
+                now = time.monotonic()
+                start = max(now, self.__next_permit[(resource, priority)])
+                self.__next_permit[(resource, priority)] = start + interval
+                await asyncio.sleep(start - now)
+        finally:
+            self.waiting[priority] -= 1
+
+        bucket = self.buckets.get(resource)
+        if bucket is not None and bucket.left:
+            bucket.left -= 1  # account for the request before its response arrives
+
+    def __repr__(self):
+        return ", ".join(
+            "{}={}/{}".format(resource, bucket.left, bucket.limit)
+            for resource, bucket in sorted(self.buckets.items())
+        )
@@ -0,0 +1,103 @@
+import random
+import typing
+
+import arrow
+
+from librarian.github.ratelimit import RateLimit
+
+
+class RetryPolicy:
+    """
+    Rules for repeating requests that failed for a transient reason: a network error, a 5xx response,
+    or throttling by GitHub (including secondary rate limits). Only idempotent requests are repeated,
+    after a delay that grows exponentially with every attempt and is randomized to not let failed requests
+    come back all at once ("full jitter"). The delay requested by GitHub takes precedence:
+
+    - the `Retry-After` header, in seconds;
+    - the rate limit reset time, if no requests are left;
+    - at least a minute for other throttled responses, as advised by GitHub.
+
+    If GitHub asks to wait longer than `max_delay`, the request is not repeated. Example:
+
+        policy = RetryPolicy(attempts=3)
+        delay = policy.backoff(attempt=0, headers=response.headers, throttled=False)
+        if delay is not None:
+            await asyncio.sleep(delay)  # and try again
+    """
+
+    ATTEMPTS = 3
+    BASE_DELAY = 1.0
+    MAX_DELAY = 60.0
+    THROTTLED_DELAY = 60.0
+    HEADER_RETRY_AFTER = "Retry-After"
+    IDEMPOTENT_METHODS = frozenset(("get", "head", "options", "put", "delete"))
+
+    def __init__(
+        self, attempts: int = ATTEMPTS, base_delay: float = BASE_DELAY, max_delay: float = MAX_DELAY,
+        methods: typing.Iterable[str] = IDEMPOTENT_METHODS,
+    ):
+        """
+        :param attempts: max. number of attempts for a single request, including the first one (1 disables retries)
+        :param base_delay: delay before the first retry, in seconds, which is doubled for every next one
+        :param max_delay: the longest delay before a retry, in seconds
+        :param methods: HTTP verbs (lowercase) that are safe to repeat
+        """
+
+        if attempts < 1:
+            raise ValueError("At least one attempt is required, got {}".format(attempts))
+
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.methods = frozenset(methods)
+        self.retries = 0
+
+    def allows(self, method: str, attempt: int, idempotent: bool = None) -> bool:
+        """
+        Tell whether a request may be repeated after its `attempt`-th failure (counting from 0).
+
+        :param method: HTTP verb
+        :param attempt: the number of the failed attempt
+        :param idempotent: overrides the guess made from the HTTP verb (for example, GraphQL queries are POST requests)
+        """
+
+        if idempotent is None:
+            idempotent = method.lower() in self.methods
+        return idempotent and attempt + 1 < self.attempts
+
+    def backoff(self, attempt: int, headers: typing.Mapping = None, throttled: bool = False) -> typing.Optional[float]:
+        """
+        Return how many seconds to wait before repeating a failed request, or `None` if it shouldn't be repeated.
+
+        :param attempt: the number of the failed attempt, counting from 0
+        :param headers: response headers, if any
+        :param throttled: whether GitHub has declined the request due to rate limits
+        """
+
+        headers = headers or {}
+        delay = self.__requested_delay(headers)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            if throttled:
+                delay = max(delay, self.THROTTLED_DELAY)
+
+        if delay > self.max_delay:
+            return None
+        return delay
+
+    def __requested_delay(self, headers: typing.Mapping) -> typing.Optional[float]:
+        retry_after = headers.get(self.HEADER_RETRY_AFTER)
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+
+        reset = headers.get(RateLimit.HEADER_RESET)
+        if headers.get(RateLimit.HEADER_REMAINING) == "0" and reset is not None:
+            try:
+                return max(0.0, (arrow.get(int(reset)) - arrow.utcnow()).total_seconds())
+            except ValueError:
+                pass
+
+        return None
@@ -0,0 +1,523 @@
+"""
+A stand-in for GitHub API, which serves synthetic repositories or replays recorded responses
+with configurable latency, failures and rate limits. It makes performance runs of the bot reproducible
+without spending the real rate limit. Run it as a module and point the bot to it (`github.base_url`):
+
+    python -m librarian.github.simulator --repo ppy/osu-wiki --pulls 5000 --latency 0.2 --error-rate 0.02
+    python -m librarian.github.simulator --record responses.jsonl --upstream https://api.github.com
+    python -m librarian.github.simulator --replay responses.jsonl --throttle-rate 0.01
+"""
+
+import argparse
+import asyncio
+import collections
+import hashlib
+import http
+import json
+import logging
+import random
+import re
+import sys
+import time
+import typing
+
+import aiohttp
+from aiohttp import web
+import arrow
+
+from librarian.github import decoding
+from librarian.github import ratelimit
+
+logger = logging.getLogger(__name__)
+
+LoggedRequest = collections.namedtuple("LoggedRequest", "method path status latency resource")
+
+
+class SyntheticRepository:
+    """
+    A generated repository with `size` numbers, some of which are issues instead of pulls (`issue_share`).
+    The same seed always produces the same repository. Example:
+
+        repo = SyntheticRepository("ppy/osu-wiki", size=5000, seed=1)
+        repo.pulls[1234]["title"]
+    """
+
+    AUTHORS = ("peppy", "Walavouchey", "TicClick", "Remyria", "cl8n")
+    TITLES = ("Update {}", "[RU] Translate {}", "[JA/KO] Update {}", "[EN] Fix typos in {}", "Add {} article")
+    ARTICLES = ("Ranking criteria", "osu! wiki", "Beatmap", "Skin", "Tournament", "Taiko", "Mania")
+    START = arrow.get(2018, 1, 1)
+
+    def __init__(self, name: str, size: int = 1000, issue_share: float = 0.1, open_share: float = 0.05, seed=None):
+        """
+        :param name: repository name in `owner-name/repo-name` format
+        :param size: the greatest pull or issue number
+        :param issue_share: probability of a number being an issue
+        :param open_share: probability of a pull being open
+        :param seed: seed for the random number generator
+        """
+
+        self.name = name
+        self.pulls: typing.Dict[int, dict] = {}
+        self.issues: typing.Dict[int, dict] = {}
+
+        rng = random.Random(seed)
+        for number in range(1, size + 1):
+            created_at = self.START.shift(hours=number)
+            author = rng.choice(self.AUTHORS)
+            if rng.random() < issue_share:
+                self.issues[number] = self.make_issue(number, author, created_at)
+            else:
+                self.pulls[number] = self.make_pull(number, author, created_at, rng, rng.random() < open_share)
+
+    @staticmethod
+    def user(login: str) -> dict:
+        return {"login": login, "id": int(hashlib.md5(login.encode()).hexdigest()[-8:], base=16)}
+
+    def make_issue(self, number: int, author: str, created_at: arrow.Arrow) -> dict:
+        return {
+            "id": number, "number": number, "state": "open", "title": "Issue #{}".format(number),
+            "user": self.user(author),
+            "created_at": self.format_date(created_at), "updated_at": self.format_date(created_at),
+        }
+
+    def make_pull(self, number: int, author: str, created_at: arrow.Arrow, rng: random.Random, is_open: bool) -> dict:
+        updated_at = created_at.shift(hours=rng.randint(1, 24 * 30))
+        merged = not is_open and rng.random() < 0.8
+        return {
+            "id": 10 ** 8 + number,
+            "number": number,
+            "state": "open" if is_open else "closed",
+            "locked": False,
+            "title": rng.choice(self.TITLES).format(rng.choice(self.ARTICLES)),
+            "user": self.user(author),
+            "assignees": [self.user(_) for _ in rng.sample(self.AUTHORS, rng.randint(0, 2))],
+            "created_at": self.format_date(created_at),
+            "updated_at": self.format_date(updated_at),
+            "closed_at": None if is_open else self.format_date(updated_at),
+            "merged_at": self.format_date(updated_at) if merged else None,
+            "merged": merged,
+            "draft": is_open and rng.random() < 0.2,
+            "commits": rng.randint(1, 50),
+            "review_comments": rng.randint(0, 40),
+            "changed_files": rng.randint(1, 20),
+        }
+
+    @staticmethod
+    def format_date(date: arrow.Arrow) -> str:
+        return date.format("YYYY-MM-DDTHH:mm:ss") + "Z"
+
+    def update(self, number: int) -> dict:
+        """ Touch a pull, as if it has received a new commit. """
+
+        pull = self.pulls[number]
+        pull["commits"] += 1
+        pull["updated_at"] = self.format_date(arrow.utcnow())
+        return pull
+
+
+class Recording:
+    """
+    Responses recorded from GitHub, one JSON object per line: `{"method", "path", "status", "headers", "body"}`,
+    where `path` includes the query string and `body` is decoded JSON. Replayed responses are looked up by
+    the method and the path; if a request was recorded several times, the responses are served in turns.
+    """
+
+    def __init__(self, entries: typing.Iterable[dict] = ()):
+        self.__entries: typing.Dict[typing.Tuple[str, str], typing.Deque[dict]] = collections.defaultdict(
+            collections.deque
+        )
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path) as fd:
+            return cls(json.loads(line) for line in fd if line.strip())
+
+    def add(self, entry: dict) -> None:
+        self.__entries[(entry["method"].upper(), entry["path"])].append(entry)
+
+    def __len__(self):
+        return sum(len(_) for _ in self.__entries.values())
+
+    def find(self, method: str, path: str) -> typing.Optional[dict]:
+        responses = self.__entries.get((method.upper(), path))
+        if not responses:
+            return None
+        responses.rotate(-1)
+        return responses[-1]
+
+
+class Simulator:
+    """
+    A web application that pretends to be GitHub API. Every request passes through the following stages:
+
+    1. Latency: the response is delayed by `latency` seconds on average (normally distributed with `jitter`).
+    2. Faults: `error_rate` of requests fail with 5xx, `throttle_rate` of them hit a secondary rate limit (403).
+    3. Rate limits: every response has `X-Ratelimit-*` headers; once `rate_limit` requests of a resource
+       have been made within `window` seconds, requests are rejected until the window ends. Like on GitHub,
+       a conditional request answered with 304 Not Modified doesn't count.
+    4. The response itself: a replayed one, if there is a recording, or one built from synthetic repositories.
+       With an `upstream`, unknown requests are proxied there and added to the recording.
+
+    Requests are logged to `requests` (and to `log`, if it's given, as JSON lines). Example:
+
+        simulator = Simulator([SyntheticRepository("ppy/osu-wiki", size=5000)], latency=0.1, error_rate=0.01)
+        await simulator.start(port=8765)  # GitHub(..., base_url="http://127.0.0.1:8765")
+        ...
+        await simulator.stop()
+    """
+
+    HOST = "127.0.0.1"
+    PORT = 8765
+    RATE_LIMIT = 5000
+    WINDOW = 3600
+    PER_PAGE = 30
+    MAX_PER_PAGE = 100
+    SEARCH_RESULTS_LIMIT = 1000
+    ERROR_STATUSES = (
+        http.HTTPStatus.INTERNAL_SERVER_ERROR, http.HTTPStatus.BAD_GATEWAY, http.HTTPStatus.SERVICE_UNAVAILABLE,
+    )
+    THROTTLE_MESSAGE = "You have exceeded a secondary rate limit. Please wait a few minutes before you try again."
+    THROTTLE_RETRY_AFTER = 1
+    RECORDED_HEADERS = ("etag", "link", "retry-after")
+
+    def __init__(
+        self, repositories: typing.Iterable[SyntheticRepository] = (), recording: Recording = None,
+        latency: float = 0, jitter: float = 0, error_rate: float = 0, throttle_rate: float = 0,
+        rate_limit: int = RATE_LIMIT, window: float = WINDOW, upstream: str = None, seed=None,
+        log: typing.TextIO = None, record: typing.TextIO = None,
+    ):
+        """
+        :param repositories: synthetic repositories to serve
+        :param recording: recorded responses, which take precedence over the synthetic ones
+        :param latency: mean delay of a response, in seconds
+        :param jitter: standard deviation of the delay, in seconds
+        :param error_rate: share of requests failing with 5xx
+        :param throttle_rate: share of requests failing with a secondary rate limit
+        :param rate_limit: requests allowed per resource within the window
+        :param window: rate limit window, in seconds
+        :param upstream: real API root to proxy and record requests the simulator can't answer
+        :param seed: seed for the random number generator
+        :param log: file to write requests to
+        :param record: file to append proxied responses to (in the format of `Recording`)
+        """
+
+        self.repositories = {_.name.lower(): _ for _ in repositories}
+        self.recording = recording if recording is not None else Recording()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.window = window
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.log = log
+        self.record = record
+        self.requests: typing.List[LoggedRequest] = []
+        self.used: typing.Dict[str, int] = collections.Counter()
+        self.__rng = random.Random(seed)
+        self.__window_start = time.time()
+        self.__runner: typing.Optional[web.AppRunner] = None
+        self.__upstream_session: typing.Optional[aiohttp.ClientSession] = None
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.simulate])
+        app.router.add_get("/repos/{owner}/{name}/pulls", self.list_pulls)
+        app.router.add_get("/repos/{owner}/{name}/pulls/{number:\\d+}", self.get_pull)
+        app.router.add_get("/repos/{owner}/{name}/issues/{number:\\d+}", self.get_issue)
+        app.router.add_get("/search/issues", self.search_issues)
+        app.router.add_post("/graphql", self.query_pulls)
+        app.router.add_route("*", "/{tail:.*}", self.fallback)
+        return app
+
+    async def start(self, host: str = HOST, port: int = PORT) -> None:
+        self.__runner = web.AppRunner(self.make_app())
+        await self.__runner.setup()
+        await web.TCPSite(self.__runner, host, port).start()
+        logger.info("Simulating GitHub API at http://%s:%s", host, port)
+
+    async def stop(self) -> None:
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+        if self.__upstream_session is not None:
+            await self.__upstream_session.close()
+            self.__upstream_session = None
+
+    def ratelimit_headers(self, resource: str) -> typing.Dict[str, str]:
+        now = time.time()
+        if now - self.__window_start >= self.window:
+            self.__window_start = now
+            self.used.clear()
+
+        return {
+            ratelimit.RateLimit.HEADER_RESOURCE: resource,
+            ratelimit.RateLimit.HEADER_LIMIT: str(self.rate_limit),
+            ratelimit.RateLimit.HEADER_REMAINING: str(max(0, self.rate_limit - self.used[resource])),
+            ratelimit.RateLimit.HEADER_RESET: str(int(self.__window_start + self.window)),
+        }
+
+    def fault(self, resource: str) -> typing.Optional[web.Response]:
+        """ Pick a failure for a request, if it's unlucky. """
+
+        roll = self.__rng.random()
+        if roll < self.error_rate:
+            return self.json_response({"message": "Server Error"}, status=self.__rng.choice(self.ERROR_STATUSES))
+        if roll < self.error_rate + self.throttle_rate:
+            return self.json_response(
+                {"message": self.THROTTLE_MESSAGE}, status=http.HTTPStatus.FORBIDDEN,
+                headers={"Retry-After": str(self.THROTTLE_RETRY_AFTER)},
+            )
+        if self.used[resource] >= self.rate_limit:
+            return self.json_response(
+                {"message": "API rate limit exceeded"}, status=http.HTTPStatus.FORBIDDEN,
+            )
+        return None
+
+    @web.middleware
+    async def simulate(self, request: web.Request, handler) -> web.StreamResponse:
+        started = time.monotonic()
+        resource = ratelimit.RateLimitBudget.resource_for(request.path.lstrip("/"))
+        delay = self.__rng.gauss(self.latency, self.jitter) if self.jitter else self.latency
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        response = self.fault(resource)
+        if response is None:
+            replayed = self.recording.find(request.method, request.path_qs)
+            try:
+                response = self.replay(replayed) if replayed is not None else await handler(request)
+            except web.HTTPException as exc:
+                response = exc
+            response = self.make_conditional(request, response)
+
+        if response.status != http.HTTPStatus.NOT_MODIFIED:
+            self.used[resource] += 1
+        response.headers.update(self.ratelimit_headers(resource))
+        self.remember(request, response, time.monotonic() - started, resource)
+        return response
+
+    def remember(self, request: web.Request, response: web.StreamResponse, latency: float, resource: str) -> None:
+        entry = LoggedRequest(request.method, request.path_qs, response.status, round(latency, 4), resource)
+        self.requests.append(entry)
+        if self.log is not None:
+            self.log.write(json.dumps(entry._asdict()) + "\n")
+            self.log.flush()
+
+    @staticmethod
+    def make_conditional(request: web.Request, response: web.StreamResponse) -> web.StreamResponse:
+        """ Tag a successful GET response with an ETag, and replace it with 304 if the client has the same one. """
+
+        if request.method != "GET" or response.status != http.HTTPStatus.OK or not isinstance(response, web.Response):
+            return response
+
+        etag = response.headers.get("ETag") or '"{}"'.format(hashlib.sha1(response.body).hexdigest())
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=http.HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return response
+
+    @staticmethod
+    def json_response(data, status: int = http.HTTPStatus.OK, headers: dict = None) -> web.Response:
+        return web.Response(status=status, text=json.dumps(data), content_type="application/json", headers=headers)
+
+    def replay(self, entry: dict) -> web.Response:
+        headers = {k: v for k, v in (entry.get("headers") or {}).items() if k.lower() in self.RECORDED_HEADERS}
+        return self.json_response(entry.get("body"), status=entry["status"], headers=headers)
+
+    def repository(self, request: web.Request) -> SyntheticRepository:
+        name = "{}/{}".format(request.match_info["owner"], request.match_info["name"]).lower()
+        if name not in self.repositories:
+            raise web.HTTPNotFound(text=json.dumps({"message": "Not Found"}), content_type="application/json")
+        return self.repositories[name]
+
+    async def list_pulls(self, request: web.Request) -> web.Response:
+        repo = self.repository(request)
+        query = request.url.query
+        state = query.get("state", "open")
+        key = "updated_at" if query.get("sort") == "updated" else "created_at"
+        pulls = sorted(
+            (_ for _ in repo.pulls.values() if state == "all" or _["state"] == state),
+            key=lambda _: (_[key], _["number"]), reverse=query.get("direction", "desc") == "desc",
+        )
+
+        per_page = min(int(query.get("per_page", self.PER_PAGE)), self.MAX_PER_PAGE)
+        page = int(query.get("page", 1))
+        last_page = max(1, -(-len(pulls) // per_page))
+        return self.json_response(
+            pulls[(page - 1) * per_page: page * per_page], headers=self.link_header(request.url, page, last_page),
+        )
+
+    @staticmethod
+    def link_header(url, page: int, last_page: int) -> typing.Dict[str, str]:
+        if last_page <= 1:
+            return {}
+
+        links = {"first": 1, "last": last_page}
+        if page > 1:
+            links["prev"] = page - 1
+        if page < last_page:
+            links["next"] = page + 1
+        return {"Link": ", ".join(
+            '<{}>; rel="{}"'.format(url.update_query(page=number), rel) for rel, number in links.items()
+        )}
+
+    async def get_pull(self, request: web.Request) -> web.Response:
+        pull = self.repository(request).pulls.get(int(request.match_info["number"]))
+        if pull is None:
+            return self.json_response({"message": "Not Found"}, status=http.HTTPStatus.NOT_FOUND)
+        return self.json_response(pull)
+
+    async def get_issue(self, request: web.Request) -> web.Response:
+        repo = self.repository(request)
+        number = int(request.match_info["number"])
+        if number in repo.issues:
+            return self.json_response(repo.issues[number])
+        if number in repo.pulls:
+            issue = {k: v for k, v in repo.pulls[number].items() if k not in ("merged", "merged_at", "draft")}
+            return self.json_response(dict(issue, pull_request={}))
+        return self.json_response({"message": "Not Found"}, status=http.HTTPStatus.NOT_FOUND)
+
+    async def search_issues(self, request: web.Request) -> web.Response:
+        """ Search for merged pulls with the `repo:owner/name is:pr is:merged merged:FROM..TO` query. """
+
+        query = request.url.query
+        repo = re.search(r"repo:(\S+)", query.get("q", ""))
+        window = re.search(r"merged:(\S+)\.\.(\S+)", query.get("q", ""))
+        if repo is None or window is None or repo.group(1).lower() not in self.repositories:
+            return self.json_response({"total_count": 0, "incomplete_results": False, "items": []})
+
+        since, until = window.groups()
+        found = [
+            _ for _ in self.repositories[repo.group(1).lower()].pulls.values()
+            if _["merged_at"] is not None and since <= _["merged_at"][:10] <= until
+        ]
+        total, found = len(found), found[:self.SEARCH_RESULTS_LIMIT]
+        per_page = min(int(query.get("per_page", self.PER_PAGE)), self.MAX_PER_PAGE)
+        page = int(query.get("page", 1))
+        return self.json_response({
+            "total_count": total, "incomplete_results": False,
+            "items": found[(page - 1) * per_page: page * per_page],
+        })
+
+    async def query_pulls(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        variables = body.get("variables") or {}
+        repo = self.repositories.get("{}/{}".format(variables.get("owner"), variables.get("name")).lower())
+        if repo is None:
+            return await self.fallback(request)
+
+        aliases = re.finditer(r"(?P<alias>\w+): pullRequest\(number: (?P<number>\d+)\)", body["query"])
+        data = {
+            m.group("alias"): self.as_graphql_node(repo.pulls.get(int(m.group("number"))))
+            for m in aliases
+        }
+        return self.json_response({"data": {"repository": data}})
+
+    @staticmethod
+    def as_graphql_node(pull: typing.Optional[dict]) -> typing.Optional[dict]:
+        if pull is None:
+            return None
+        return {
+            "databaseId": pull["id"],
+            "number": pull["number"],
+            "state": "MERGED" if pull["merged"] else pull["state"].upper(),
+            "locked": pull["locked"],
+            "title": pull["title"],
+            "createdAt": pull["created_at"],
+            "updatedAt": pull["updated_at"],
+            "mergedAt": pull["merged_at"],
+            "merged": pull["merged"],
+            "isDraft": pull["draft"],
+            "changedFiles": pull["changed_files"],
+            "commits": {"totalCount": pull["commits"]},
+            "reviews": {"nodes": [{"comments": {"totalCount": pull["review_comments"]}}]},
+            "author": {"login": pull["user"]["login"], "databaseId": pull["user"]["id"]},
+            "assignees": {"nodes": [{"login": _["login"], "databaseId": _["id"]} for _ in pull["assignees"]]},
+        }
+
+    async def fallback(self, request: web.Request) -> web.Response:
+        """ Proxy a request the simulator can't answer to the upstream API, if there is one, and record it. """
+
+        if self.upstream is None:
+            return self.json_response({"message": "Not Found"}, status=http.HTTPStatus.NOT_FOUND)
+
+        if self.__upstream_session is None:
+            self.__upstream_session = aiohttp.ClientSession()
+        headers = {k: v for k, v in request.headers.items() if k.lower() in ("authorization", "accept")}
+        async with self.__upstream_session.request(
+            request.method, self.upstream + request.path_qs, headers=headers, data=await request.read(),
+        ) as response:
+            raw = await response.read()
+            entry = dict(
+                method=request.method, path=request.path_qs, status=response.status,
+                headers={k: v for k, v in response.headers.items() if k.lower() in self.RECORDED_HEADERS},
+                body=decoding.loads(raw) if raw else None,
+            )
+
+        self.recording.add(entry)
+        if self.record is not None:
+            self.record.write(json.dumps(entry) + "\n")
+            self.record.flush()
+        return self.replay(entry)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Simulate GitHub API for reproducible performance runs")
+    parser.add_argument("--host", default=Simulator.HOST)
+    parser.add_argument("--port", type=int, default=Simulator.PORT)
+    parser.add_argument("--repo", action="append", default=[], help="synthetic repository (may be repeated)")
+    parser.add_argument("--pulls", type=int, default=1000, help="size of every synthetic repository")
+    parser.add_argument("--issue-share", type=float, default=0.1)
+    parser.add_argument("--open-share", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=0, help="mean response delay, in seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="standard deviation of the delay, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of 5xx responses")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="share of secondary rate limit responses")
+    parser.add_argument("--rate-limit", type=int, default=Simulator.RATE_LIMIT, help="requests per resource")
+    parser.add_argument("--window", type=float, default=Simulator.WINDOW, help="rate limit window, in seconds")
+    parser.add_argument("--replay", help="recorded responses to serve (JSON lines)")
+    parser.add_argument("--record", help="file to append proxied responses to (requires --upstream)")
+    parser.add_argument("--upstream", help="real API root to proxy unknown requests to, such as https://api.github.com")
+    parser.add_argument("--log", help="file to write the request log to (JSON lines, - for stdout)")
+    return parser.parse_args(args)
+
+
+async def serve(args) -> None:
+    repositories = [
+        SyntheticRepository(
+            name, size=args.pulls, issue_share=args.issue_share, open_share=args.open_share, seed=args.seed,
+        )
+        for name in args.repo
+    ]
+    log = sys.stdout if args.log == "-" else (open(args.log, "a") if args.log else None)
+    simulator = Simulator(
+        repositories, recording=Recording.load(args.replay) if args.replay else None,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit, window=args.window, upstream=args.upstream, seed=args.seed, log=log,
+        record=open(args.record, "a") if args.record else None,
+    )
+
+    await simulator.start(args.host, args.port)
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await simulator.stop()
+        for fd in (simulator.record, log):
+            if fd not in (None, sys.stdout):
+                fd.close()
+
+
+def main(args=None):
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(parse_args(args)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
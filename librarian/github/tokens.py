@@ -0,0 +1,100 @@
+import math
+import typing
+
+import aiohttp
+
+from librarian.github.app import GitHubApp
+from librarian.github.ratelimit import RateLimitBudget
+
+Credentials = typing.Union[str, GitHubApp]
+
+
+class PooledToken:
+    """ A GitHub API token (or a GitHub App installation) with its own rate limits and usage statistics. """
+
+    def __init__(self, token: Credentials, budget: RateLimitBudget):
+        self.token = token
+        self.budget = budget
+        self.requests = 0
+
+    @property
+    def label(self) -> str:
+        """ A short name of the token, which is safe to show. """
+
+        if isinstance(self.token, GitHubApp):
+            return self.token.label
+        return "...{}".format(self.token[-4:])
+
+    async def credentials(self, session: aiohttp.ClientSession, base_url: str) -> str:
+        """ Return the token to send with a request (for an app, it's the current installation token). """
+
+        if isinstance(self.token, GitHubApp):
+            return await self.token.token(session, base_url)
+        return self.token
+
+    def requests_left(self, resource: str) -> float:
+        """ Return the number of requests left for a resource, or infinity if it's unknown or has been reset. """
+
+        bucket = self.budget.buckets.get(resource)
+        if bucket is None or bucket.left is None or self.budget.until_reset(resource) <= 0:
+            return math.inf
+        return bucket.left
+
+
+class TokenPool:
+    """
+    Several GitHub API tokens that share the load, each one with its own rate limits (see `RateLimitBudget`).
+
+    Every request is made with the token that has the most requests left for the resource
+    (or has made the fewest requests, if it's a tie), so that the load is spread evenly.
+    A token with less than `min_left` requests left is skipped until its limit is reset;
+    if all tokens are exhausted, the one that is reset first is used, and its budget holds the request back. Example:
+
+        pool = TokenPool(["token-1", "token-2"])
+        token = pool.pick("core")
+        await token.budget.acquire("core", Priority.SYNC)
+        ...  # perform the request with token.token
+        token.budget.update(response.headers)
+    """
+
+    MIN_LEFT = 10
+
+    def __init__(self, tokens: typing.Sequence[Credentials], budget: RateLimitBudget = None, min_left: int = MIN_LEFT):
+        """
+        :param tokens: GitHub API tokens or GitHub App installations (duplicates are ignored)
+        :param budget: rate limit accounting of the first token, whose reserves are given to the rest (optional)
+        :param min_left: the number of requests left at which a token is considered exhausted
+        """
+
+        tokens = list(dict.fromkeys(tokens))
+        if not tokens:
+            raise ValueError("At least one GitHub API token is required")
+
+        budget = budget if budget is not None else RateLimitBudget()
+        self.min_left = min_left
+        self.tokens = [PooledToken(tokens[0], budget)] + [
+            PooledToken(token, RateLimitBudget(reserves=budget.reserves)) for token in tokens[1:]
+        ]
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __iter__(self) -> typing.Iterator[PooledToken]:
+        return iter(self.tokens)
+
+    def pick(self, resource: str) -> PooledToken:
+        """ Choose the token for the next request to a resource. """
+
+        usable = [_ for _ in self.tokens if _.requests_left(resource) >= self.min_left]
+        if usable:
+            return max(usable, key=lambda t: (t.requests_left(resource), -t.requests))
+        return min(self.tokens, key=lambda t: t.budget.until_reset(resource))
+
+    @property
+    def waiting(self) -> int:
+        """ The number of requests held back by the budgets of all tokens. """
+        return sum(sum(_.budget.waiting.values()) for _ in self.tokens)
+
+    def status(self) -> typing.Dict[str, str]:
+        """ Describe the consumption and the rate limits of every token. """
+        return {_.label: "{} request(s), {}".format(_.requests, _.budget) for _ in self.tokens}
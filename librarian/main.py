@@ -9,6 +9,7 @@ from librarian import (
     logging as logging_utils,
     github,
     storage,
+    webhooks,
 )
 
 logger = logging.getLogger(__name__)
@@ -17,24 +18,88 @@ PADDING = 40
 PADDING_CHAR = "-"
 
 
+def load_credentials(github_config, runtime_dir):
+    tokens = github_config.get("token") or []
+    credentials = [tokens] if isinstance(tokens, str) else list(tokens)
+
+    app_config = github_config.get("app", {})
+    if app_config.get("enabled", False):
+        with open(os.path.join(runtime_dir, app_config["private_key"])) as key_file:
+            credentials.append(github.GitHubApp(
+                app_id=app_config["id"],
+                installation_id=app_config["installation_id"],
+                private_key=key_file.read(),
+                refresh_ahead=app_config.get("refresh_ahead", github.GitHubApp.REFRESH_AHEAD),
+            ))
+    return credentials
+
+
 def configure_client(config):
     loggers = logging_utils.all_loggers()
     loggers["librarian.main"] = logger  # otherwise an old copy with default settings is kept
     logging_utils.setup_logging(config["runtime"]["dir"], config["logging"], loggers.values())
     logger.info(" Starting up ".center(PADDING, PADDING_CHAR))
 
+    storage_path = os.path.join(config["runtime"]["dir"], config["storage"]["path"])
+    db = storage.Storage(storage_path)
+
+    cache_config = config["github"].get("cache", {})
+    cache = github.ResponseCache(
+        size=cache_config.get("size", github.ResponseCache.DEFAULT_SIZE),
+        backend=db.http_cache if cache_config.get("persistent", True) else None,
+    )
+
+    reserves_config = config["github"].get("reserves", {})
+    budget = github.RateLimitBudget(reserves={
+        github.Priority[name.upper()]: share
+        for name, share in reserves_config.items()
+    })
+
+    connection_config = config["github"].get("connection", {})
+    concurrency_config = config["github"].get("concurrency", {})
+    limiter = github.AdaptiveLimiter(
+        initial=concurrency_config.get("initial", github.AdaptiveLimiter.INITIAL),
+        minimum=concurrency_config.get("minimum", github.AdaptiveLimiter.MINIMUM),
+        maximum=concurrency_config.get("maximum", github.AdaptiveLimiter.MAXIMUM),
+        spacing=concurrency_config.get("spacing", github.AdaptiveLimiter.SPACING),
+    )
+    retry_config = config["github"].get("retry", {})
+    retry = github.RetryPolicy(
+        attempts=retry_config.get("attempts", github.RetryPolicy.ATTEMPTS),
+        base_delay=retry_config.get("base_delay", github.RetryPolicy.BASE_DELAY),
+        max_delay=retry_config.get("max_delay", github.RetryPolicy.MAX_DELAY),
+    )
     github_api = github.GitHub(
-        token=config["github"]["token"],
+        token=load_credentials(config["github"], config["runtime"]["dir"]),
         repo=config["github"]["repo"],
+        cache=cache,
+        connections_per_host=connection_config.get("per_host", github.GitHub.CONNECTIONS_PER_HOST),
+        dns_cache_ttl=connection_config.get("dns_cache_ttl", github.GitHub.DNS_CACHE_TTL),
+        keepalive_timeout=connection_config.get("keepalive_timeout", github.GitHub.KEEPALIVE_TIMEOUT),
+        use_graphql=config["github"].get("graphql", True),
+        base_url=config["github"].get("base_url"),
+        limiter=limiter,
+        budget=budget,
+        retry=retry,
     )
 
-    storage_path = os.path.join(config["runtime"]["dir"], config["storage"]["path"])
-    db = storage.Storage(storage_path)
+    webhook_server = None
+    webhook_config = config["github"].get("webhooks", {})
+    if webhook_config.get("enabled", False):
+        webhook_server = webhooks.WebhookServer(
+            secret=webhook_config["secret"],
+            host=webhook_config.get("host", webhooks.WebhookServer.HOST),
+            port=webhook_config.get("port", webhooks.WebhookServer.PORT),
+            path=webhook_config.get("path", webhooks.WebhookServer.PATH),
+            repo=config["github"]["repo"],
+        )
 
     client = discord.Client(
         github=github_api,
         storage=db,
         assignee_login=config["github"]["assignee_login"],
+        full_sync_interval=config["github"].get("sync", {}).get("full_interval"),
+        webhooks=webhook_server,
     )
 
     client.setup()
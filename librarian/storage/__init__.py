@@ -1,4 +1,5 @@
 from .storage import Storage  # noqa
 from .models.discord import DiscordMessage  # noqa
+from .models.http_cache import CachedResponse  # noqa
 from .models.metadata import Metadata  # noqa
 from .models.pull import Pull  # noqa
@@ -7,6 +7,7 @@ from librarian.storage import (
     base,
     utils,
 )
+from librarian.storage.models.pull import MESSAGES_JOIN, REPO_NAME_LEN
 
 
 class DiscordMessage(base.Base):
@@ -21,8 +22,9 @@ class DiscordMessage(base.Base):
     id = sql.Column(sql.BigInteger, primary_key=True)
     channel_id = sql.Column(sql.BigInteger)
     pull_number = sql.Column(sql.Integer, sql.ForeignKey("pulls.number"))
+    pull_repo = sql.Column(sql.String(REPO_NAME_LEN), nullable=False, default="", server_default="")
 
-    pull = orm.relationship("Pull", back_populates="discord_messages")
+    pull = orm.relationship("Pull", back_populates="discord_messages", primaryjoin=MESSAGES_JOIN)
 
 
 class DiscordPromotedRelation(base.Base):
@@ -97,9 +99,17 @@ class DiscordHelper(base.Helper):
         ).delete()
 
     @utils.optional_session
-    def messages_by_pull_numbers(self, *pull_numbers: typing.List[int], s: orm.Session = None):
-        """ Return all known messages that are tied to the specified pulls. """
-        return s.query(DiscordMessage).filter(DiscordMessage.pull_number.in_(pull_numbers)).all()
+    def messages_by_pull_numbers(self, *pull_numbers: typing.List[int], s: orm.Session = None, repo: str = None):
+        """ Return all known messages that are tied to the specified pulls (of a repository, if it's given). """
+        query = s.query(DiscordMessage).filter(DiscordMessage.pull_number.in_(pull_numbers))
+        if repo is not None:
+            query = query.filter(DiscordMessage.pull_repo == repo)
+        return query.all()
+
+    @utils.optional_session
+    def adopt_messages(self, repo: str, s: orm.Session) -> int:
+        """ Tie the messages about pulls without a repository to a repository (see `PullHelper.adopt`). """
+        return s.query(DiscordMessage).filter(DiscordMessage.pull_repo == "").update({"pull_repo": repo})
 
     @utils.optional_session
     def all_channels_settings(self, s):
@@ -0,0 +1,64 @@
+import typing
+
+import arrow
+import sqlalchemy as sql
+from sqlalchemy import orm
+
+from librarian.storage import (
+    base,
+    utils,
+)
+
+CACHE_KEY_LEN = 512
+HEADER_LEN = 128
+
+
+class CachedResponse(base.Base):
+    """
+    A GitHub API response that may be validated with a conditional request (see `librarian.github.ResponseCache`).
+    The rows are only accessed via `HttpCacheHelper`.
+    """
+
+    __tablename__ = "http_cache"
+
+    key = sql.Column(sql.String(CACHE_KEY_LEN), primary_key=True)
+    etag = sql.Column(sql.String(HEADER_LEN))
+    last_modified = sql.Column(sql.String(HEADER_LEN))
+    body = sql.Column(sql.JSON)
+    stored_at = sql.Column(sql.DateTime, nullable=False)
+
+
+class HttpCacheHelper(base.Helper):
+    """
+    A class that persists the GitHub response cache between restarts. Example:
+
+        storage = Storage("/tmp/discord.db")
+        cache = librarian.github.ResponseCache(size=100, backend=storage.http_cache)
+    """
+
+    @utils.optional_session
+    def load_entries(self, limit: int, s: orm.Session = None) -> typing.List[tuple]:
+        """
+        Return up to `limit` most recently stored responses, oldest first,
+        as a list of `(key, etag, last_modified, body)` tuples.
+        """
+
+        rows = s.query(CachedResponse).order_by(CachedResponse.stored_at.desc()).limit(limit).all()
+        return [
+            (row.key, row.etag, row.last_modified, row.body)
+            for row in reversed(rows)
+        ]
+
+    @utils.optional_session
+    def save_entry(self, key: str, entry: tuple, s: orm.Session = None):
+        """ Create or replace a stored response (`entry` is expected to have `etag`, `last_modified` and `body`). """
+
+        s.merge(CachedResponse(
+            key=key, etag=entry.etag, last_modified=entry.last_modified, body=entry.body,
+            stored_at=arrow.utcnow().datetime,
+        ))
+
+    @utils.optional_session
+    def delete_entries(self, *keys: str, s: orm.Session = None):
+        """ Delete stored responses by their keys. """
+        s.query(CachedResponse).filter(CachedResponse.key.in_(keys)).delete(synchronize_session=False)
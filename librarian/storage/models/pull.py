@@ -14,6 +14,11 @@ from librarian.storage import (
 PR_STATE_LEN = 32
 PR_TITLE_LEN = 512
 USER_LOGIN_LEN = 64
+REPO_NAME_LEN = 128
+# messages are tied to pulls by both the number and the repository (see `DiscordMessage`)
+MESSAGES_JOIN = (
+    "and_(Pull.number == foreign(DiscordMessage.pull_number), Pull.repo == foreign(DiscordMessage.pull_repo))"
+)
 
 
 class Pull(base.Base):
@@ -23,11 +28,16 @@ class Pull(base.Base):
 
     Some pulls may have notifications sent out for them via Discord,
     which are recorded in a separate table (see `DiscordMessage`).
+
+    Pull numbers are only unique within a repository (`owner-name/repo-name`). Pulls saved before
+    several repositories could be monitored have an empty repository name until they're adopted (see `adopt`).
     """
 
     __tablename__ = "pulls"
+    __table_args__ = (sql.Index("ix_pulls_repo_number", "repo", "number"),)
 
     id = sql.Column(sql.Integer, primary_key=True)
+    repo = sql.Column(sql.String(REPO_NAME_LEN), nullable=False, default="", server_default="")
     number = sql.Column(sql.Integer, nullable=False)
     state = sql.Column(sql.String(PR_STATE_LEN), nullable=False)
     locked = sql.Column(sql.Integer, nullable=False)
@@ -46,7 +56,8 @@ class Pull(base.Base):
     assignees_logins = sql.Column(sql.JSON, default=[])
 
     discord_messages = orm.relationship(
-        "DiscordMessage", order_by="DiscordMessage.id", back_populates="pull", lazy="joined"
+        "DiscordMessage", order_by="DiscordMessage.id", back_populates="pull", lazy="joined",
+        primaryjoin=MESSAGES_JOIN,
     )
 
     ID_KEY = "id"
@@ -60,6 +71,31 @@ class Pull(base.Base):
     NESTED_KEYS = (
         "user_login", "user_id"
     )
+    # pulls listings don't include these keys, so a new pull gets them derived from the rest of the payload
+    # (the counters are placeholders until a full payload arrives)
+    LISTING_DEFAULTS = {
+        "merged": lambda payload: int(payload.get("merged_at") is not None),
+        "review_comments": lambda payload: 0,
+        "commits": lambda payload: 0,
+        "changed_files": lambda payload: 0,
+    }
+
+    @classmethod
+    def payload_projection(cls) -> dict:
+        """
+        Describe the part of a GitHub pull payload the model is made of, so that the rest can be dropped
+        right after it's decoded (see `GitHub.request`).
+        """
+
+        projection = {k: None for k in cls.DIRECT_KEYS}
+        for key in cls.NESTED_KEYS:
+            *parents, leaf = key.split("_")
+            root = projection
+            for part in parents:
+                root = root.setdefault(part, {})
+            root[leaf] = None
+        projection["assignees"] = {"login": None}
+        return projection
 
     def read_nested(self, payload: dict, key: str) -> typing.Any:
         """
@@ -73,12 +109,19 @@ class Pull(base.Base):
         return result
 
     def update(self, payload: dict):
-        """ Override existing field values by these from the payload. """
+        """
+        Override existing field values by these from the payload. Payloads from pulls listings are also accepted:
+        the fields they lack are kept as they are (see `LISTING_DEFAULTS` for new pulls).
+        """
 
         extracted = {}
         for key in self.DIRECT_KEYS:
             if self.id is not None and key == self.ID_KEY:
                 continue
+            if key not in payload and key in self.LISTING_DEFAULTS:
+                if getattr(self, key) is None:
+                    extracted[key] = self.LISTING_DEFAULTS[key](payload)
+                continue
 
             val = payload.get(key)
             if val is not None and key in self.DATETIME_KEYS:
@@ -91,8 +134,9 @@ class Pull(base.Base):
         extracted["assignees_logins"] = [_["login"] for _ in payload["assignees"]]
         super().__init__(**extracted)
 
-    def __init__(self, payload: dict):
+    def __init__(self, payload: dict, repo: str = None):
         self.update(dict(payload))
+        self.repo = repo or ""
 
     def as_dict(self, nested: bool = False, internal: bool = False) -> dict:
         """
@@ -128,19 +172,27 @@ class Pull(base.Base):
 class PullHelper(base.Helper):
     """
     A class that interfaces the table with GitHub pulls. See individual methods for usage details.
+    Most methods accept a repository name to work with. Without it, lookups consider pulls of all repositories,
+    and saved pulls are left unassigned.
     """
 
+    @staticmethod
+    def in_repo(query: orm.Query, repo: typing.Optional[str]) -> orm.Query:
+        """ Narrow a query down to the pulls of a repository, if it's given. """
+        return query if repo is None else query.filter(Pull.repo == repo)
+
     @utils.optional_session
-    def save_from_payload(self, payload: dict, s: orm.Session, insert: bool = True):
+    def save_from_payload(self, payload: dict, s: orm.Session, insert: bool = True, repo: str = None):
         """
         Save a pull from JSON payload, possibly updating it on existence.
 
         :param payload: JSON data
         :param s: database session (may be omitted for one-off calls)
         :param insert: don't do anything if the pull already exists
+        :param repo: the repository of the pull
         """
 
-        self.save(Pull(payload), s=s, insert=insert)
+        self.save(Pull(payload, repo=repo), s=s, insert=insert)
 
     @utils.optional_session
     def save(self, pull: Pull, s: orm.Session, insert: bool = True):
@@ -152,31 +204,35 @@ class PullHelper(base.Helper):
         :param insert: don't do anything if the pull already exists
         """
 
-        if s.query(Pull).filter(Pull.number == pull.number).count():
+        query = s.query(Pull).filter(Pull.number == pull.number, Pull.repo == pull.repo)
+        if query.count():
             if insert:
                 return
-            s.query(Pull).filter(Pull.number == pull.number).update(pull.as_dict(internal=True))
+            query.update(pull.as_dict(internal=True))
         else:
             s.add(pull)
 
     @utils.optional_session
-    def save_many_from_payload(self, pulls_list: typing.List[dict], s: orm.Session) -> typing.List[Pull]:
+    def save_many_from_payload(
+        self, pulls_list: typing.List[dict], s: orm.Session, repo: str = None
+    ) -> typing.List[Pull]:
         """
         Save and update multiple pulls from a list of JSON payloads
         and return ORM objects.
 
         :param pulls: a list of pulls in form of JSON data.
         :param s: database session (may be omitted for one-off calls)
+        :param repo: the repository of the pulls
         """
 
         pulls = {_["number"]: _ for _ in pulls_list}
 
-        existing = s.query(Pull).filter(Pull.number.in_(pulls)).all()
+        existing = s.query(Pull).filter(Pull.number.in_(pulls), Pull.repo == (repo or "")).all()
         for pull in existing:
             pull.update(pulls[pull.number])
 
         new = [
-            Pull(p)
+            Pull(p, repo=repo)
             for num, p in pulls.items() if
             num not in set(_.number for _ in existing)
         ]
@@ -186,18 +242,54 @@ class PullHelper(base.Helper):
         return sorted(existing + new, key=lambda p: p.number)
 
     @utils.optional_session
-    def by_number(self, pull_number: int, s: orm.Session) -> typing.Optional[Pull]:
+    def insert_many_from_payload(self, pulls_list: typing.List[dict], s: orm.Session, repo: str = None) -> int:
+        """
+        Save multiple pulls from a list of JSON payloads, skipping the ones that already exist,
+        and return the number of inserted pulls.
+
+        :param pulls_list: a list of pulls in form of JSON data
+        :param s: database session (may be omitted for one-off calls)
+        :param repo: the repository of the pulls
+        """
+
+        pulls = {_["number"]: _ for _ in pulls_list}
+        existing = self.existing_numbers(pulls, s=s, repo=repo or "")
+        new = [Pull(p, repo=repo) for num, p in pulls.items() if num not in existing]
+        s.add_all(new)
+        return len(new)
+
+    @utils.optional_session
+    def existing_numbers(self, numbers: typing.Iterable[int], s: orm.Session, repo: str = None) -> typing.Set[int]:
+        """ Return the numbers of saved pulls out of the given ones. """
+        query = self.in_repo(s.query(Pull.number).filter(Pull.number.in_(list(numbers))), repo)
+        return set(_ for (_,) in query)
+
+    @utils.optional_session
+    def by_number(self, pull_number: int, s: orm.Session, repo: str = None) -> typing.Optional[Pull]:
         """ Return a pull by its number, if it exists. """
-        return s.query(Pull).filter(Pull.number == pull_number).first()
+        return self.in_repo(s.query(Pull).filter(Pull.number == pull_number), repo).first()
+
+    @utils.optional_session
+    def max_number(self, s: orm.Session, repo: str = None) -> typing.Optional[int]:
+        """ Return the greatest pull number, if there are any pulls. """
+        return self.in_repo(s.query(sql.func.max(Pull.number)), repo).scalar()
 
     @utils.optional_session
-    def remove(self, pull_number: int, s: orm.Session):
+    def remove(self, pull_number: int, s: orm.Session, repo: str = None):
         """ Delete a pull by its number. """
-        s.query(Pull).filter(Pull.number == pull_number).delete()
+        self.in_repo(s.query(Pull).filter(Pull.number == pull_number), repo).delete()
+
+    @utils.optional_session
+    def adopt(self, repo: str, s: orm.Session) -> int:
+        """
+        Assign the pulls saved before several repositories could be monitored to a repository,
+        and return their number. Messages about them need to be adopted as well (see `DiscordHelper.adopt_messages`).
+        """
+        return s.query(Pull).filter(Pull.repo == "").update({"repo": repo})
 
     @utils.optional_session
     def count_merged(
-        self, start_date: datetime.datetime, end_date: datetime.datetime, s: orm.Session
+        self, start_date: datetime.datetime, end_date: datetime.datetime, s: orm.Session, repo: str = None
     ) -> typing.List[Pull]:
         """
         Filter pulls that were merged between two dates. To avoid unintended results,
@@ -207,14 +299,15 @@ class PullHelper(base.Helper):
         :param start_date: lower bound (inclusive)
         :param end_date: upper bound (exclusive)
         :param s: database session (may be omitted for one-off calls)
+        :param repo: the repository of the pulls
         """
 
-        return s.query(Pull).filter(
+        return self.in_repo(s.query(Pull).filter(
             Pull.merged == 1,
             Pull.merged_at.between(start_date, end_date)
-        ).all()
+        ), repo).all()
 
     @utils.optional_session
-    def active_pulls(self, s: orm.Session):
+    def active_pulls(self, s: orm.Session, repo: str = None):
         """ List all currently open pulls. """
-        return s.query(Pull).filter(Pull.state != "closed").all()
+        return self.in_repo(s.query(Pull).filter(Pull.state != "closed"), repo).all()
@@ -7,6 +7,7 @@ from sqlalchemy.ext import declarative
 from librarian.storage import base
 from librarian.storage.models import (
     discord,
+    http_cache,
     metadata,
     pull,
 )
@@ -33,6 +34,7 @@ class Storage:
         self.pulls = pull.PullHelper(self)
         self.metadata = metadata.MetadataHelper(self)
         self.discord = discord.DiscordHelper(self)
+        self.http_cache = http_cache.HttpCacheHelper(self)
 
     @staticmethod
     def create_engine(path: str) -> sql.engine.Engine:
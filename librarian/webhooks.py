@@ -0,0 +1,165 @@
+import collections
+import hashlib
+import hmac
+import http
+import logging
+import typing
+
+from aiohttp import web
+
+from librarian.github import decoding
+
+logger = logging.getLogger(__name__)
+
+PullHandler = typing.Callable[[dict, typing.Optional[str]], typing.Awaitable[None]]
+
+
+class WebhookServer:
+    """
+    An embedded HTTP server that receives `pull_request` webhook deliveries from GitHub
+    (see https://docs.github.com/en/webhooks/webhook-events-and-payloads#pull_request)
+    and passes the pulls from them to a handler (along with the repository name) as soon as they arrive,
+    which makes polling a safety net.
+
+    Every delivery must be signed with the shared secret (the `X-Hub-Signature-256` header), otherwise it's rejected.
+    GitHub may deliver an event more than once, so recent delivery ids are remembered, and repeated ones are skipped.
+    If the handler fails, the delivery is forgotten, so that it can be redelivered. Example:
+
+        server = WebhookServer("s3cr3t", handler=bot.receive_pull, port=8080)
+        await server.start()  # point GitHub to http://<host>:8080/github
+        ...
+        await server.stop()
+    """
+
+    PATH = "/github"
+    HOST = "127.0.0.1"
+    PORT = 8080
+    SEEN_DELIVERIES = 1024
+
+    HEADER_SIGNATURE = "X-Hub-Signature-256"
+    HEADER_EVENT = "X-GitHub-Event"
+    HEADER_DELIVERY = "X-GitHub-Delivery"
+    SIGNATURE_PREFIX = "sha256="
+
+    def __init__(
+        self, secret: str, handler: PullHandler = None, host: str = HOST, port: int = PORT, path: str = PATH,
+        repo: typing.Union[str, typing.Sequence[str]] = None,
+    ):
+        """
+        :param secret: the webhook secret set up on GitHub
+        :param handler: a coroutine function that receives the pull and the repository name from every accepted delivery
+        :param host: interface to listen on
+        :param port: port to listen on
+        :param path: URL path for deliveries
+        :param repo: repository name in `owner-name/repo-name` format, or a list of them
+            (deliveries for other repositories are ignored)
+        """
+
+        if not secret:
+            raise ValueError("Webhook deliveries can't be verified without a secret")
+
+        self.__secret = secret.encode()
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.path = path
+        self.repos = None if repo is None else {_.lower() for _ in ([repo] if isinstance(repo, str) else repo)}
+
+        self.received = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.__seen: typing.OrderedDict[str, None] = collections.OrderedDict()
+        self.__runner: typing.Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application:
+        """ Create a web application that accepts deliveries. """
+
+        app = web.Application()
+        app.router.add_post(self.path, self.receive)
+        return app
+
+    async def start(self) -> None:
+        """ Start listening for deliveries. """
+
+        self.__runner = web.AppRunner(self.make_app())
+        await self.__runner.setup()
+        await web.TCPSite(self.__runner, self.host, self.port).start()
+        logger.info("Listening for GitHub webhooks at %s:%s%s", self.host, self.port, self.path)
+
+    async def stop(self) -> None:
+        """ Stop listening for deliveries. """
+
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+
+    def sign(self, body: bytes) -> str:
+        """ Compute the signature GitHub would send with the body. """
+
+        return self.SIGNATURE_PREFIX + hmac.new(self.__secret, body, hashlib.sha256).hexdigest()
+
+    def verify(self, body: bytes, signature: typing.Optional[str]) -> bool:
+        """ Check a delivery's signature in constant time. """
+
+        return signature is not None and hmac.compare_digest(self.sign(body), signature)
+
+    def __remember(self, delivery_id: str) -> bool:
+        if delivery_id in self.__seen:
+            self.__seen.move_to_end(delivery_id)
+            return False
+        self.__seen[delivery_id] = None
+        while len(self.__seen) > self.SEEN_DELIVERIES:
+            self.__seen.popitem(last=False)
+        return True
+
+    async def receive(self, request: web.Request) -> web.Response:
+        """ Verify a delivery and pass its pull to the handler. """
+
+        body = await request.read()
+        if not self.verify(body, request.headers.get(self.HEADER_SIGNATURE)):
+            self.rejected += 1
+            logger.warning("Rejected a webhook delivery with a bad signature from %s", request.remote)
+            return web.Response(status=http.HTTPStatus.UNAUTHORIZED, text="bad signature")
+
+        event = request.headers.get(self.HEADER_EVENT)
+        if event != "pull_request":
+            return web.Response(status=http.HTTPStatus.ACCEPTED, text="ignored")
+
+        try:
+            payload = decoding.loads(body)
+            pull = payload["pull_request"]
+        except (ValueError, TypeError, KeyError):
+            self.rejected += 1
+            return web.Response(status=http.HTTPStatus.BAD_REQUEST, text="malformed payload")
+
+        repo = (payload.get("repository") or {}).get("full_name")
+        if self.repos is not None and repo is not None and repo.lower() not in self.repos:
+            return web.Response(status=http.HTTPStatus.ACCEPTED, text="ignored")
+
+        delivery_id = request.headers.get(self.HEADER_DELIVERY)
+        if delivery_id is not None and not self.__remember(delivery_id):
+            self.duplicates += 1
+            logger.debug("Skipping repeated webhook delivery %s", delivery_id)
+            return web.Response(status=http.HTTPStatus.OK, text="duplicate")
+
+        self.received += 1
+        logger.info(
+            "Received webhook delivery %s: pull #%s %s", delivery_id, pull.get("number"), payload.get("action")
+        )
+        return await self.__dispatch(delivery_id, pull, repo)
+
+    async def __dispatch(
+        self, delivery_id: typing.Optional[str], pull: dict, repo: typing.Optional[str]
+    ) -> web.Response:
+        if self.handler is None:
+            return web.Response(status=http.HTTPStatus.OK, text="ok")
+
+        try:
+            await self.handler(pull, repo)
+        except Exception as exc:
+            logger.exception("Failed to handle webhook delivery %s: %s", delivery_id, exc)
+            if delivery_id is not None:
+                self.__seen.pop(delivery_id, None)
+            return web.Response(status=http.HTTPStatus.INTERNAL_SERVER_ERROR, text="failed")
+
+        return web.Response(status=http.HTTPStatus.OK, text="ok")
@@ -2,6 +2,7 @@ import itertools
 import json
 import os
 import random
+import re
 
 from aiohttp import web
 import pytest
@@ -50,17 +51,39 @@ def make_get_routes(repo, existing_pulls, unstable=False):
         q = request.url.query
         if q.get("sort", "created") == "created":
             pulls.sort(key=lambda p: p["created_at"])
+        elif q["sort"] == "updated":
+            pulls = sorted(pulls, key=lambda p: p["updated_at"])
+        if q.get("direction", "asc") == "desc":
+            pulls = pulls[::-1]
 
         limit = int(q.get("per_page", 30))
-        offset = (int(q.get("page", 1)) - 1) * limit
-        data = [p for p in pulls if p["state"] == q.get("state", "open")]
+        page = int(q.get("page", 1))
+        offset = (page - 1) * limit
+        state = q.get("state", "open")
+        data = [p for p in pulls if state == "all" or p["state"] == state]
 
         return web.Response(
             status=200,
             text=json.dumps(data[offset: offset + limit]),
-            content_type="application/json"
+            content_type="application/json",
+            headers=utils.make_link_header(request.url, page, -(-len(data) // limit)),
         )
 
+    async def search_issues(request: web.Request):
+        merged_since, merged_until = re.search(r"merged:(\S+)\.\.(\S+)", request.url.query["q"]).groups()
+        found = [
+            utils.as_issue(p) for p in sorted(existing_pulls, key=lambda p: p["number"])
+            if p["merged_at"] is not None and merged_since <= p["merged_at"][:10] <= merged_until
+        ]
+        limit = int(request.url.query.get("per_page", 30))
+        offset = (int(request.url.query.get("page", 1)) - 1) * limit
+        return web.Response(
+            status=200, content_type="application/json",
+            text=json.dumps({"total_count": len(found), "incomplete_results": False, "items": found[offset: offset + limit]}),
+        )
+
+    result["/search/issues"] = search_issues
+
     for pull in existing_pulls:
         pull_path = "/repos/{}/pulls/{}".format(repo, pull["number"])
         issue_path = "/repos/{}/issues/{}".format(repo, pull["number"])
@@ -79,6 +102,32 @@ def make_get_routes(repo, existing_pulls, unstable=False):
     return result
 
 
+def make_post_routes(repo, existing_pulls, unstable=False):
+    pulls = {p["number"]: p for p in existing_pulls}
+    alias_mask = re.compile(r"(?P<alias>\w+): pullRequest\(number: (?P<number>\d+)\)")
+
+    async def graphql(request: web.Request):
+        if unstable:
+            return web.Response(status=502, text="", content_type="application/json")
+
+        body = await request.json()
+        owner, name = repo.split("/")
+        if body["variables"] != {"owner": owner, "name": name}:
+            data = {"repository": None}
+        else:
+            data = {"repository": {
+                m.group("alias"): (
+                    utils.as_graphql_node(pulls[int(m.group("number"))])
+                    if int(m.group("number")) in pulls else None
+                )
+                for m in alias_mask.finditer(body["query"])
+            }}
+
+        return web.Response(status=200, text=json.dumps({"data": data}), content_type="application/json")
+
+    return {"/graphql": graphql}
+
+
 @pytest.fixture
 def get_routes(repo, existing_pulls):
     yield make_get_routes(repo, existing_pulls)
@@ -90,13 +139,25 @@ def unstable_get_routes(repo, existing_pulls):
 
 
 @pytest.fixture
-def mock_github(monkeypatch, aiohttp_client, loop, get_routes, gh_token):
-    yield utils.make_github_instance(monkeypatch, aiohttp_client, loop, get_routes, gh_token)
+def post_routes(repo, existing_pulls):
+    yield make_post_routes(repo, existing_pulls)
+
+
+@pytest.fixture
+def unstable_post_routes(repo, existing_pulls):
+    yield make_post_routes(repo, existing_pulls, unstable=True)
 
 
 @pytest.fixture
-def mock_unstable_github(monkeypatch, aiohttp_client, loop, unstable_get_routes, gh_token):
-    yield utils.make_github_instance(monkeypatch, aiohttp_client, loop, unstable_get_routes, gh_token)
+def mock_github(monkeypatch, aiohttp_client, loop, get_routes, post_routes, gh_token):
+    yield utils.make_github_instance(monkeypatch, aiohttp_client, loop, get_routes, gh_token, post_routes)
+
+
+@pytest.fixture
+def mock_unstable_github(monkeypatch, aiohttp_client, loop, unstable_get_routes, unstable_post_routes, gh_token):
+    yield utils.make_github_instance(
+        monkeypatch, aiohttp_client, loop, unstable_get_routes, gh_token, unstable_post_routes
+    )
 
 
 @pytest.fixture
@@ -1,10 +1,15 @@
+import asyncio
 import collections
 import random
 
+import aiohttp.client_exceptions
+import arrow
 import discord as discord_py
 import discord.errors as discord_errors
 import pytest
 
+import librarian.discord
+import librarian.github
 from librarian.storage.models import (
     discord,
     pull,
@@ -12,6 +17,9 @@ from librarian.storage.models import (
 from librarian.discord import formatters
 from librarian.discord.settings import custom
 from librarian.discord.cogs.background import github
+from librarian.github import gaps as gh_gaps
+
+from tests import utils
 
 
 @pytest.fixture
@@ -261,3 +269,261 @@ class TestSortForUpdates:
         client.storage.discord.delete_channel_messages.assert_called()
         args, _ = client.settings.reset.call_args
         assert args == (123,)
+
+
+class TestSync:
+    async def test__full_sync(self, client, storage, existing_pulls, mocker):
+        monitor = github.MonitorPulls(client)
+        monitor.fetch_pulls = mocker.AsyncMock(side_effect=monitor.fetch_pulls)
+        await monitor.loop()
+
+        open_pulls = [_ for _ in existing_pulls if _["state"] == "open"]
+        monitor.fetch_pulls.assert_called_once_with(set(_["number"] for _ in open_pulls))
+        assert sorted(_.number for _ in storage.pulls.active_pulls()) == sorted(_["number"] for _ in open_pulls)
+        assert monitor.watermark == max(open_pulls, key=lambda p: p["updated_at"])["updated_at"]
+        assert storage.metadata.load_field(monitor.cursor_key(monitor.WATERMARK)) == monitor.watermark
+
+    async def test__incremental_sync(self, client, storage, existing_pulls, mocker, monkeypatch):
+        monitor = github.MonitorPulls(client)
+        await monitor.loop()
+
+        by_update = sorted((_ for _ in existing_pulls if _["state"] == "open"), key=lambda p: p["updated_at"])
+        older, newer = by_update[len(by_update) // 2 - 1], by_update[-1]
+        with storage.session_scope() as s:
+            for p in (older, newer):
+                s.query(pull.Pull).filter_by(number=p["number"]).update({"updated_at": arrow.get(0).datetime})
+
+        watermark = by_update[len(by_update) // 2]["updated_at"]
+        monkeypatch.setattr(monitor, "watermark", watermark)
+        monitor.fetch_pulls = mocker.AsyncMock(side_effect=monitor.fetch_pulls)
+        monitor.github.request = mocker.AsyncMock(side_effect=monitor.github.request)
+        await monitor.loop()
+
+        monitor.fetch_pulls.assert_called_once_with({newer["number"]})
+        listed = [_ for _ in monitor.github.request.call_args_list if _.args and _.args[0].endswith("/pulls")]
+        newer_count = len([_ for _ in existing_pulls if _["updated_at"] >= watermark])
+        assert len(listed) == newer_count // monitor.github.OBJECTS_PER_PAGE + 1
+
+    async def test__full_sync_cadence(self, client, mocker, monkeypatch):
+        monitor = github.MonitorPulls(client)
+        monitor.list_open_pulls = mocker.AsyncMock(side_effect=monitor.list_open_pulls)
+        monitor.list_updated_pulls = mocker.AsyncMock(side_effect=monitor.list_updated_pulls)
+
+        await monitor.loop()
+        await monitor.loop()
+        assert monitor.list_open_pulls.call_count == 1
+        assert monitor.list_updated_pulls.call_count == 1
+
+        monkeypatch.setattr(monitor, "full_sync_interval", 0)
+        await monitor.loop()
+        assert monitor.list_open_pulls.call_count == 2
+
+
+class TestWebhooks:
+    async def test__receive_pull(self, client, storage, existing_pulls, mocker):
+        monitor = github.MonitorPulls(client)
+        monitor.sort_for_updates = mocker.AsyncMock()
+        payload = dict(existing_pulls[0], body="a very long description", _links={"self": "..."})
+
+        await monitor.receive_pull(payload)
+        saved = storage.pulls.by_number(payload["number"])
+        assert saved.title == payload["title"] and saved.user_login == payload["user"]["login"]
+        assert saved.assignees_logins == [_["login"] for _ in payload["assignees"]]
+        monitor.sort_for_updates.assert_called_once()
+
+    async def test__outdated_pull(self, client, storage, existing_pulls, mocker):
+        monitor = github.MonitorPulls(client)
+        monitor.sort_for_updates = mocker.AsyncMock()
+        payload = existing_pulls[0]
+        storage.pulls.save_from_payload(payload, repo=monitor.repo)
+
+        outdated = dict(payload, title="old title", updated_at=utils.to_github_date(arrow.get(0)))
+        await monitor.receive_pull(outdated)
+        assert storage.pulls.by_number(payload["number"]).title == payload["title"]
+        monitor.sort_for_updates.assert_not_called()
+
+    async def test__concurrent_deliveries(self, client, storage, existing_pulls, mocker):
+        monitor = github.MonitorPulls(client)
+        release = asyncio.Event()
+
+        async def slow_sort(pulls):
+            await release.wait()
+
+        monitor.sort_for_updates = mocker.AsyncMock(side_effect=slow_sort)
+        payload = existing_pulls[0]
+        outdated = dict(payload, title="old title", updated_at=utils.to_github_date(arrow.get(0)))
+
+        fresh = asyncio.ensure_future(monitor.receive_pull(payload))
+        await asyncio.sleep(0)
+        stale = asyncio.ensure_future(monitor.receive_pull(outdated))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(fresh, stale)
+
+        assert storage.pulls.by_number(payload["number"]).title == payload["title"]
+        monitor.sort_for_updates.assert_called_once()
+
+
+class TestBackfill:
+    async def test__backfill(self, client, storage, existing_pulls, monkeypatch, mocker):
+        fetcher = github.FetchNewPulls(client)
+        monkeypatch.setattr(client.github, "OBJECTS_PER_PAGE", 10)
+        client.github.get_single_pull = mocker.AsyncMock(return_value=None)
+        client.github.get_single_issue = mocker.AsyncMock(return_value=None)
+
+        pages = -(-len(existing_pulls) // 10)
+        for page in range(1, pages + 1):
+            assert fetcher.backfill_page in (None, page)
+            await fetcher.loop()
+            saved = storage.metadata.load_field(fetcher.cursor_key(fetcher.BACKFILL_PAGE))
+            assert saved == (page + 1 if page < pages else 0)
+        client.github.get_single_pull.assert_not_called()
+
+        closed = sorted(_["number"] for _ in existing_pulls if _["state"] == "closed")
+        saved = [_ for _ in (storage.pulls.by_number(n) for n in closed) if _ is not None]
+        assert len(saved) == len(closed)
+        assert all(bool(p.merged) == (p.merged_at is not None) for p in saved)
+        payloads = {_["number"]: _ for _ in existing_pulls}
+        assert all(
+            (p.commits, p.changed_files, p.review_comments) == tuple(
+                payloads[p.number][k] for k in ("commits", "changed_files", "review_comments")
+            )
+            for p in saved
+        )
+        assert not storage.pulls.active_pulls()
+        assert fetcher.last_pull == max(_["number"] for _ in existing_pulls) + 1
+        assert storage.metadata.load_field(fetcher.cursor_key(fetcher.LAST_PULL)) == fetcher.last_pull
+
+        monkeypatch.setattr(asyncio, "sleep", mocker.AsyncMock())
+        fetcher.loop.change_interval = mocker.Mock()
+        await fetcher.loop()
+        client.github.get_single_pull.assert_called_once()
+
+    async def test__resume(self, client, storage, existing_pulls, monkeypatch, mocker):
+        monkeypatch.setattr(client.github, "OBJECTS_PER_PAGE", 10)
+        storage.metadata.save_field(github.FetchNewPulls.BACKFILL_PAGE, 3)
+        client.github.pulls_page = mocker.AsyncMock(side_effect=client.github.pulls_page)
+
+        fetcher = github.FetchNewPulls(client)
+        await fetcher.loop()
+        assert client.github.pulls_page.call_args.args == (3,)
+        assert fetcher.backfill_page == 4
+
+    async def test__incomplete_page(self, client, storage, existing_pulls, monkeypatch, mocker):
+        monkeypatch.setattr(client.github, "OBJECTS_PER_PAGE", 10)
+        fetcher = github.FetchNewPulls(client)
+        client.github.get_many_pulls = mocker.AsyncMock(side_effect=lambda numbers, **kwargs: {
+            n: aiohttp.client_exceptions.ClientError() for n in numbers
+        })
+
+        await fetcher.loop()
+        assert fetcher.backfill_page == 1
+        assert storage.pulls.max_number() is None
+
+    async def test__existing_deployment(self, client, storage):
+        storage.metadata.save_field(github.FetchNewPulls.LAST_PULL, 100)
+        fetcher = github.FetchNewPulls(client)
+        fetcher.load_progress()
+        assert fetcher.backfill_page == 0 and fetcher.last_pull == 100
+
+        fresh = github.FetchNewPulls(client)
+        storage.metadata.save_field(github.FetchNewPulls.LAST_PULL, None)
+        fresh.load_progress()
+        assert fresh.backfill_page == 1
+
+
+class TestKnownGaps:
+    @pytest.fixture
+    def fetcher(self, client, storage, mocker, monkeypatch):
+        monkeypatch.setattr(asyncio, "sleep", mocker.AsyncMock())
+        storage.metadata.save_field(github.FetchNewPulls.BACKFILL_PAGE, 0)
+        fetcher = github.FetchNewPulls(client)
+        fetcher.loop.change_interval = mocker.Mock()
+        client.github.get_single_pull = mocker.AsyncMock(return_value=None)
+        client.github.get_single_issue = mocker.AsyncMock(return_value=None)
+        yield fetcher
+
+    async def test__issues_are_skipped(self, fetcher, client, storage):
+        client.github.get_single_issue.return_value = {"number": 1}
+        for _ in range(3):
+            await fetcher.loop()
+        assert fetcher.last_pull == 4
+        saved = storage.metadata.load_field(fetcher.cursor_key(fetcher.KNOWN_GAPS))
+        assert gh_gaps.KnownGaps.from_state(saved).issues.ranges == [[1, 3]]
+
+        restarted = github.FetchNewPulls(client)
+        restarted.loop.change_interval = fetcher.loop.change_interval
+        restarted.last_pull = 1
+        client.github.get_single_pull.reset_mock()
+        client.github.get_single_issue.return_value = None
+        await restarted.loop()
+        assert restarted.skipped == 3
+        client.github.get_single_pull.assert_called_once()
+        assert client.github.get_single_pull.call_args.args == (4,)
+
+    async def test__missing_numbers(self, fetcher, client, storage, existing_pulls):
+        storage.pulls.save_from_payload(dict(existing_pulls[0], number=10), repo=fetcher.repo)
+
+        fetcher.last_pull = 5
+        await fetcher.loop()
+        assert fetcher.last_pull == 6 and fetcher.gaps.is_missing(5)
+        fetcher.loop.change_interval.assert_not_called()
+
+        fetcher.last_pull = 11
+        await fetcher.loop()
+        assert fetcher.last_pull == 11 and not fetcher.gaps.is_missing(11)
+        fetcher.loop.change_interval.assert_called_once()
+
+
+class TestRepositories:
+    OTHER_REPO = "test-owner/Other-Repo"
+
+    @pytest.fixture
+    def multirepo_client(self, mock_github, storage, repo, gh_token):
+        bot = librarian.discord.Client(
+            github=librarian.github.GitHub(token=gh_token, repo=[repo, self.OTHER_REPO]), storage=storage,
+        )
+        bot.setup()
+        yield bot
+
+    def test__cogs(self, multirepo_client, repo):
+        names = {name for name in multirepo_client.cogs if name.startswith(("FetchNewPulls", "MonitorPulls"))}
+        assert names == {
+            "{}[{}]".format(cls, r) for cls in ("FetchNewPulls", "MonitorPulls") for r in (repo, self.OTHER_REPO)
+        }
+        assert multirepo_client.monitor_for().repo == repo
+        assert multirepo_client.monitor_for(self.OTHER_REPO.upper()).repo == self.OTHER_REPO
+
+    def test__cursors(self, multirepo_client, storage, repo):
+        storage.metadata.save_field(github.FetchNewPulls.LAST_PULL, 100)  # saved by a single-repository bot
+        primary = multirepo_client.get_cog("FetchNewPulls[{}]".format(repo))
+        other = multirepo_client.get_cog("FetchNewPulls[{}]".format(self.OTHER_REPO))
+        assert primary.load_cursor(primary.LAST_PULL) == 100
+        assert other.load_cursor(other.LAST_PULL) is None
+
+        other.save_cursor(other.LAST_PULL, 5)
+        assert primary.load_cursor(primary.LAST_PULL) == 100
+        assert other.load_cursor(other.LAST_PULL) == 5
+
+    async def test__webhooks(self, multirepo_client, storage, existing_pulls, mocker):
+        for monitor in multirepo_client.monitors.values():
+            monitor.sort_for_updates = mocker.AsyncMock()
+
+        payload = existing_pulls[0]
+        await multirepo_client.receive_pull(payload, self.OTHER_REPO.lower())
+        await multirepo_client.receive_pull(payload, "someone/else")
+        assert storage.pulls.by_number(payload["number"]).repo == self.OTHER_REPO
+        assert storage.pulls.by_number(payload["number"], repo=multirepo_client.github.repo) is None
+
+    async def test__channels(self, multirepo_client, existing_pulls, codes_by_titles, mocker):
+        p = next(_ for _ in existing_pulls if codes_by_titles[_["title"]])
+        language = custom.Language(codes_by_titles[p["title"]])
+        await multirepo_client.settings.update(1, 10, [language.name, language.code])
+        await multirepo_client.settings.update(2, 10, [language.name, language.code, "repo", self.OTHER_REPO])
+        assert multirepo_client.channel_repo(2) == self.OTHER_REPO
+
+        for repo, channel_id in ((multirepo_client.github.repo, 1), (self.OTHER_REPO, 2)):
+            monitor = multirepo_client.monitor_for(repo)
+            monitor.update_pull_status = mocker.AsyncMock(return_value=None)
+            await monitor.sort_for_updates([pull.Pull(p, repo=repo)])
+            assert [_.args[1] for _ in monitor.update_pull_status.call_args_list] == [channel_id]
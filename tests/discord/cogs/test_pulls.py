@@ -37,8 +37,8 @@ class TestCountArgparser:
 
 class TestPullsCog:
     @pytest.mark.freeze_time
-    async def test__count(self, client, storage, existing_pulls, make_context, language_code):
-        storage.pulls.save_many_from_payload(existing_pulls)
+    async def test__count(self, client, storage, repo, existing_pulls, make_context, language_code):
+        storage.pulls.save_many_from_payload(existing_pulls, repo=repo)
         merged_only = [_ for _ in existing_pulls if _["merged"]]
 
         def pick_any():
@@ -105,3 +105,26 @@ class TestPullsCog:
                 "invalid get value"
             )
         ), ctx.message.channel.send.call_args[1]["content"]
+
+    async def test__count_backfilled(self, client, storage, repo, existing_pulls, make_context, mocker):
+        search = mocker.patch.object(client.github, "search_merged_pulls", side_effect=client.github.search_merged_pulls)
+        args = ["--from", "2020-02-01", "--to", "2020-05-01", "--language", "all"]
+        expected = [
+            _ for _ in existing_pulls
+            if _["merged_at"] is not None and "2020-02-01" <= _["merged_at"][:10] < "2020-05-01"
+        ]
+
+        for _ in range(2):
+            ctx = make_context()
+            await client.get_cog(pulls.Pulls.__name__).list(ctx, *args)
+            assert int(ctx.message.channel.send.call_args_list[0].kwargs["content"].split(" ")[0]) == len(expected)
+
+        search.assert_called_once()  # the window is remembered as complete
+        assert storage.pulls.existing_numbers([_["number"] for _ in existing_pulls], repo=repo) == {
+            _["number"] for _ in expected
+        }
+
+        search.reset_mock()
+        ctx = make_context()
+        await client.get_cog(pulls.Pulls.__name__).list(ctx, "--from", "2020-04-01", "--to", "2020-06-01", "-l", "all")
+        assert [_.args[:2] for _ in search.call_args_list] == [(arrow.get(2020, 5, 1).date(), arrow.get(2020, 5, 31).date())]
@@ -65,7 +65,7 @@ class TestRegistry:
     def test__properties(self):
         assert registry.Registry.KNOWN_SETTINGS == {
             _.name: _
-            for _ in (custom.PinMessages, custom.Language, custom.ReviewerRole)
+            for _ in (custom.PinMessages, custom.Language, custom.ReviewerRole, custom.Repo)
         }
 
         assert registry.Registry.default_settings() == {
@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import aiohttp.client_exceptions as aiohttp_excs
+import arrow
+from aiohttp import web
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import librarian.github
+
+from tests import utils
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+@pytest.fixture
+def public_key(private_key):
+    return serialization.load_pem_private_key(private_key.encode(), password=None).public_key()
+
+
+@pytest.fixture
+def token_endpoint(public_key):
+    """ A stub of https://docs.github.com/en/rest/apps/apps#create-an-installation-access-token-for-an-app. """
+
+    state = dict(issued=[], seen=[], lifetime=3600, delay=0, status=201)
+
+    async def access_tokens(request):
+        token = request.headers["Authorization"].split(" ", 1)[1]
+        claims = jwt.decode(token, public_key, algorithms=["RS256"])
+        assert claims["iss"] == "12345" and request.match_info["installation"] == "67890"
+
+        await asyncio.sleep(state["delay"])
+        if state["status"] != 201:
+            return web.Response(status=state["status"], text="{}", content_type="application/json")
+
+        issued = "ghs_{}".format(len(state["issued"]))
+        state["issued"].append(issued)
+        expires_at = arrow.utcnow().shift(seconds=state["lifetime"])
+        return web.Response(
+            status=201, content_type="application/json",
+            text=json.dumps({"token": issued, "expires_at": expires_at.format("YYYY-MM-DDTHH:mm:ss") + "Z"}),
+        )
+
+    async def ok(request):
+        state["seen"].append(request.headers["Authorization"])
+        return web.Response(status=200, text="{}", content_type="application/json")
+
+    get_routes = {"/ok": ok}
+    post_routes = {"/app/installations/{installation}/access_tokens": access_tokens}
+    yield get_routes, post_routes, state
+
+
+@pytest.fixture
+def mock_app_github(monkeypatch, aiohttp_client, loop, token_endpoint, gh_token):
+    get_routes, post_routes, state = token_endpoint
+    utils.make_github_instance(monkeypatch, aiohttp_client, loop, get_routes, gh_token, post_routes)
+    yield state
+
+
+@pytest.fixture
+def app(private_key):
+    return librarian.github.GitHubApp(app_id=12345, installation_id=67890, private_key=private_key)
+
+
+class TestGitHubApp:
+    def test__jwt(self, app, public_key):
+        claims = jwt.decode(app.make_jwt(now=arrow.utcnow().int_timestamp), public_key, algorithms=["RS256"])
+        assert claims["iss"] == "12345"
+        assert claims["exp"] - claims["iat"] <= 10 * 60
+
+    async def test__token_is_cached(self, mock_app_github, app, repo):
+        api = librarian.github.GitHub(app, repo)
+        await asyncio.gather(*(api.get("ok", query={"n": n}) for n in range(5)))  # not coalesced
+
+        assert mock_app_github["issued"] == ["ghs_0"]
+        assert mock_app_github["seen"] == ["token ghs_0"] * 5
+        assert app.refreshes == 1 and app.expires_at > arrow.utcnow()
+        assert api.tokens.status().keys() == {"app 12345/67890"}
+
+    async def test__refreshed_ahead(self, mock_app_github, app, repo):
+        mock_app_github["lifetime"] = app.REFRESH_AHEAD - 1
+        api = librarian.github.GitHub(app, repo)
+        await api.get("ok")
+
+        mock_app_github["delay"] = 0.2
+        await api.get("ok")  # doesn't wait for the new token
+        assert mock_app_github["seen"] == ["token ghs_0"] * 2
+
+        await asyncio.sleep(0.3)
+        await api.get("ok")
+        assert mock_app_github["issued"] == ["ghs_0", "ghs_1"]
+        assert mock_app_github["seen"][-1] == "token ghs_1"
+
+    async def test__expired(self, mock_app_github, app, repo):
+        mock_app_github["lifetime"] = app.EXPIRY_MARGIN - 1
+        api = librarian.github.GitHub(app, repo)
+        await api.get("ok")
+        await api.get("ok")
+        assert mock_app_github["seen"] == ["token ghs_0", "token ghs_1"]
+
+    async def test__exchange_failed(self, mock_app_github, app, repo):
+        mock_app_github["status"] = 401
+        api = librarian.github.GitHub(app, repo)
+        with pytest.raises(aiohttp_excs.ClientResponseError):
+            await api.get("ok")
+        assert not mock_app_github["seen"]
+
+    async def test__with_tokens(self, mock_app_github, app, repo, gh_token):
+        api = librarian.github.GitHub([gh_token, app], repo)
+        await api.get("ok")
+        await api.get("ok")
+        assert sorted(mock_app_github["seen"]) == sorted(["token ghs_0", "token {}".format(gh_token)])
@@ -0,0 +1,134 @@
+import json
+
+from aiohttp import web
+import pytest
+
+import librarian.github
+
+from tests import utils
+
+
+@pytest.fixture
+def etag_routes(repo, existing_pulls):
+    requests = []
+
+    def make_handler(pull):
+        etag = '"{}"'.format(utils.make_id(pull))
+
+        async def handler(request: web.Request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(
+                status=200, text=json.dumps(pull), content_type="application/json", headers={"ETag": etag}
+            )
+        return handler
+
+    routes = {
+        "/repos/{}/pulls/{}".format(repo, pull["number"]): make_handler(pull)
+        for pull in existing_pulls[:10]
+    }
+    yield routes, requests
+
+
+@pytest.fixture
+def mock_etag_github(monkeypatch, aiohttp_client, loop, etag_routes, gh_token):
+    routes, requests = etag_routes
+    utils.make_github_instance(monkeypatch, aiohttp_client, loop, routes, gh_token)
+    yield requests
+
+
+class TestResponseCache:
+    def test__make_key(self):
+        make_key = librarian.github.ResponseCache.make_key
+        assert make_key("repos/a/b/pulls", {"page": 1, "state": "open"}) == make_key(
+            "/repos/a/b/pulls", {"state": "open", "page": "1"}
+        )
+        assert make_key("repos/a/b/pulls", {"page": 1}) != make_key("repos/a/b/pulls", {"page": 2})
+
+    def test__store_and_hit(self):
+        cache = librarian.github.ResponseCache(size=10)
+        assert cache.conditional_headers("a") == {}
+
+        assert not cache.store("a", {}, {"data": 1})
+        assert "a" not in cache
+
+        assert cache.store("a", {"ETag": '"abc"'}, {"data": 1})
+        assert cache.conditional_headers("a") == {"If-None-Match": '"abc"'}
+
+        assert cache.store("b", {"Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}, [1, 2, 3])
+        assert cache.conditional_headers("b") == {"If-Modified-Since": "Sat, 17 Oct 2026 10:00:00 GMT"}
+
+        assert cache.hit("a") == {"data": 1}
+        assert cache.hits == 1
+        assert cache.misses == 3
+
+    def test__lru_eviction(self):
+        cache = librarian.github.ResponseCache(size=3)
+        for key in "abc":
+            cache.store(key, {"ETag": key}, key)
+
+        cache.get("a")
+        cache.store("d", {"ETag": "d"}, "d")
+        assert len(cache) == 3
+        assert "b" not in cache
+        assert all(key in cache for key in "acd")
+
+    def test__disabled(self):
+        cache = librarian.github.ResponseCache(size=0)
+        assert not cache.store("a", {"ETag": "a"}, "a")
+        assert len(cache) == 0
+
+    def test__persistence(self, storage):
+        cache = librarian.github.ResponseCache(size=2, backend=storage.http_cache)
+        for key in "abc":
+            cache.store(key, {"ETag": key}, {"key": key})
+
+        restored = librarian.github.ResponseCache(size=2, backend=storage.http_cache)
+        assert len(restored) == 2
+        assert "a" not in restored
+        assert restored.get("c").body == {"key": "c"}
+        assert restored.conditional_headers("b") == {"If-None-Match": "b"}
+
+
+class TestConditionalRequests:
+    async def test__not_modified(self, mock_etag_github, gh_token, repo, existing_pulls):
+        cache = librarian.github.ResponseCache()
+        api = librarian.github.GitHub(gh_token, repo, cache=cache)
+        pulls = existing_pulls[:10]
+
+        for pull in pulls:
+            assert await api.get_single_pull(pull["number"]) == pull
+        assert cache.misses == len(pulls)
+        assert cache.hits == 0
+        assert not any("If-None-Match" in request.headers for request in mock_etag_github)
+
+        for pull in pulls:
+            assert await api.get_single_pull(pull["number"]) == pull
+        assert cache.misses == len(pulls)
+        assert cache.hits == len(pulls)
+        assert all("If-None-Match" in request.headers for request in mock_etag_github[len(pulls):])
+
+    async def test__evicted_while_in_flight(self, mock_etag_github, gh_token, repo, existing_pulls):
+        cache = librarian.github.ResponseCache(size=1)
+        api = librarian.github.GitHub(gh_token, repo, cache=cache)
+        pull = existing_pulls[0]
+        assert await api.get_single_pull(pull["number"]) == pull
+
+        conditional_headers = cache.conditional_headers
+
+        def evict_after(key):
+            headers = conditional_headers(key)
+            cache.store("other", {"ETag": '"other"'}, {})
+            return headers
+
+        cache.conditional_headers = evict_after
+        assert await api.get_single_pull(pull["number"]) == pull
+        assert ["If-None-Match" in request.headers for request in mock_etag_github] == [False, True, False]
+        assert cache.hits == 0
+
+    async def test__no_cache(self, mock_etag_github, gh_token, repo, existing_pulls):
+        api = librarian.github.GitHub(gh_token, repo)
+        for _ in range(2):
+            assert await api.get_single_pull(existing_pulls[0]["number"]) == existing_pulls[0]
+        assert not any("If-None-Match" in request.headers for request in mock_etag_github)
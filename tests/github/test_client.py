@@ -1,11 +1,31 @@
+import asyncio
 import random
 
 import arrow
 import aiohttp.client_exceptions as aiohttp_excs
+from aiohttp import web
 import pytest
 
 import librarian.github
 
+from tests import utils
+
+
+@pytest.fixture
+def mock_slow_github(monkeypatch, aiohttp_client, loop, gh_token):
+    calls = []
+
+    def make_handler(status):
+        async def handler(request):
+            calls.append(request.path)
+            await asyncio.sleep(0.1)
+            return web.Response(status=status, text='{"ok": true}', content_type="application/json")
+        return handler
+
+    routes = {"/slow": make_handler(200), "/broken": make_handler(404)}
+    utils.make_github_instance(monkeypatch, aiohttp_client, loop, routes, gh_token)
+    yield calls
+
 
 class TestBasics:
     async def ensure_headers(self, gh_token, repo):
@@ -42,6 +62,28 @@ class TestBasics:
     async def test__patched_client_headers(self, mock_github, gh_token, repo):
         await self.ensure_headers(gh_token, repo)
 
+    async def test__shared_session(self, gh_token, repo):
+        api = librarian.github.GitHub(gh_token, repo, connections_per_host=3, keepalive_timeout=5)
+        await api.open()
+        session = api.session
+        assert session is api.session
+        assert session.connector.limit_per_host == 3
+
+        await api.close()
+        assert session.closed
+        await api.close()
+
+        assert api.session is not session
+        await api.close()
+
+    async def test__shared_session_reused(self, mock_github, gh_token, repo, existing_pulls, mocker):
+        api = librarian.github.GitHub(gh_token, repo)
+        make_session = mocker.patch.object(api, "make_session", side_effect=api.make_session)
+        for pull in existing_pulls[:5]:
+            assert await api.get_single_pull(pull["number"])
+        make_session.assert_called_once()
+        await api.close()
+
 
 class TestInteraction:
     @pytest.mark.parametrize("outer_session", [True, False])
@@ -98,7 +140,58 @@ class TestInteraction:
             for _ in data
         )
 
+    @pytest.mark.parametrize("results_limit", [1000, 5])
+    async def test__search_merged_pulls(self, mock_github, gh_token, repo, existing_pulls, monkeypatch, results_limit):
+        monkeypatch.setattr(librarian.github.GitHub, "SEARCH_RESULTS_LIMIT", results_limit)
+        monkeypatch.setattr(librarian.github.GitHub, "OBJECTS_PER_PAGE", 3)
+        api = librarian.github.GitHub(gh_token, repo)
+        start, end = arrow.get(2020, 3, 1).date(), arrow.get(2020, 6, 30).date()
+
+        numbers, complete = await api.search_merged_pulls(start, end)
+        assert numbers == {
+            _["number"] for _ in existing_pulls
+            if _["merged_at"] is not None and start.isoformat() <= _["merged_at"][:10] <= end.isoformat()
+        }
+        assert complete
+
     async def test__unknown_method(self, gh_token, repo):
         api = librarian.github.GitHub(gh_token, repo)
         with pytest.raises(ValueError):
             await api.call_method("/test/", method="what")
+
+
+class TestCoalescing:
+    async def test__identical_requests(self, mock_slow_github, gh_token, repo):
+        api = librarian.github.GitHub(gh_token, repo)
+        results = await asyncio.gather(*(api.get("slow", {"a": 1}) for _ in range(5)), api.get("slow", {"a": 2}))
+        assert all(r == {"ok": True} for r in results)
+        assert len(mock_slow_github) == 2
+        assert api.coalesced == 4
+
+        await api.get("slow", {"a": 1})
+        assert len(mock_slow_github) == 3
+
+    async def test__priorities(self, mock_slow_github, gh_token, repo):
+        api = librarian.github.GitHub(gh_token, repo)
+        await asyncio.gather(
+            api.get("slow", priority=librarian.github.Priority.SYNC),
+            api.get("slow", priority=librarian.github.Priority.BACKFILL),  # joins the SYNC one
+            api.get("slow", priority=librarian.github.Priority.INTERACTIVE),  # doesn't wait for a SYNC one
+        )
+        assert len(mock_slow_github) == 2
+
+    async def test__shared_errors(self, mock_slow_github, gh_token, repo):
+        api = librarian.github.GitHub(gh_token, repo)
+        results = await asyncio.gather(*(api.get("broken") for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, aiohttp_excs.ClientResponseError) for r in results)
+        assert len(mock_slow_github) == 1
+
+    async def test__cancellation(self, mock_slow_github, gh_token, repo):
+        api = librarian.github.GitHub(gh_token, repo)
+        first = asyncio.create_task(api.get("slow"))
+        second = asyncio.create_task(api.get("slow"))
+        await asyncio.sleep(0.05)
+
+        first.cancel()
+        assert await second == {"ok": True}
+        assert len(mock_slow_github) == 1
@@ -0,0 +1,61 @@
+import aiohttp
+import pytest
+
+import librarian.github
+from librarian import storage
+from librarian.github import decoding
+
+
+class TestDecoding:
+    @pytest.mark.parametrize("backend", [None, decoding.orjson])
+    def test__loads(self, monkeypatch, backend):
+        monkeypatch.setattr(decoding, "orjson", backend)
+        assert decoding.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+        assert decoding.loads(b"  ") is None
+
+    @pytest.mark.parametrize("backend", [None, decoding.orjson])
+    def test__malformed(self, monkeypatch, backend):
+        monkeypatch.setattr(decoding, "orjson", backend)
+        with pytest.raises(aiohttp.ClientPayloadError):
+            librarian.github.GitHub.decode(b"<html>Unicorn!</html>", None, "GET /repos")
+
+    def test__make_projection(self):
+        assert decoding.make_projection(None) is None
+        assert decoding.make_projection(("a", "b")) == {"a": None, "b": None}
+        projection = {"a": {"b": None}}
+        assert decoding.make_projection(projection) is projection
+
+    def test__fingerprint(self):
+        assert decoding.fingerprint(None) is None
+        first, second = {"a": None, "b": {"c": None}}, {"b": {"c": None}, "a": None}
+        assert decoding.fingerprint(first) == decoding.fingerprint(second)
+        assert decoding.fingerprint({"a": None}) != decoding.fingerprint({"b": None})
+
+    def test__project(self):
+        items = [{"number": 1, "title": "a", "body": "b"}, {"number": 2}]
+        assert decoding.project(items, None) is items
+        assert decoding.project(items, {"number": None, "title": None}) == [{"number": 1, "title": "a"}, {"number": 2}]
+
+        pull = {"user": {"login": "a", "id": 1, "avatar_url": "x"}, "assignees": [{"login": "b", "id": 2}], "n": 1}
+        projection = {"user": {"login": None}, "assignees": {"login": None}, "n": None}
+        assert decoding.project(pull, projection) == {"user": {"login": "a"}, "assignees": [{"login": "b"}], "n": 1}
+
+
+class TestPayloadProjection:
+    def test__pull_survives_projection(self, existing_pulls):
+        projection = storage.Pull.payload_projection()
+        for payload in existing_pulls[:10]:
+            projected = decoding.project(payload, projection)
+            assert storage.Pull(projected).as_dict() == storage.Pull(payload).as_dict()
+
+    async def test__projected_requests(self, mock_github, gh_token, repo, existing_pulls):
+        api = librarian.github.GitHub(gh_token, repo, cache=librarian.github.ResponseCache())
+        number = existing_pulls[0]["number"]
+
+        lean = await api.get_single_pull(number, keys=("number", "title"))
+        full = await api.get_single_pull(number)
+        assert lean == {"number": number, "title": existing_pulls[0]["title"]}
+        assert full == existing_pulls[0]
+
+        results = await api.get_many_pulls([number], keys=storage.Pull.payload_projection())
+        assert set(results[number]) <= set(storage.Pull.payload_projection())
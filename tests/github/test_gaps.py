@@ -0,0 +1,73 @@
+import random
+import time
+
+import pytest
+
+from librarian.github import gaps
+
+
+class TestRangeSet:
+    def test__add(self):
+        numbers = gaps.RangeSet()
+        for n in (5, 1, 3, 2, 10, 4, 12):
+            numbers.add(n)
+        assert numbers.ranges == [[1, 5], [10, 10], [12, 12]]
+        numbers.add(11)
+        assert numbers.ranges == [[1, 5], [10, 12]]
+        assert len(numbers) == 8
+
+    def test__add_range(self):
+        numbers = gaps.RangeSet([[20, 30], [1, 3]])
+        numbers.add_range(5, 19)
+        assert numbers.ranges == [[1, 3], [5, 30]]
+        numbers.add_range(0, 40)
+        assert numbers.ranges == [[0, 40]]
+
+    def test__missing(self):
+        numbers = gaps.RangeSet([[3, 5], [8, 9]])
+        assert numbers.missing(1, 10) == [[1, 2], [6, 7], [10, 10]]
+        assert numbers.missing(4, 8) == [[6, 7]]
+        assert numbers.missing(3, 5) == []
+        assert gaps.RangeSet().missing(1, 2) == [[1, 2]]
+
+    def test__random(self):
+        expected = set(random.sample(range(1000), 300))
+        numbers = gaps.RangeSet()
+        for n in expected:
+            numbers.add(n)
+        assert [n for n in range(-1, 1001) if n in numbers] == sorted(expected)
+        assert all(a[1] + 1 < b[0] for a, b in zip(numbers.ranges, numbers.ranges[1:]))
+
+
+class TestKnownGaps:
+    def test__missing_ttl(self, monkeypatch):
+        known = gaps.KnownGaps(missing_ttl=10)
+        known.add_missing(5)
+        assert known.is_missing(5)
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 11)
+        assert not known.is_missing(5)
+        assert 5 not in known.missing
+
+    def test__issue_replaces_missing(self):
+        known = gaps.KnownGaps()
+        known.add_missing(3)
+        known.add_issue(3)
+        assert known.is_issue(3) and not known.is_missing(3)
+
+    @pytest.mark.parametrize("state", [None, {}])
+    def test__empty_state(self, state):
+        known = gaps.KnownGaps.from_state(state)
+        assert not known.issues.ranges and not known.missing
+
+    def test__state(self):
+        known = gaps.KnownGaps()
+        for n in (1, 2, 3, 8):
+            known.add_issue(n)
+        known.add_missing(5)
+        known.missing[6] = time.time() - 1
+
+        restored = gaps.KnownGaps.from_state(known.as_state())
+        assert restored.issues.ranges == [[1, 3], [8, 8]]
+        assert list(restored.missing) == [5]
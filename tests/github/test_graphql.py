@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import librarian.github
+from librarian.github import graphql
+
+from tests import utils
+
+
+class TestNormalization:
+    def test__normalize_pull(self, existing_pulls):
+        for pull in existing_pulls:
+            normalized = graphql.normalize_pull(utils.as_graphql_node(pull))
+            assert normalized == {k: pull[k] for k in normalized}
+
+    def test__ghost_author(self, existing_pulls):
+        node = utils.as_graphql_node(existing_pulls[0])
+        node["author"] = None
+        assert graphql.normalize_pull(node)["user"] == graphql.GHOST_USER
+
+    def test__make_pulls_query(self):
+        query = graphql.make_pulls_query([1, 20, 300])
+        for number in (1, 20, 300):
+            assert "{}: pullRequest(number: {})".format(graphql.pull_alias(number), number) in query
+        assert "fragment PullFields on PullRequest" in query
+
+
+class TestBatchFetching:
+    SAMPLE_SZ = 30
+
+    async def test__get_many_pulls(self, mock_github, gh_token, repo, existing_pulls, mocker):
+        api = librarian.github.GitHub(gh_token, repo)
+        api.get_single_pull = mocker.AsyncMock(side_effect=api.get_single_pull)
+        sampled = {_["number"]: _ for _ in random.sample(existing_pulls, self.SAMPLE_SZ)}
+
+        results = await api.get_many_pulls(sampled)
+        assert list(results) == list(sampled)
+        for number, pull in results.items():
+            assert pull == {k: sampled[number][k] for k in pull}
+        api.get_single_pull.assert_not_called()
+
+    async def test__nonexistent_pulls(self, mock_github, gh_token, repo, existing_pulls, mocker):
+        api = librarian.github.GitHub(gh_token, repo)
+        api.get_single_pull = mocker.AsyncMock(side_effect=api.get_single_pull)
+        nonexistent = max(_["number"] for _ in existing_pulls) + 100
+
+        results = await api.get_many_pulls([existing_pulls[0]["number"], nonexistent])
+        assert results[existing_pulls[0]["number"]]["number"] == existing_pulls[0]["number"]
+        assert results[nonexistent] is None
+        api.get_single_pull.assert_called_once_with(
+            nonexistent, session=None, priority=librarian.github.Priority.INTERACTIVE, keys=None, repo=None
+        )
+
+    async def test__batching(self, mock_github, gh_token, repo, existing_pulls, monkeypatch, mocker):
+        api = librarian.github.GitHub(gh_token, repo)
+        monkeypatch.setattr(api, "PULLS_PER_QUERY", 7)
+        api.graphql = mocker.AsyncMock(side_effect=api.graphql)
+
+        numbers = [_["number"] for _ in existing_pulls[:30]]
+        results = await api.get_many_pulls(numbers)
+        assert all(results[n]["number"] == n for n in numbers)
+        assert api.graphql.call_count == 5
+
+    @pytest.mark.parametrize("use_graphql", [True, False])
+    async def test__rest_fallback(self, mock_unstable_github, gh_token, repo, existing_pulls, mocker, use_graphql):
+        api = librarian.github.GitHub(gh_token, repo, use_graphql=use_graphql)
+        api.graphql = mocker.AsyncMock(side_effect=api.graphql)
+        sampled = [_["number"] for _ in random.sample(existing_pulls, self.SAMPLE_SZ)]
+
+        results = await api.get_many_pulls(sampled)
+        assert list(results) == sampled
+        assert api.graphql.called == use_graphql
+        for number, result in results.items():
+            assert isinstance(result, Exception) or result["number"] == number
@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import aiohttp.client_exceptions as aiohttp_excs
+from aiohttp import web
+import pytest
+
+import librarian.github
+from librarian.github import limiter as gh_limiter
+
+from tests import utils
+
+
+@pytest.fixture
+def mock_throttling_github(monkeypatch, aiohttp_client, loop, gh_token):
+    async def throttled(request):
+        return web.Response(status=429, text="{}", content_type="application/json")
+
+    async def secondary(request):
+        return web.Response(
+            status=403, text='{"message": "You have exceeded a secondary rate limit."}', content_type="application/json"
+        )
+
+    routes = {"/throttled": throttled, "/secondary": secondary, "/ok": utils.make_response(200, {})}
+    yield utils.make_github_instance(monkeypatch, aiohttp_client, loop, routes, gh_token)
+
+
+class TestAdaptiveLimiter:
+    @pytest.mark.parametrize(
+        ["initial", "minimum", "maximum"],
+        [(0, 0, 1), (1, 2, 3), (4, 1, 3)]
+    )
+    def test__bad_bounds(self, initial, minimum, maximum):
+        with pytest.raises(ValueError):
+            gh_limiter.AdaptiveLimiter(initial=initial, minimum=minimum, maximum=maximum)
+
+    async def test__aimd(self, monkeypatch):
+        limiter = gh_limiter.AdaptiveLimiter(initial=8, minimum=2, maximum=10)
+        monkeypatch.setattr(limiter, "THROTTLE_COOLDOWN", 0)
+
+        for _ in range(9):
+            limiter.succeeded()
+        assert limiter.size == 9
+        for _ in range(100):
+            limiter.succeeded()
+        assert limiter.size == 10
+
+        limiter.throttled()
+        assert limiter.size == 5
+        for _ in range(10):
+            limiter.throttled()
+        assert limiter.size == 2
+
+    async def test__throttle_cooldown(self):
+        limiter = gh_limiter.AdaptiveLimiter(initial=16, maximum=16)
+        for _ in range(5):
+            limiter.throttled()
+        assert limiter.size == 8
+
+    async def test__window_is_respected(self):
+        limiter = gh_limiter.AdaptiveLimiter(initial=3, maximum=3, spacing=0)
+        running, peak = 0, 0
+        queued = []
+
+        async def task():
+            nonlocal running, peak
+            async with limiter:
+                running += 1
+                peak = max(peak, running)
+                queued.append(limiter.queue_depth)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(task() for _ in range(12)))
+        assert peak == 3
+        assert max(queued) > 0
+        assert limiter.in_flight == 0 and limiter.queue_depth == 0
+
+    async def test__spacing(self):
+        limiter = gh_limiter.AdaptiveLimiter(initial=10, spacing=0.02)
+        starts = []
+
+        async def task():
+            async with limiter:
+                starts.append(time.monotonic())
+
+        await asyncio.gather(*(task() for _ in range(6)))
+        assert starts[-1] - starts[0] >= 0.02 * 5 * 0.9
+
+    async def test__cancelled_while_spaced(self):
+        limiter = gh_limiter.AdaptiveLimiter(initial=2, maximum=2, spacing=0.5)
+
+        async def task():
+            async with limiter:
+                await asyncio.sleep(10)
+
+        tasks = [asyncio.create_task(task()) for _ in range(3)]
+        await asyncio.sleep(0.1)
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert limiter.in_flight == 0
+
+        async with limiter:
+            assert limiter.in_flight == 1
+
+
+class TestThrottling:
+    @pytest.mark.parametrize(
+        ["status", "headers", "throttled"],
+        [
+            (429, {}, True),
+            (403, {"Retry-After": "60"}, True),
+            (403, {librarian.github.RateLimit.HEADER_REMAINING: "0"}, True),
+            (403, {}, False),
+            (404, {}, False),
+            (200, {}, False),
+        ]
+    )
+    def test__is_throttled(self, status, headers, throttled):
+        assert librarian.github.GitHub.is_throttled(status, headers) == throttled
+
+    @pytest.mark.parametrize(
+        ["body", "throttled"],
+        [
+            ('{"message": "You have exceeded a secondary rate limit. Please wait a few minutes"}', True),
+            ('{"message": "You have triggered an abuse detection mechanism."}', True),
+            ('{"message": "Resource not accessible by integration"}', False),
+        ]
+    )
+    def test__secondary_limit_message(self, body, throttled):
+        assert librarian.github.GitHub.is_throttled(403, {}, body) == throttled
+
+    async def test__window_follows_responses(self, mock_throttling_github, gh_token, repo):
+        limiter = gh_limiter.AdaptiveLimiter(initial=8, spacing=0)
+        api = librarian.github.GitHub(gh_token, repo, limiter=limiter, retry=librarian.github.RetryPolicy(attempts=1))
+
+        with pytest.raises(aiohttp_excs.ClientResponseError):
+            await api.get("throttled")
+        assert limiter.size == 4
+
+        for _ in range(10):
+            await api.get("ok")
+        assert limiter.size > 4
+        assert limiter.in_flight == 0
+
+    async def test__secondary_limit_shrinks_window(self, mock_throttling_github, gh_token, repo):
+        limiter = gh_limiter.AdaptiveLimiter(initial=8, spacing=0)
+        api = librarian.github.GitHub(gh_token, repo, limiter=limiter, retry=librarian.github.RetryPolicy(attempts=1))
+
+        with pytest.raises(librarian.github.ThrottledError):
+            await api.get("secondary")
+        assert limiter.size == 4
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+import librarian.github
+from librarian.github import metrics as gh_metrics
+from librarian.github import ratelimit
+from librarian.github import simulator as gh_simulator
+
+from tests import utils
+
+
+def make_headers(left, reset="1000", resource="core"):
+    return {
+        ratelimit.RateLimit.HEADER_RESOURCE: resource,
+        ratelimit.RateLimit.HEADER_REMAINING: str(left),
+        ratelimit.RateLimit.HEADER_RESET: reset,
+    }
+
+
+@pytest.fixture
+def synthetic(repo):
+    return gh_simulator.SyntheticRepository(repo, size=50, seed=7)
+
+
+@pytest.fixture
+def api(monkeypatch, aiohttp_client, loop, synthetic, gh_token, repo):
+    utils.serve_github_app(monkeypatch, aiohttp_client, loop, gh_simulator.Simulator([synthetic]).make_app(), gh_token)
+    yield librarian.github.GitHub(gh_token, repo, cache=librarian.github.ResponseCache())
+
+
+class TestRequestMetrics:
+    @pytest.mark.parametrize("path, template", [
+        ("repos/ppy/osu-wiki/pulls/123", "repos/{repo}/pulls/{n}"),
+        ("/repos/ppy/osu-wiki/pulls?page=2", "repos/{repo}/pulls"),
+        ("repos/ppy/osu-wiki/issues/5/comments", "repos/{repo}/issues/{n}/comments"),
+        ("graphql", "graphql"),
+        ("search/issues", "search/issues"),
+    ])
+    def test__template(self, path, template):
+        assert gh_metrics.RequestMetrics.template(path) == template
+
+    def test__cost(self):
+        metrics = gh_metrics.RequestMetrics()
+        assert metrics.cost(200, {}) == 0
+        assert metrics.cost(200, make_headers(100)) == 1
+        assert metrics.cost(200, make_headers(97)) == 3  # e.g. a complex GraphQL query
+        assert metrics.cost(200, make_headers(98)) == 0  # an older response that arrived late
+        assert metrics.cost(304, make_headers(97)) == 0
+        assert metrics.cost(200, make_headers(96, resource="graphql")) == 1
+        assert metrics.cost(200, make_headers(5000, reset="2000")) == 1
+        assert metrics.cost(200, make_headers(4999, reset="2000"), token="other") == 1
+
+    def test__record(self):
+        metrics = gh_metrics.RequestMetrics()
+        for number, (status, latency) in enumerate([(200, 0.01), (200, 0.3), (404, 20)]):
+            metrics.record("repos/a/b/pulls/{}".format(number), status, latency, 1024, make_headers(10 - number))
+        metrics.cache_hit("repos/a/b/pulls/1")
+
+        snapshot = metrics.snapshot()
+        assert list(snapshot) == ["repos/{repo}/pulls/{n}"]
+        stats = snapshot["repos/{repo}/pulls/{n}"]
+        assert stats["requests"] == 3 and stats["statuses"] == {"200": 2, "404": 1}
+        assert stats["latency"]["<=0.05"] == 1 and stats["latency"]["<=0.5"] == 1 and stats["latency"][">10"] == 1
+        assert stats["bytes_received"] == 3072 and stats["ratelimit_units"] == 3 and stats["cache_hits"] == 1
+
+        endpoint = metrics.endpoints["repos/{repo}/pulls/{n}"]
+        assert endpoint.percentile(0.5) == 0.5 and endpoint.percentile(1) == float("inf")
+        assert list(metrics.status()) == ["repos/{repo}/pulls/{n}"]
+
+
+class TestInstrumentedClient:
+    async def test__requests(self, api, synthetic):
+        numbers = sorted(synthetic.pulls)[:3]
+        await api.get_many_pulls(numbers)
+        await asyncio.gather(*(api.get_single_pull(numbers[0]) for _ in range(3)))  # coalesced
+        await api.get_single_pull(numbers[0])  # served from the cache
+
+        snapshot = api.metrics.snapshot()
+        assert snapshot["graphql"]["requests"] == 1 and snapshot["graphql"]["ratelimit_units"] == 1
+
+        single = snapshot["repos/{repo}/pulls/{n}"]
+        assert single["requests"] == 2 and single["statuses"] == {"200": 1, "304": 1}
+        assert single["coalesced"] == 2 and single["cache_hits"] == 1
+        assert single["ratelimit_units"] == 1  # 304 responses are free
+        assert single["bytes_received"] > 0 and sum(single["latency"].values()) == 2
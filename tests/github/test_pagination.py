@@ -0,0 +1,91 @@
+import pytest
+
+import librarian.github
+from librarian.github import pagination
+
+
+class TestLinks:
+    def test__parse_links(self):
+        header = (
+            '<https://api.github.com/repositories/1/pulls?page=2>; rel="next", '
+            '<https://api.github.com/repositories/1/pulls?page=5>; rel="last"'
+        )
+        assert pagination.parse_links(header) == {
+            "next": "https://api.github.com/repositories/1/pulls?page=2",
+            "last": "https://api.github.com/repositories/1/pulls?page=5",
+        }
+        assert pagination.parse_links(None) == {}
+        assert pagination.parse_links("") == {}
+
+    @pytest.mark.parametrize(
+        ["header", "last_page"],
+        [
+            ('<https://api.github.com/x?per_page=100&page=7>; rel="last"', 7),
+            ('<https://api.github.com/x?page=2>; rel="next"', None),
+            ('<https://api.github.com/x?page=abc>; rel="last"', None),
+            (None, None),
+        ]
+    )
+    def test__last_page(self, header, last_page):
+        headers = {} if header is None else {pagination.HEADER_LINK: header}
+        assert pagination.last_page(headers) == last_page
+
+
+class TestParallelPages:
+    async def test__pages_requested_once(self, mock_github, gh_token, repo, existing_pulls, monkeypatch, mocker):
+        api = librarian.github.GitHub(gh_token, repo)
+        monkeypatch.setattr(api, "OBJECTS_PER_PAGE", 10)
+        api.request = mocker.AsyncMock(side_effect=api.request)
+
+        data = await api.pulls()
+        open_pulls = [_ for _ in existing_pulls if _["state"] == "open"]
+        assert sorted(_["number"] for _ in data) == sorted(_["number"] for _ in open_pulls)
+
+        pages = -(-len(open_pulls) // 10)
+        requested = sorted(call.args[1]["page"] for call in api.request.call_args_list)
+        assert requested == list(range(1, pages + 1))
+
+    async def test__no_link_header(self, mock_github, gh_token, repo, existing_pulls, monkeypatch, mocker):
+        api = librarian.github.GitHub(gh_token, repo)
+        monkeypatch.setattr(pagination, "last_page", lambda headers: None)
+        monkeypatch.setattr(api, "OBJECTS_PER_PAGE", 10)
+        api.request = mocker.AsyncMock(side_effect=api.request)
+
+        data = await api.pulls()
+        assert len(data) == len([_ for _ in existing_pulls if _["state"] == "open"])
+        assert api.request.call_count >= len(data) // 10
+
+
+class TestStreaming:
+    def test__has_next_page(self):
+        next_link = {pagination.HEADER_LINK: '<https://api.github.com/x?page=3>; rel="next"'}
+        last_link = {pagination.HEADER_LINK: '<https://api.github.com/x?page=1>; rel="first"'}
+        assert pagination.has_next_page(next_link, 1, 100)
+        assert not pagination.has_next_page(last_link, 100, 100)
+        assert pagination.has_next_page({}, 100, 100)
+        assert not pagination.has_next_page({}, 99, 100)
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    async def test__iter_pulls(self, mock_github, gh_token, repo, existing_pulls, monkeypatch, parallel):
+        api = librarian.github.GitHub(gh_token, repo)
+        monkeypatch.setattr(api, "OBJECTS_PER_PAGE", 10)
+
+        expected = [pull async for pull in api.iter_pulls()]
+        data = [pull async for pull in api.iter_pulls(keys=("number", "updated_at"), parallel=parallel)]
+        assert data == [{"number": _["number"], "updated_at": _["updated_at"]} for _ in expected]
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    async def test__stop_early(self, mock_github, gh_token, repo, monkeypatch, mocker, parallel):
+        api = librarian.github.GitHub(gh_token, repo)
+        monkeypatch.setattr(api, "OBJECTS_PER_PAGE", 10)
+        api.request = mocker.AsyncMock(side_effect=api.request)
+
+        pages = api.paginate(f"repos/{repo}/pulls", parallel=parallel)
+        async for page in pages:
+            assert len(page) == 10
+            break
+        await pages.aclose()
+
+        if not parallel:
+            assert api.request.call_count == 1
+        assert api.request.call_count <= 1 + api.PAGES_CONCURRENCY
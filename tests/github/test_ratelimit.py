@@ -0,0 +1,147 @@
+import asyncio
+import json
+import time
+
+import arrow
+from aiohttp import web
+import pytest
+
+import librarian.github
+from librarian.github import ratelimit
+
+from tests import utils
+
+
+def make_headers(resource, left, limit, reset):
+    return {
+        ratelimit.RateLimit.HEADER_RESOURCE: resource,
+        ratelimit.RateLimit.HEADER_REMAINING: str(left),
+        ratelimit.RateLimit.HEADER_LIMIT: str(limit),
+        ratelimit.RateLimit.HEADER_RESET: str(reset.int_timestamp),
+    }
+
+
+@pytest.fixture
+def mock_ratelimited_github(monkeypatch, aiohttp_client, loop, gh_token):
+    reset = arrow.utcnow().shift(hours=1)
+
+    def make_handler(resource, left):
+        async def handler(request):
+            return web.Response(
+                status=200, text=json.dumps({"data": {}}), content_type="application/json",
+                headers=make_headers(resource, left, 5000, reset),
+            )
+        return handler
+
+    get_routes = {"/repos/a/b/pulls": make_handler("core", 4000), "/search/issues": make_handler("search", 20)}
+    post_routes = {"/graphql": make_handler("graphql", 4900)}
+    yield utils.make_github_instance(monkeypatch, aiohttp_client, loop, get_routes, gh_token, post_routes)
+
+
+class TestRateLimit:
+    def test__string_headers(self):
+        reset = arrow.utcnow().floor("second")
+        limit = ratelimit.RateLimit(make_headers("core", 10, 60, reset))
+        assert limit.left == 10 and limit.limit == 60 and limit.reset == reset
+
+    def test__no_headers(self):
+        limit = ratelimit.RateLimit()
+        reset = limit.reset
+        limit.update({})
+        assert limit.left is None and limit.reset == reset
+
+
+class TestRateLimitBudget:
+    @pytest.mark.parametrize(
+        ["path", "resource"],
+        [
+            ("repos/a/b/pulls", "core"),
+            ("/search/issues", "search"),
+            ("graphql", "graphql"),
+        ]
+    )
+    def test__resource_for(self, path, resource):
+        assert ratelimit.RateLimitBudget.resource_for(path) == resource
+
+    def test__update(self):
+        budget = ratelimit.RateLimitBudget()
+        reset = arrow.utcnow().shift(minutes=1)
+        budget.update(make_headers("search", 3, 30, reset))
+        budget.update(make_headers("new-resource", 1, 2, reset))
+        budget.update({ratelimit.RateLimit.HEADER_REMAINING: "4999"})
+
+        assert budget.buckets["search"].left == 3
+        assert budget.buckets["new-resource"].limit == 2
+        assert budget.buckets["core"].left == 4999
+        assert "search=3/30" in repr(budget)
+
+    @pytest.mark.parametrize(
+        ["left", "priority", "blocked", "paced"],
+        [
+            (100, ratelimit.Priority.INTERACTIVE, False, False),
+            (0, ratelimit.Priority.INTERACTIVE, False, False),
+            (5000, ratelimit.Priority.BACKFILL, False, False),
+            (2000, ratelimit.Priority.BACKFILL, False, True),
+            (1000, ratelimit.Priority.BACKFILL, True, False),
+            (1000, ratelimit.Priority.SYNC, False, False),
+            (400, ratelimit.Priority.SYNC, False, True),
+            (200, ratelimit.Priority.SYNC, True, False),
+        ]
+    )
+    def test__pacing(self, left, priority, blocked, paced):
+        budget = ratelimit.RateLimitBudget()
+        budget.update(make_headers("core", left, 5000, arrow.utcnow().shift(minutes=30)))
+
+        interval = budget.pacing("core", priority)
+        if blocked:
+            assert interval is None
+        elif paced:
+            assert interval > 0
+        else:
+            assert interval == 0
+
+    def test__pacing_after_reset(self):
+        budget = ratelimit.RateLimitBudget()
+        budget.update(make_headers("core", 0, 5000, arrow.utcnow().shift(minutes=-1)))
+        assert budget.pacing("core", ratelimit.Priority.BACKFILL) == 0
+
+    async def test__acquire_accounts_requests(self):
+        budget = ratelimit.RateLimitBudget()
+        budget.update(make_headers("core", 4000, 5000, arrow.utcnow().shift(minutes=30)))
+        for _ in range(10):
+            await budget.acquire("core", ratelimit.Priority.SYNC)
+        assert budget.buckets["core"].left == 3990
+
+    async def test__acquire_paced(self):
+        budget = ratelimit.RateLimitBudget()
+        budget.update(make_headers("core", 30, 100, arrow.utcnow().floor("second").shift(seconds=2)))
+
+        start = time.monotonic()
+        await asyncio.gather(*(budget.acquire("core", ratelimit.Priority.BACKFILL) for _ in range(3)))
+        assert time.monotonic() - start >= 0.2
+        assert sum(budget.waiting.values()) == 0
+
+    async def test__acquire_blocked_until_reset(self):
+        budget = ratelimit.RateLimitBudget()
+        budget.update(make_headers("core", 10, 100, arrow.utcnow().floor("second").shift(seconds=2)))
+
+        task = asyncio.create_task(budget.acquire("core", ratelimit.Priority.BACKFILL))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        assert budget.waiting[ratelimit.Priority.BACKFILL] == 1
+
+        await budget.acquire("core", ratelimit.Priority.INTERACTIVE)
+        await asyncio.wait_for(task, timeout=3)
+        assert budget.waiting[ratelimit.Priority.BACKFILL] == 0
+
+
+class TestBudgetAccounting:
+    async def test__per_resource_accounting(self, mock_ratelimited_github, gh_token):
+        api = librarian.github.GitHub(gh_token, "a/b")
+        await api.get("repos/a/b/pulls")
+        await api.get("search/issues")
+        await api.graphql("query { viewer { login } }")
+
+        assert api.ratelimit.left == 4000
+        assert api.budget.buckets["search"].left == 20
+        assert api.budget.buckets["graphql"].left == 4900
@@ -0,0 +1,137 @@
+import aiohttp.client_exceptions as aiohttp_excs
+import arrow
+from aiohttp import web
+import pytest
+
+import librarian.github
+from librarian.github import retry as gh_retry
+
+from tests import utils
+
+
+@pytest.fixture
+def mock_flaky_github(monkeypatch, aiohttp_client, loop, gh_token):
+    calls = {}
+
+    def make_flaky(path, failures, status, body="{}"):
+        async def handler(request):
+            calls[path] = calls.get(path, 0) + 1
+            if calls[path] <= failures:
+                return web.Response(status=status, text=body, content_type="application/json")
+            return web.Response(status=200, text="{}", content_type="application/json")
+        return handler
+
+    get_routes = {
+        "/flaky": make_flaky("flaky", 2, 502),
+        "/missing": make_flaky("missing", 100, 404),
+        "/throttled": make_flaky("throttled", 1, 429),
+        "/garbled": make_flaky("garbled", 1, 200, "<html>Unicorn!</html>"),
+        "/secondary": make_flaky("secondary", 1, 403, '{"message": "You have exceeded a secondary rate limit."}'),
+        "/forbidden": make_flaky("forbidden", 1, 403, '{"message": "Resource not accessible by integration"}'),
+    }
+    post_routes = {
+        "/flaky": make_flaky("post-flaky", 2, 502),
+        "/graphql": make_flaky("graphql", 1, 502),
+    }
+    utils.make_github_instance(monkeypatch, aiohttp_client, loop, get_routes, gh_token, post_routes)
+    yield calls
+
+
+class TestRetryPolicy:
+    def test__bad_attempts(self):
+        with pytest.raises(ValueError):
+            gh_retry.RetryPolicy(attempts=0)
+
+    def test__allows(self):
+        policy = gh_retry.RetryPolicy(attempts=3)
+        assert policy.allows("GET", 0) and policy.allows("get", 1)
+        assert not policy.allows("get", 2)
+        assert not policy.allows("post", 0)
+        assert policy.allows("post", 0, idempotent=True)
+        assert not policy.allows("get", 0, idempotent=False)
+
+    def test__exponential_jitter(self):
+        policy = gh_retry.RetryPolicy(base_delay=1, max_delay=5)
+        for attempt, bound in ((0, 1), (1, 2), (2, 4), (5, 5)):
+            delays = [policy.backoff(attempt) for _ in range(50)]
+            assert all(0 <= d <= bound for d in delays)
+
+    @pytest.mark.parametrize(
+        ["headers", "throttled", "delay"],
+        [
+            ({"Retry-After": "3"}, True, 3),
+            ({"Retry-After": "3600"}, True, None),
+            ({}, True, gh_retry.RetryPolicy.THROTTLED_DELAY),
+        ]
+    )
+    def test__requested_delay(self, headers, throttled, delay):
+        policy = gh_retry.RetryPolicy(max_delay=60)
+        assert policy.backoff(0, headers=headers, throttled=throttled) == delay
+
+    def test__ratelimit_reset(self):
+        policy = gh_retry.RetryPolicy(max_delay=60)
+        reset = arrow.utcnow().shift(seconds=30)
+        headers = {
+            librarian.github.RateLimit.HEADER_REMAINING: "0",
+            librarian.github.RateLimit.HEADER_RESET: str(reset.int_timestamp),
+        }
+        assert 25 <= policy.backoff(0, headers=headers, throttled=True) <= 30
+
+        headers[librarian.github.RateLimit.HEADER_RESET] = str(reset.shift(hours=1).int_timestamp)
+        assert policy.backoff(0, headers=headers, throttled=True) is None
+
+
+class TestRetries:
+    @pytest.fixture
+    def api(self, gh_token, repo):
+        return librarian.github.GitHub(
+            gh_token, repo, retry=librarian.github.RetryPolicy(attempts=3, base_delay=0.01)
+        )
+
+    async def test__transient_errors(self, mock_flaky_github, api):
+        assert await api.get("flaky") == {}
+        assert mock_flaky_github["flaky"] == 3
+        assert api.retry.retries == 2
+
+    async def test__malformed_body(self, mock_flaky_github, api):
+        assert await api.get("garbled") == {}
+        assert mock_flaky_github["garbled"] == 2
+
+    async def test__client_errors(self, mock_flaky_github, api):
+        with pytest.raises(aiohttp_excs.ClientResponseError):
+            await api.get("missing")
+        assert mock_flaky_github["missing"] == 1
+        assert api.retry.retries == 0
+
+    async def test__non_idempotent(self, mock_flaky_github, api):
+        with pytest.raises(aiohttp_excs.ClientResponseError):
+            await api.post("flaky", data={})
+        assert mock_flaky_github["post-flaky"] == 1
+
+    async def test__graphql(self, mock_flaky_github, api):
+        with pytest.raises(librarian.github.graphql.GraphQLError):
+            await api.graphql("query { viewer { login } }")
+        assert mock_flaky_github["graphql"] == 2
+
+    async def test__throttled(self, mock_flaky_github, api, monkeypatch):
+        monkeypatch.setattr(api.retry, "THROTTLED_DELAY", 0.01)
+        assert await api.get("throttled") == {}
+        assert mock_flaky_github["throttled"] == 2
+
+    async def test__secondary_limit(self, mock_flaky_github, api, monkeypatch):
+        throttled = []
+        monkeypatch.setattr(api.retry, "backoff", lambda *args, **kwargs: throttled.append(kwargs["throttled"]) or 0.01)
+
+        assert await api.get("secondary") == {}
+        assert mock_flaky_github["secondary"] == 2
+        assert throttled == [True]
+
+        with pytest.raises(aiohttp_excs.ClientResponseError):
+            await api.get("forbidden")
+        assert mock_flaky_github["forbidden"] == 1
+
+    async def test__attempts_exhausted(self, mock_flaky_github, gh_token, repo):
+        api = librarian.github.GitHub(gh_token, repo, retry=librarian.github.RetryPolicy(attempts=2, base_delay=0.01))
+        with pytest.raises(aiohttp_excs.ClientResponseError):
+            await api.get("flaky")
+        assert mock_flaky_github["flaky"] == 2
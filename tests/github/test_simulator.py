@@ -0,0 +1,99 @@
+import io
+import json
+
+import aiohttp.client_exceptions as aiohttp_excs
+import pytest
+
+import librarian.github
+from librarian.github import simulator as gh_simulator
+
+from tests import utils
+
+SIZE = 250
+
+
+@pytest.fixture
+def synthetic(repo):
+    return gh_simulator.SyntheticRepository(repo, size=SIZE, seed=42)
+
+
+@pytest.fixture
+def sim(synthetic):
+    return gh_simulator.Simulator([synthetic], seed=42, log=io.StringIO())
+
+
+@pytest.fixture
+def api(monkeypatch, aiohttp_client, loop, sim, gh_token, repo):
+    utils.serve_github_app(monkeypatch, aiohttp_client, loop, sim.make_app(), gh_token)
+    yield librarian.github.GitHub(gh_token, repo, retry=librarian.github.RetryPolicy(attempts=1))
+
+
+class TestSyntheticRepository:
+    def test__reproducible(self, repo):
+        first, second = (gh_simulator.SyntheticRepository(repo, size=SIZE, seed=1) for _ in range(2))
+        assert first.pulls == second.pulls and first.issues == second.issues
+        assert sorted(first.pulls.keys() | first.issues.keys()) == list(range(1, SIZE + 1))
+        assert first.issues and any(_["state"] == "open" for _ in first.pulls.values())
+
+
+class TestRecording:
+    def test__turns(self):
+        recording = gh_simulator.Recording([
+            {"method": "get", "path": "/a?page=1", "status": 200, "body": n} for n in range(2)
+        ])
+        assert len(recording) == 2
+        assert [recording.find("GET", "/a?page=1")["body"] for _ in range(3)] == [0, 1, 0]
+        assert recording.find("GET", "/a?page=2") is None
+
+
+class TestSimulator:
+    async def test__pulls(self, api, sim, synthetic):
+        open_pulls = await api.pulls()
+        assert sorted(_["number"] for _ in open_pulls) == sorted(
+            _["number"] for _ in synthetic.pulls.values() if _["state"] == "open"
+        )
+
+        numbers = sorted(synthetic.pulls)[:5]
+        fetched = await api.get_many_pulls(numbers)
+        assert {n: fetched[n]["title"] for n in numbers} == {n: synthetic.pulls[n]["title"] for n in numbers}
+
+        issue = next(iter(synthetic.issues))
+        assert await api.get_single_pull(issue) is None
+        assert (await api.get_single_issue(issue))["number"] == issue
+
+        assert sim.requests and all(_.status in (200, 404) for _ in sim.requests)
+        assert json.loads(sim.log.getvalue().splitlines()[0])["method"] == "GET"
+
+    async def test__rate_limit(self, api, sim, synthetic):
+        sim.rate_limit = 2
+        for number, left in zip(synthetic.pulls, (1, 0)):
+            await api.get_single_pull(number)
+            assert api.ratelimit.left == left and api.ratelimit.limit == 2
+        assert sim.fault("core").status == 403
+        assert sim.fault("graphql") is None
+
+    async def test__faults(self, api, sim, synthetic):
+        number = next(iter(synthetic.pulls))
+        sim.error_rate = 1
+        with pytest.raises(aiohttp_excs.ClientResponseError) as exc:
+            await api.get_single_pull(number)
+        assert exc.value.status >= 500
+
+        sim.error_rate, sim.throttle_rate = 0, 1
+        with pytest.raises(librarian.github.ThrottledError):
+            await api.get_single_pull(number)
+
+    async def test__conditional_requests(self, api, sim, gh_token, repo, synthetic):
+        api = librarian.github.GitHub(gh_token, repo, cache=librarian.github.ResponseCache())
+        number = next(iter(synthetic.pulls))
+        for _ in range(2):
+            await api.get_single_pull(number)
+        assert [_.status for _ in sim.requests] == [200, 304]
+        assert sim.used["core"] == 1
+
+    async def test__replay(self, api, sim, repo):
+        sim.recording.add({
+            "method": "GET", "path": "/repos/{}/pulls/100000".format(repo), "status": 200,
+            "body": {"number": 100000, "title": "recorded"},
+        })
+        assert (await api.get_single_pull(100000))["title"] == "recorded"
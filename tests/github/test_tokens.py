@@ -0,0 +1,102 @@
+import collections
+import json
+
+import arrow
+from aiohttp import web
+import pytest
+
+import librarian.github
+from librarian.github import ratelimit
+from librarian.github import tokens as gh_tokens
+
+from tests import utils
+
+
+def make_headers(left, limit=5000, reset=None):
+    reset = reset if reset is not None else arrow.utcnow().shift(hours=1)
+    return {
+        ratelimit.RateLimit.HEADER_RESOURCE: "core",
+        ratelimit.RateLimit.HEADER_REMAINING: str(left),
+        ratelimit.RateLimit.HEADER_LIMIT: str(limit),
+        ratelimit.RateLimit.HEADER_RESET: str(reset.int_timestamp),
+    }
+
+
+@pytest.fixture
+def mock_multitoken_github(monkeypatch, aiohttp_client, loop, gh_token):
+    left = {"token first": 5000, "token second": 5000}
+    calls = collections.Counter()
+
+    async def handler(request):
+        auth = request.headers["Authorization"]
+        calls[auth] += 1
+        left[auth] -= 1
+        return web.Response(
+            status=200, text=json.dumps({}), content_type="application/json", headers=make_headers(left[auth]),
+        )
+
+    utils.make_github_instance(monkeypatch, aiohttp_client, loop, {"/ok": handler}, gh_token)
+    yield calls
+
+
+class TestTokenPool:
+    def test__no_tokens(self):
+        with pytest.raises(ValueError):
+            gh_tokens.TokenPool([])
+
+    def test__duplicates(self):
+        pool = gh_tokens.TokenPool(["a", "b", "a"])
+        assert [_.token for _ in pool] == ["a", "b"]
+
+    def test__budgets(self):
+        budget = ratelimit.RateLimitBudget(reserves={ratelimit.Priority.BACKFILL: 0.5})
+        pool = gh_tokens.TokenPool(["a", "b"], budget=budget)
+        assert pool.tokens[0].budget is budget
+        assert pool.tokens[1].budget is not budget
+        assert pool.tokens[1].budget.reserves == budget.reserves
+
+    def test__most_requests_left(self):
+        pool = gh_tokens.TokenPool(["a", "b", "c"])
+        assert pool.pick("core").token == "a"
+        pool.tokens[0].requests += 1
+        assert pool.pick("core").token == "b"  # unknown limits are tried first, least used among them
+
+        for token, left in zip(pool, (100, 300, 200)):
+            token.budget.update(make_headers(left))
+        assert pool.pick("core").token == "b"
+
+    def test__exhausted_are_skipped(self):
+        pool = gh_tokens.TokenPool(["a", "b"], min_left=10)
+        pool.tokens[0].budget.update(make_headers(5))
+        pool.tokens[1].budget.update(make_headers(10))
+        assert pool.pick("core").token == "b"
+
+        pool.tokens[1].budget.update(make_headers(0, reset=arrow.utcnow().shift(minutes=30)))
+        assert pool.pick("core").token == "b"  # everything's exhausted, pick the one reset first
+
+        pool.tokens[0].budget.update(make_headers(0, reset=arrow.utcnow().shift(seconds=-1)))
+        assert pool.pick("core").token == "a"  # the limit has been reset already
+
+    def test__other_resources(self):
+        pool = gh_tokens.TokenPool(["a", "b"])
+        pool.tokens[0].budget.update(make_headers(0))
+        assert pool.pick("core").token == "b"
+        assert pool.pick("search").token == "a"
+
+
+class TestMultipleTokens:
+    async def test__requests_are_spread(self, mock_multitoken_github, repo):
+        api = librarian.github.GitHub(["first", "second"], repo)
+        for _ in range(10):
+            await api.get("ok")
+
+        assert mock_multitoken_github == {"token first": 5, "token second": 5}
+        assert [_.requests for _ in api.tokens] == [5, 5]
+        assert api.ratelimit.left == 4995
+        assert set(api.tokens.status()) == {"...irst", "...cond"}
+
+    async def test__single_token(self, mock_multitoken_github, repo):
+        api = librarian.github.GitHub("first", repo)
+        await api.get("ok")
+        assert mock_multitoken_github == {"token first": 1}
+        assert api.budget is api.tokens.tokens[0].budget
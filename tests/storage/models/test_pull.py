@@ -161,3 +161,36 @@ class TestPulls:
                 sorted(_["number"] for _ in existing_pulls if _["state"] != "closed")
             ):
                 assert stored_number == existing_number
+
+    def test__listing_payload(self, storage, existing_pulls):
+        payload = existing_pulls[0]
+        listed = {k: v for k, v in payload.items() if k not in pull_model.Pull.LISTING_DEFAULTS}
+        new = pull_model.Pull(listed)
+        assert new.commits == 0 and new.merged == int(payload["merged_at"] is not None)
+
+        storage.pulls.save_from_payload(payload)
+        with storage.session_scope() as s:
+            saved = storage.pulls.save_many_from_payload([dict(listed, title="new title")], s=s)
+            assert saved[0].title == "new title"
+            assert saved[0].commits == payload["commits"]
+
+    def test__insert_many(self, storage, existing_pulls):
+        storage.pulls.save_from_payload(dict(existing_pulls[0], title="kept"))
+        assert storage.pulls.insert_many_from_payload(existing_pulls[:self.MAX_PULLS]) == self.MAX_PULLS - 1
+        assert storage.pulls.by_number(existing_pulls[0]["number"]).title == "kept"
+        assert storage.pulls.insert_many_from_payload(existing_pulls[:self.MAX_PULLS]) == 0
+        numbers = [_["number"] for _ in existing_pulls]
+        assert storage.pulls.existing_numbers(numbers) == set(numbers[:self.MAX_PULLS])
+
+    def test__repositories(self, storage, existing_pulls):
+        storage.pulls.save_from_payload(existing_pulls[0])
+        storage.pulls.save_from_payload(dict(existing_pulls[0], id=existing_pulls[0]["id"] + 1), repo="owner/other")
+        number = existing_pulls[0]["number"]
+
+        assert storage.pulls.by_number(number, repo="owner/other").repo == "owner/other"
+        assert storage.pulls.existing_numbers([number], repo="owner/first") == set()
+
+        storage.pulls.adopt("owner/first")
+        assert storage.pulls.by_number(number, repo="owner/first") is not None
+        assert storage.pulls.max_number(repo="owner/nothing") is None
+        assert len(storage.pulls.active_pulls()) == 2 * (existing_pulls[0]["state"] != "closed")
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from librarian import webhooks
+
+SECRET = "It's a Secret to Everybody"
+
+
+def make_delivery(server, payload, delivery_id="1", event="pull_request", signature=None):
+    body = json.dumps(payload).encode()
+    headers = {
+        server.HEADER_EVENT: event,
+        server.HEADER_DELIVERY: delivery_id,
+        server.HEADER_SIGNATURE: signature if signature is not None else server.sign(body),
+        "Content-Type": "application/json",
+    }
+    return dict(data=body, headers=headers)
+
+
+@pytest.fixture
+def received():
+    yield []
+
+
+@pytest.fixture
+def server(received):
+    async def handler(pull, repo):
+        received.append(pull)
+
+    yield webhooks.WebhookServer(SECRET, handler=handler, repo=["test-owner/test-repo", "test-owner/Other-Repo"])
+
+
+@pytest.fixture
+def webhook_client(loop, aiohttp_client, server):
+    yield loop.run_until_complete(aiohttp_client(server.make_app()))
+
+
+@pytest.fixture
+def payload(existing_pulls):
+    return {
+        "action": "opened",
+        "pull_request": existing_pulls[0],
+        "repository": {"full_name": "test-owner/test-repo"},
+    }
+
+
+class TestWebhookServer:
+    def test__no_secret(self):
+        with pytest.raises(ValueError):
+            webhooks.WebhookServer("")
+
+    def test__signature(self, server):
+        # the example from https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
+        assert server.sign(b"Hello, World!") == (
+            "sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17"
+        )
+        assert server.verify(b"Hello, World!", server.sign(b"Hello, World!"))
+        assert not server.verify(b"Hello, World!", server.sign(b"Goodbye, World!"))
+        assert not server.verify(b"Hello, World!", None)
+
+    async def test__delivery(self, server, webhook_client, received, payload):
+        response = await webhook_client.post(server.PATH, **make_delivery(server, payload))
+        assert response.status == 200
+        assert received == [payload["pull_request"]]
+        assert server.received == 1
+
+    @pytest.mark.parametrize("signature", ["", "sha256=0123", "sha1=abcd"])
+    async def test__bad_signature(self, server, webhook_client, received, payload, signature):
+        response = await webhook_client.post(server.PATH, **make_delivery(server, payload, signature=signature))
+        assert response.status == 401
+        assert not received
+        assert server.rejected == 1
+
+    async def test__repeated_delivery(self, server, webhook_client, received, payload):
+        for delivery_id in ("1", "2", "1"):
+            response = await webhook_client.post(server.PATH, **make_delivery(server, payload, delivery_id))
+            assert response.status == 200
+        assert len(received) == 2
+        assert server.duplicates == 1
+
+    @pytest.mark.parametrize("event", ["ping", "issues", "push"])
+    async def test__ignored_events(self, server, webhook_client, received, payload, event):
+        response = await webhook_client.post(server.PATH, **make_delivery(server, payload, event=event))
+        assert response.status == 202
+        assert not received
+
+    async def test__other_repository(self, server, webhook_client, received, payload):
+        payload["repository"]["full_name"] = "someone/else"
+        response = await webhook_client.post(server.PATH, **make_delivery(server, payload))
+        assert response.status == 202
+        assert not received
+
+    async def test__several_repositories(self, server, webhook_client, payload, mocker):
+        server.handler = mocker.AsyncMock()
+        payload["repository"]["full_name"] = "test-owner/other-repo"
+        response = await webhook_client.post(server.PATH, **make_delivery(server, payload))
+        assert response.status == 200
+        server.handler.assert_awaited_once_with(payload["pull_request"], "test-owner/other-repo")
+
+    async def test__malformed_payload(self, server, webhook_client, received):
+        response = await webhook_client.post(server.PATH, **make_delivery(server, {"action": "opened"}))
+        assert response.status == 400
+        assert not received
+
+    async def test__failed_handler(self, server, webhook_client, received, payload, mocker):
+        server.handler = mocker.AsyncMock(side_effect=[RuntimeError("oops"), None])
+        for status in (500, 200):
+            response = await webhook_client.post(server.PATH, **make_delivery(server, payload))
+            assert response.status == status
+        assert server.handler.call_count == 2
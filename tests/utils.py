@@ -56,6 +56,26 @@ def as_issue(pull):
     return issue
 
 
+def as_graphql_node(pull):
+    return {
+        "databaseId": pull["id"],
+        "number": pull["number"],
+        "state": "MERGED" if pull["merged"] else pull["state"].upper(),
+        "locked": pull["locked"],
+        "title": pull["title"],
+        "createdAt": pull["created_at"],
+        "updatedAt": pull["updated_at"],
+        "mergedAt": pull["merged_at"],
+        "merged": pull["merged"],
+        "isDraft": pull["draft"],
+        "changedFiles": pull["changed_files"],
+        "commits": {"totalCount": pull["commits"]},
+        "reviews": {"nodes": [{"comments": {"totalCount": pull["review_comments"]}}]},
+        "author": {"login": pull["user"]["login"], "databaseId": pull["user"]["id"]},
+        "assignees": {"nodes": [{"login": _["login"], "databaseId": _["id"]} for _ in pull["assignees"]]},
+    }
+
+
 def user(login):
     return {"login": login, "id": make_id(login)}
 
@@ -66,11 +86,33 @@ def make_response(status, data):
     return response
 
 
-def make_github_instance(monkeypatch, aiohttp_client, loop, get_routes, gh_token):
+def make_link_header(url, page, last_page):
+    if last_page <= 1:
+        return {}
+
+    links = {"first": 1, "last": last_page}
+    if page > 1:
+        links["prev"] = page - 1
+    if page < last_page:
+        links["next"] = page + 1
+    return {
+        "Link": ", ".join(
+            '<{}>; rel="{}"'.format(url.update_query(page=number), rel)
+            for rel, number in links.items()
+        )
+    }
+
+
+def make_github_instance(monkeypatch, aiohttp_client, loop, get_routes, gh_token, post_routes=None):
     app = web.Application()
     for path, handler in get_routes.items():
         app.router.add_get(path, handler)
+    for path, handler in (post_routes or {}).items():
+        app.router.add_post(path, handler)
+    return serve_github_app(monkeypatch, aiohttp_client, loop, app, gh_token)
+
 
+def serve_github_app(monkeypatch, aiohttp_client, loop, app, gh_token):
     api = loop.run_until_complete(
         aiohttp_client(
             app,